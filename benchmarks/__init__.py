@@ -0,0 +1,68 @@
+"""Timing harness for the engine benchmarks (see run_benchmarks.py).
+
+Each benchmark module begins with 'bench' and defines functions that also
+begin with 'bench'.  A benchmark function takes the number of samples to
+collect and returns a list of per-operation times in seconds, usually by
+way of measure().
+
+"""
+
+import time
+
+# time.perf_counter added in Python 3.3
+timer = getattr(time, 'perf_counter', time.time)
+
+
+def measure(run, samples, setup=None, number=1):
+    """Time run(*setup()) number times per sample; return seconds per call.
+
+    Arguments:
+      run     -- the operation to time
+      samples -- how many samples to collect
+      setup   -- optional untimed function returning a tuple of arguments
+      number  -- calls per sample, for operations too quick to time singly
+
+    """
+    times = []
+    for i in range(samples):
+        args = setup() if setup is not None else ()
+        start = timer()
+        for j in range(number):
+            run(*args)
+        times.append((timer() - start) / number)
+    return times
+
+
+def percentile(values, fraction):
+    """Return the value at the given fraction (0-1) of the sorted values."""
+    ordered = sorted(values)
+    index = int(round(fraction * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(times):
+    """Return the statistics saved for each benchmark."""
+    mean = sum(times) / len(times)
+    return {'samples' : len(times),
+            'mean' : mean,
+            'p50' : percentile(times, 0.5),
+            'p99' : percentile(times, 0.99),
+            'per_second' : 1.0 / mean if mean else None}
+
+
+def compare(results, baseline, threshold):
+    """Compare p50 times against a baseline.
+
+    Return a list of (name, baseline p50, new p50, ratio, regressed) for
+    every benchmark present in both, where regressed marks a slowdown
+    beyond the threshold (e.g. 0.25 for 25% slower).
+
+    """
+    report = []
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        old, new = baseline[name]['p50'], results[name]['p50']
+        ratio = new / old if old else 1.0
+        report.append((name, old, new, ratio, ratio > 1 + threshold))
+    return report
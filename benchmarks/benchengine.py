@@ -0,0 +1,236 @@
+"""Benchmarks for the game engine's hot paths."""
+
+import os
+import random
+import shutil
+import tempfile
+
+from rendezvous import GameSettings, FileReader
+from rendezvous.deck import Deck, DeckDefinition
+from rendezvous.dealer import ArtificialIntelligence, DEFAULT_WEIGHTS
+from rendezvous.dealer import best_plays
+from rendezvous.gameplay import RendezVousGame
+from rendezvous.achievements import AchievementList
+from rendezvous.statistics import Statistics
+from rendezvous.savegame import save_game, SavedGame
+
+from benchmarks import measure
+
+SEED = 2014
+DEFINITION = DeckDefinition()
+
+
+def _game(seed=SEED):
+    game = RendezVousGame(deck=DEFINITION, rng=random.Random(seed))
+    game.new_game()
+    return game
+
+
+def _fill_board(game):
+    """Play random (valid) cards onto every open space on the board."""
+    for p, hand in enumerate(game.players):
+        game.board.play_cards(p, [hand.deck.draw()
+                                  for i in range(game.board[p].count(None))])
+        invalid = game.validate(p)
+        while invalid:
+            for i in invalid:
+                game.board[p][i] = hand.deck.draw()
+            invalid = game.validate(p)
+
+
+def _random_scores(game):
+    rng = game.rng
+    game.score.scores = [[rng.randint(-50, 150) for suit in game.score.suits]
+                         for p in range(GameSettings.NUM_PLAYERS)]
+
+
+def _play_round(game):
+    for p, hand in enumerate(game.players):
+        play = hand.AI_hard(p, game.board, game.score)
+        for card in play:
+            hand.remove(card)
+        game.board.play_cards(p, play)
+    game.score_round()
+    return game.next_round()
+
+
+def bench_ai_decision(samples, weights=None):
+    """ArtificialIntelligence: choose a play from a random hand."""
+    game = _game()
+    def setup():
+        game.board.clear()
+        game.players[0].flush()
+        game.board.play_cards(1, [game.players[1].deck.draw()
+                                  for i in range(GameSettings.CARDS_ON_BOARD)])
+        _random_scores(game)
+        return (game.players[0],)
+    def run(hand):
+        ai = ArtificialIntelligence(0, hand, game.board, game.score, game.rng,
+                                    weights)
+        try:
+            ai.get_best_play()
+        except IndexError:
+            pass  # no valid play in this hand
+    return measure(run, samples, setup)
+
+
+def bench_ai_decision_refill(samples):
+    """ArtificialIntelligence: choose again after playing and refilling."""
+    game = _game()
+    hand = game.players[0]
+    def setup():
+        game.board.clear()
+        for card in hand.cards[:GameSettings.CARDS_ON_BOARD]:
+            hand.remove(card)
+        hand.refill()
+        game.board.play_cards(1, [game.players[1].deck.draw()
+                                  for i in range(GameSettings.CARDS_ON_BOARD)])
+        _random_scores(game)
+        return (hand,)
+    def run(hand):
+        ai = ArtificialIntelligence(0, hand, game.board, game.score, game.rng)
+        try:
+            ai.get_best_play()
+        except IndexError:
+            pass  # no valid play in this hand
+    return measure(run, samples, setup)
+
+
+def bench_ai_decision_hand_tuned(samples):
+    """ArtificialIntelligence: choose a play by the hand-tuned weights."""
+    return bench_ai_decision(samples, DEFAULT_WEIGHTS)
+
+
+def bench_ai_batch(samples, tables=20):
+    """best_plays: choose a play at each of many tables (time per table)."""
+    games = [_game(SEED + i) for i in range(tables)]
+    def setup():
+        for game in games:
+            game.board.clear()
+            game.players[0].flush()
+            game.board.play_cards(1, [game.players[1].deck.draw() for i
+                                      in range(GameSettings.CARDS_ON_BOARD)])
+            _random_scores(game)
+        return ([(0, game.players[0], game.board, game.score, game.rng)
+                 for game in games],)
+    return [t / tables for t in measure(best_plays, samples, setup)]
+
+
+def bench_score_round(samples):
+    """Scoreboard.score: score one full board."""
+    game = _game()
+    def setup():
+        game.board.clear()
+        _fill_board(game)
+        return (game.board,)
+    return measure(game.score.score, samples, setup, number=20)
+
+
+def bench_apply_specials(samples):
+    """RendezVousGame._apply_specials: resolve one full board."""
+    game = _game()
+    def setup():
+        game.board.clear()
+        _fill_board(game)
+        return ()
+    return measure(game._apply_specials, samples, setup)
+
+
+def bench_deck_shuffle(samples):
+    """Deck.shuffle: reshuffle a full deck."""
+    deck = Deck(DEFINITION, rng=random.Random(SEED))
+    return measure(deck.shuffle, samples, number=10)
+
+
+def bench_deck_draw(samples):
+    """Deck.draw: draw one card."""
+    deck = Deck(DEFINITION, rng=random.Random(SEED))
+    return measure(deck.draw, samples, number=100)
+
+
+def bench_deck_parse(samples):
+    """DeckDefinition: parse the Standard deck (its file already cached)."""
+    return measure(DeckDefinition, samples)
+
+
+def bench_file_reader(samples):
+    """FileReader: tokenize the Standard deck file (not cached)."""
+    def run():
+        for pair in FileReader(DEFINITION.def_file):
+            pass
+    return measure(run, samples, number=10)
+
+
+def _achievements():
+    directory = tempfile.mkdtemp()
+    achievements = AchievementList(os.path.join(directory, "unlocked.txt"))
+    statistics = Statistics(os.path.join(directory, "stats.txt"))
+    return directory, achievements, statistics
+
+
+def bench_achievements_check(samples):
+    """AchievementList.check: check a random final score (nothing unlocked)."""
+    directory, achievements, statistics = _achievements()
+    game = _game()
+    def setup():
+        achievements.achieved = []
+        _random_scores(game)
+        return (game.score, 0, statistics)
+    try:
+        return measure(achievements.check, samples, setup)
+    finally:
+        shutil.rmtree(directory)
+
+
+def bench_achievements_check_round(samples):
+    """AchievementList.check_round: check a random board (nothing unlocked)."""
+    directory, achievements, statistics = _achievements()
+    game = _game()
+    def setup():
+        achievements.achieved = []
+        game.board.clear()
+        _fill_board(game)
+        return (game.board, 0)
+    try:
+        return measure(achievements.check_round, samples, setup)
+    finally:
+        shutil.rmtree(directory)
+
+
+def bench_save_game(samples):
+    """save_game: save a game in progress, mid-turn."""
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, "saved_game.rvs")
+    game = _game()
+    _play_round(game)
+    _fill_board(game)
+    try:
+        return measure(save_game, samples, lambda: (filename, game),
+                       number=10)
+    finally:
+        shutil.rmtree(directory)
+
+
+def bench_load_game(samples):
+    """SavedGame: read a saved game and restore it into a game."""
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, "saved_game.rvs")
+    game = _game()
+    _play_round(game)
+    save_game(filename, game)
+    def run():
+        SavedGame(filename).restore(game)
+    try:
+        return measure(run, samples, number=10)
+    finally:
+        shutil.rmtree(directory)
+
+
+def bench_full_game(samples):
+    """RendezVousGame: one headless game between two hard AIs."""
+    seeds = iter(range(SEED, SEED + samples))
+    def run():
+        game = _game(next(seeds))
+        while not _play_round(game):
+            pass
+    return measure(run, samples)
@@ -19,7 +19,7 @@ source.include_exts = py,png,jpg,ico,kv,atlas,txt,json
 #source.exclude_exts = spec
 
 # (list) List of directory to exclude (let empty to not exclude anything)
-source.exclude_dirs = testrendezvous,player
+source.exclude_dirs = testrendezvous,player,benchmarks,server,testserver
 
 # (list) List of exclusions using pattern matching
 source.exclude_patterns = test
@@ -0,0 +1,120 @@
+"""Keep recently used decks resident, within a memory budget."""
+
+from collections import OrderedDict
+
+
+def texture_size(texture):
+    """Return the approximate memory used by a texture (in bytes)."""
+    if texture is None:
+        return 0
+    try:
+        return texture.width * texture.height * 4  # RGBA
+    except AttributeError:
+        return 0
+
+
+class DeckCache(object):
+
+    """Least-recently-used cache of loaded decks.
+
+    Each entry is a dict with 'deck', 'texture', and 'achtexture' keys,
+    stored under the deck's base filename.  Whenever the total size of the
+    cached textures exceeds the budget, the least recently used decks are
+    dropped until it fits again.  Decks prefetched but not yet used are
+    dropped first, and a prefetched deck never drops one the player used.
+
+    Attributes:
+      budget  -- maximum total size of cached textures (in bytes)
+      size    -- current total size of cached textures (in bytes)
+
+    Methods:
+      get     -- return the entry (marking it recently used), or None
+      pop     -- remove and return the entry, or None
+      put     -- add or replace an entry, evicting others as needed
+      resize  -- recalculate an entry's size (e.g. after a texture loads)
+      sizeof  -- return the size of an entry's textures (0 if not cached)
+      keys    -- return the cached deck names, least recently used first
+
+    """
+
+    DEFAULT_BUDGET = 48 * 1024 * 1024  # three 2048x2048 deck textures
+
+    def __init__(self, budget=DEFAULT_BUDGET):
+        self.budget = budget
+        self.size = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._prefetched = set()
+
+    def __contains__(self, deck_base):
+        return deck_base in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def keys(self):
+        return list(self._entries.keys())
+
+    def sizeof(self, deck_base):
+        return self._sizes.get(deck_base, 0)
+
+    def _measure(self, entry):
+        return (texture_size(entry.get('texture')) +
+                texture_size(entry.get('achtexture')))
+
+    def get(self, deck_base):
+        """Return the cached entry and mark it recently used."""
+        try:
+            entry = self._entries.pop(deck_base)
+        except KeyError:
+            return None
+        self._entries[deck_base] = entry
+        self._prefetched.discard(deck_base)
+        return entry
+
+    def pop(self, deck_base):
+        """Remove the entry from the cache and return it."""
+        try:
+            entry = self._entries.pop(deck_base)
+        except KeyError:
+            return None
+        self.size -= self._sizes.pop(deck_base)
+        self._prefetched.discard(deck_base)
+        return entry
+
+    def put(self, deck_base, entry, prefetched=False):
+        """Cache the entry as most recently used, then enforce the budget.
+
+        A prefetched entry (not yet used by the player) may only evict
+        other prefetched entries, or itself.
+
+        """
+        self.pop(deck_base)
+        self._entries[deck_base] = entry
+        self._sizes[deck_base] = self._measure(entry)
+        self.size += self._sizes[deck_base]
+        if prefetched:
+            self._prefetched.add(deck_base)
+        self._evict(spare_used=prefetched)
+
+    def resize(self, deck_base):
+        """Remeasure the entry's textures, then enforce the budget."""
+        if deck_base not in self._entries:
+            return
+        self.size -= self._sizes[deck_base]
+        self._sizes[deck_base] = self._measure(self._entries[deck_base])
+        self.size += self._sizes[deck_base]
+        self._evict(spare_used=deck_base in self._prefetched)
+
+    def _evict(self, spare_used=False):
+        """Drop least recently used entries until the budget is met:
+        prefetched ones first, then (unless spared) those used."""
+        while self.size > self.budget:
+            for deck_base in self._entries:
+                if deck_base in self._prefetched:
+                    break
+            else:
+                if spare_used or not self._entries:
+                    return
+                deck_base = next(iter(self._entries))
+            self.pop(deck_base)
@@ -16,6 +16,8 @@ from kivy.uix.popup import Popup
 
 from rendezvous import GameSettings, SpecialSuit, EffectType
 from rendezvous.deck import Card
+from rendezvous.gameplay import find_play
+from rendezvous.matchups import matchups
 from rendezvous.achievements import Achievement
 
 from gui import PLAYER, DEALER
@@ -170,6 +172,10 @@ class HandDisplay(BoxLayout):
 
     """Display a hand of cards.
 
+    Attributes:
+      hand  -- the Hand to display
+      board -- the Gameboard it plays to (if any), to tell when it is stuck
+
     Methods:
       update      -- refresh the full display
       swap        -- switch the two cards in the hand and display
@@ -180,6 +186,7 @@ class HandDisplay(BoxLayout):
     """
     
     hand = ObjectProperty()
+    board = ObjectProperty(None, allownone=True)
     slots = ListProperty()
 
     def __init__(self, **kwargs):
@@ -203,14 +210,12 @@ class HandDisplay(BoxLayout):
 
     def update(self):
         """Update each card in the display."""
-        specials = 0
         for i, card in enumerate(self.hand):
             self.slots[i].card = None  # always force update
             if i not in self._played:
                 self.slots[i].card = card
-            if card is not None and card.suit == SpecialSuit.SPECIAL:
-                specials += 1
-        if specials + GameSettings.CARDS_ON_BOARD > GameSettings.CARDS_IN_HAND:
+        if (self.board is not None and
+            find_play(self.hand.cards, self.board.holds(PLAYER)) is None):
             try: self.add_widget(self._cant_play)
             except: pass
         else:
@@ -474,107 +479,168 @@ class BoardDisplay(FloatLayout):
 
     ## Auto-scoring (with breaks)
 
+    def fast_forward(self):
+        """Finish the running animation (if any) within this frame."""
+        try:
+            self._timeline.fast_forward()
+        except AttributeError:
+            pass
+
+    def _run_timeline(self, steps, callback=None, timer=GameSettings.SPEED,
+                      lead_in=True):
+        """Replace any running animation with a new BoardTimeline."""
+        self.fast_forward()
+        self._timeline = BoardTimeline(steps, callback=callback, timer=timer)
+        self._timeline.start(lead_in=lead_in)
+
     def play_dealer(self, cards, callback=None, timer=GameSettings.SPEED):
         """Automatically lay out the dealer's cards one by one."""
         self.board.play_cards(DEALER, cards)
-        Clock.schedule_once(lambda t: self._play_next_dealer(callback=callback,
-                                                             timer=timer))
+        steps = []
+        for index, card in enumerate(self.board[DEALER]):
+            if self.board._wait[DEALER][index]:
+                self.slots[DEALER][index].card = card  # no pause for holds
+            else:
+                steps.append((self._show_dealer_card, index))
+        self._run_timeline(steps, callback=callback, timer=timer,
+                           lead_in=False)
 
-    def _play_next_dealer(self, index=None,
-                          callback=None, timer=GameSettings.SPEED):
-        """Place the next dealer card on the board."""
-        if index is None:
-            index = 0
-        else:
-            index += 1
-            if index >= len(self.board[0]):
-                if callback is not None:
-                    Clock.schedule_once(lambda dt:callback())
-                return
+    def _show_dealer_card(self, index):
+        """Reveal the dealer's card at the given index."""
         self.slots[DEALER][index].card = self.board[DEALER][index]
-        if self.board._wait[DEALER][index]:
-            Clock.schedule_once(lambda t: self._play_next_dealer(index=index,
-                                                             callback=callback,
-                                                             timer=timer))
-        else:
-            Clock.schedule_once(lambda t: self._play_next_dealer(index=index,
-                                                                 callback=callback,
-                                                                 timer=timer),
-                                timer)
 
     def apply_specials(self, game, hand_display,
                        callback=None, timer=GameSettings.SPEED):
         """Apply all special cards in play, one-by-one with highlighting."""
         self.highlight(DARKEN)
-        Clock.schedule_once(lambda t: self._apply_special(game, hand_display,
-                                                          callback=callback,
-                                                          timer=timer), timer)
-
-    def _apply_special(self, game, hand_display, player=None, index=None,
-                       callback=None, timer=GameSettings.SPEED):
-        """Apply the next special card, column by column."""
-        if index is None:
-            player, index = 0, 0
-        else:
-            self.slots[player][index].highlight(DARKEN)
-            player += 1
-            if player >= len(self.board):
-                player = 0
-                index += 1
-                if index >= len(self.board[0]):
-                    Clock.schedule_once(lambda t: callback())
-                    return
-        next_slot = lambda t: self._apply_special(game, hand_display,
-                                                  player=player, index=index,
-                                                  callback=callback,
-                                                  timer=timer)
-        if (self.board[player][index] is None or
-            self.board[player][index].suit != SpecialSuit.SPECIAL):
-            Clock.schedule_once(next_slot)
-            return
-            
+        plan = game.plan_specials()
+        steps = []
+        for index in range(len(self.board[0])):
+            for player in range(len(self.board)):
+                card = self.board[player][index]
+                if card is not None and card.suit == SpecialSuit.SPECIAL:
+                    steps.append((self._apply_special, game, hand_display,
+                                  player, index, plan))
+        if steps:
+            steps.append((self._darken_last_special,))
+        self._last_special = None
+        self._run_timeline(steps, callback=callback, timer=timer)
+
+    def _darken_last_special(self):
+        """Return the last special applied to the darkened highlight."""
+        if self._last_special is not None:
+            self.slots[self._last_special[0]][self._last_special[1]].highlight(DARKEN)
+            self._last_special = None
+
+    def _apply_special(self, game, hand_display, player, index, plan=None):
+        """Apply the special card at the given location, with highlights."""
+        self._darken_last_special()
+        self._last_special = (player, index)
         self.slots[player][index].highlight(BLUE)
-        game._apply(player, index)
+        game._apply(player, index, plan)
         self.update()
         if (player == PLAYER and
             self.slots[player][index].card.effect.effect == EffectType.FLUSH):
             hand_display.update()
-        Clock.schedule_once(next_slot, timer)
 
     def score_round(self, score_display, index=None,
                     callback=None, timer=GameSettings.SPEED):
         """Score the given match, or all of them, with highlighting."""
-        if index is not None:
-            self._score_match(score_display, score_display.scoreboard, index)
-            Clock.schedule_once(lambda t: callback(), timer)
-        Clock.schedule_once(lambda t: self._score_next_match(score_display,
-                                                             callback=callback,
-                                                             timer=timer))
-
-    def _score_next_match(self, score_display, index=None,
-                          callback=None, timer=GameSettings.SPEED):
-        """Highlight and score the next match of the round."""
         if index is None:
-            index = 0
+            indices = range(len(self.board[0]))
         else:
-            index += 1
-            if index >= len(self.board[0]):
-                Clock.schedule_once(lambda t: callback())
-                return
-        self._score_match(score_display, score_display.scoreboard, index)
-        Clock.schedule_once(lambda t: self._score_next_match(score_display,
-                                                             index=index,
-                                                             callback=callback,
-                                                             timer=timer),
-                            timer)
+            indices = [index]
+        steps = [(self._score_match, score_display, score_display.scoreboard, i)
+                 for i in indices]
+        self._run_timeline(steps, callback=callback, timer=timer,
+                           lead_in=False)
 
     def _score_match(self, score_display, score, index):
         """Highlight and score the given match."""
+        table = matchups(len(self.board), len(self.board[0]))
         for player in range(len(self.board)):
+            enemy = table[player][index]
             result = score._score_match(player, self.board[player][index],
-                                        player-1, self.board[player-1][index])
+                                        enemy, self.board[enemy][index])
             self.slots[player][index].highlight([WHITE, GREEN, RED][result])
         score_display.update()
+
+
+class BoardTimeline(object):
+
+    """Run a precomputed list of board animation steps on a single clock.
+
+    Each step is a tuple of (function, *args).  Steps are run one per tick
+    of a single interval clock, and the callback (if any) is called one tick
+    after the last step so that it stays on screen for its full time.
+
+    Timers shorter than MIN_STEP_TIME could not be seen anyway, so the full
+    timeline is fast-forwarded into a single frame instead.
+
+    Methods:
+      start        -- begin running the steps
+      fast_forward -- run all remaining steps (and the callback) immediately
+      cancel       -- stop without running any remaining steps
+
+    """
+
+    MIN_STEP_TIME = 1.0 / 60  #: one frame at 60 fps
+
+    def __init__(self, steps, callback=None, timer=GameSettings.SPEED):
+        self.steps = list(steps)
+        self.callback = callback
+        self.timer = timer
+        self.running = False
+
+    def __len__(self):
+        return len(self.steps)
+
+    def start(self, lead_in=True):
+        """Begin the timeline; without lead_in, the first step runs now."""
+        self.running = True
+        if self.timer < self.MIN_STEP_TIME:
+            self.fast_forward()
+            return
+        if not lead_in and self.steps:
+            self._step()
+        Clock.schedule_interval(self._tick, self.timer)
+
+    def _step(self):
+        """Run the next step."""
+        step = self.steps.pop(0)
+        step[0](*step[1:])
+
+    def _tick(self, dt):
+        """Run one step per clock tick, then finish."""
+        if self.steps:
+            self._step()
+            return True
+        self._finish()
+        return False
+
+    def _finish(self):
+        """Stop the clock and let the caller know we are done."""
+        Clock.unschedule(self._tick)
+        self.running = False
+        if self.callback is not None:
+            callback, self.callback = self.callback, None
+            callback()
+
+    def fast_forward(self):
+        """Run all remaining steps in this frame, then the callback."""
+        if not self.running:
+            return
+        Clock.unschedule(self._tick)
+        while self.steps:
+            self._step()
+        self._finish()
+
+    def cancel(self):
+        """Stop the timeline without running the remaining steps."""
+        Clock.unschedule(self._tick)
+        self.steps = []
+        self.callback = None
+        self.running = False
         
 
 class ScoreDisplay(BoxLayout):
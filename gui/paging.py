@@ -0,0 +1,52 @@
+"""Work out which items of a long list or set of pages are in view.
+
+These take only sizes and counts, so RecycleList and RecyclePages (see
+gui.recycle) can be checked without building any widgets.
+
+"""
+
+import math
+
+
+def row_count(items, cols):
+    """Return the number of rows needed for the items, cols across."""
+    return int(math.ceil(items / float(cols)))
+
+
+def visible_items(items, cols, row_height, height, scroll_y):
+
+    """Return the range of item indices (partly) in view in a list.
+
+    Arguments:
+      items      -- number of items in the list
+      cols       -- number of items across each row
+      row_height -- height of each row
+      height     -- height of the view onto the list
+      scroll_y   -- scroll position, 1 at the top and 0 at the bottom
+
+    """
+
+    if row_height <= 0:
+        return range(0)
+    rows = row_count(items, cols)
+    hidden = max(rows * row_height - height, 0)
+    top = (1 - scroll_y) * hidden
+    first = max(int(top // row_height), 0)
+    last = min(int((top + height) // row_height) + 1, rows)
+    return range(first * cols, min(last * cols, items))
+
+
+def page_count(items, per_page):
+    """Return the number of pages needed for the items (at least one)."""
+    return max(int(math.ceil(items / float(per_page))), 1)
+
+
+def page_items(page, per_page):
+    """Return the slice of items shown on the given page."""
+    start = page * int(per_page)
+    return slice(start, start + int(per_page))
+
+
+def near_pages(index, pages):
+    """Return the set of pages to fill: the one showing and each beside it."""
+    return set(range(max(index - 1, 0), min(index + 2, pages)))
@@ -0,0 +1,116 @@
+"""Prepare decks in the background before the player selects them."""
+
+import os
+import threading
+from functools import partial
+
+from kivy.clock import Clock
+from kivy.graphics.texture import Texture
+from kivy.loader import Loader
+from kivy.logger import Logger
+
+from rendezvous.deck import DeckDefinition
+from gui.cache import DeckCache
+
+
+class DeckPrefetcher(object):
+
+    """Parse definitions and decode textures for likely next decks.
+
+    The DeckDefinition is parsed on a worker thread; the deck and
+    achievement images are then handed to the kivy Loader, which decodes
+    them on its own workers.  Results are stored in the shared DeckCache.
+    Nothing is prefetched unless it fits within the cache's budget, with
+    each deck still parsing or decoding counted at DECK_ESTIMATE, and
+    prefetched entries only ever evict each other (see DeckCache.put), so
+    speculation never evicts a deck the player actually used.
+
+    Attributes:
+      cache     -- DeckCache to fill
+      callback  -- called as callback(deck_base, entry) when a texture loads
+
+    Methods:
+      prefetch  -- start preparing the given decks (by base filename)
+
+    """
+
+    #: Approximate size of one deck (deck and achievement textures)
+    DECK_ESTIMATE = 2 * 2048 * 2048 * 4
+
+    def __init__(self, cache, callback=None):
+        self.cache = cache
+        self.callback = callback
+        self._pending = set()
+        self._loading = {}
+
+    def _committed(self):
+        """Return the cache's size once every prefetch started has loaded."""
+        size = self.cache.size + self.DECK_ESTIMATE * len(self._pending)
+        for deck_base in list(self._loading):
+            if deck_base not in self.cache:
+                del self._loading[deck_base]  # evicted
+            else:
+                size += max(0, self.DECK_ESTIMATE -
+                               self.cache.sizeof(deck_base))
+        return size
+
+    def prefetch(self, deck_bases):
+        """Start preparing each deck that is not already cached."""
+        for deck_base in deck_bases:
+            if deck_base in self.cache or deck_base in self._pending:
+                continue
+            if self._committed() + self.DECK_ESTIMATE > self.cache.budget:
+                return
+            self._pending.add(deck_base)
+            self._start(deck_base)
+
+    def _start(self, deck_base):
+        """Parse the deck's definition on a worker thread."""
+        thread = threading.Thread(target=self._parse, args=(deck_base,))
+        thread.daemon = True
+        thread.start()
+
+    def _parse(self, deck_base):
+        """Worker thread: parse the definition, then return to the main thread."""
+        try:
+            definition = DeckDefinition(deck_base)
+        except Exception as e:
+            Logger.warning("RendezVous: could not prefetch %s (%s)"
+                           % (deck_base, e))
+            Clock.schedule_once(lambda dt: self._pending.discard(deck_base))
+            return
+        Clock.schedule_once(lambda dt: self._parsed(deck_base, definition))
+
+    def _parsed(self, deck_base, definition):
+        """Cache the definition and start decoding its textures."""
+        self._pending.discard(deck_base)
+        if deck_base in self.cache:
+            return  # loaded normally in the meantime
+        entry = {'deck' : definition, 'texture' : None, 'achtexture' : None}
+        self.cache.put(deck_base, entry, prefetched=True)
+        self._loading[deck_base] = entry
+        self._load_textures(deck_base, definition, entry)
+
+    def _load_textures(self, deck_base, definition, entry):
+        """Hand the deck's images to the kivy Loader to decode."""
+        loader = Loader.image(definition.img_file)
+        loader.bind(on_load=partial(self._loaded, deck_base, entry, 'texture'))
+        achievement_file = os.path.join("data", "decks",
+                                        deck_base + "Achievements.png")
+        if os.path.exists(achievement_file):
+            loader = Loader.image(achievement_file)
+            loader.bind(on_load=partial(self._loaded, deck_base, entry,
+                                        'achtexture'))
+        else:
+            entry['achtexture'] = Texture.create()
+
+    def _loaded(self, deck_base, entry, key, loader):
+        """Store a decoded texture in its cache entry."""
+        if not loader.image.texture:
+            return
+        entry[key] = loader.image.texture
+        if entry['texture'] is not None and entry['achtexture'] is not None:
+            self._loading.pop(deck_base, None)
+        self.cache.resize(deck_base)
+        if self.callback is not None:
+            self.callback(deck_base, entry)
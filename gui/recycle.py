@@ -0,0 +1,189 @@
+"""Lists and pages that only hold widgets for the items in view.
+
+Each view is given its item as a dict of properties, as in
+viewclass(**data[i]).  Views leaving the screen are kept in a pool, and
+are handed the properties of the next items to come into view instead of
+new widgets being built, so the number of widgets (and the textures they
+hold) stays the same however long the list grows.  Which items are in
+view is worked out in gui.paging.
+
+"""
+
+from kivy.properties import ListProperty, NumericProperty
+from kivy.uix.carousel import Carousel
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.relativelayout import RelativeLayout
+from kivy.uix.scrollview import ScrollView
+
+from gui.paging import row_count, visible_items
+from gui.paging import page_count, page_items, near_pages
+
+
+def _reuse(viewclass, pool, data):
+    """Return a view showing this data, from the pool if possible."""
+    if not pool:
+        return viewclass(**data)
+    view = pool.pop()
+    for key, value in data.items():
+        setattr(view, key, value)
+    return view
+
+
+class RecycleList(ScrollView):
+
+    """Scroll vertically through rows of views, building only those in view.
+
+    Attributes:
+      viewclass  -- Widget class for each item
+      data       -- one dict of viewclass properties for each item
+      cols       -- number of items across each row
+      row_height -- height of each row (default: the height the viewclass
+                    gives itself, as in its kv rule)
+      container  -- the widget holding the views currently in view
+
+    Methods:
+      refresh    -- reapply the data to each view (after changing a dict)
+
+    """
+
+    data = ListProperty()
+    cols = NumericProperty(1)
+    row_height = NumericProperty(0)
+
+    def __init__(self, viewclass, **kwargs):
+        self.viewclass = viewclass
+        self._views = {}  # item index : view
+        self._pool = []
+        self._measured = 0
+        kwargs.setdefault('do_scroll_x', False)
+        ScrollView.__init__(self, **kwargs)
+        self.container = RelativeLayout(size_hint_y=None)
+        self.add_widget(self.container)
+        self.bind(data=self._reset, cols=self._reset,
+                  row_height=self._reset, size=self._reset,
+                  scroll_y=self._show)
+        self._reset()
+
+    def _row_height(self):
+        """Return the row height given, or else that of the views."""
+        if self.row_height > 0:
+            return self.row_height
+        if not self._measured and self.data:
+            view = _reuse(self.viewclass, self._pool, self.data[0])
+            self._measured = view.height
+            self._pool.append(view)
+        return self._measured
+
+    def _reset(self, *args):
+        """Place everything afresh (the data or sizes have changed)."""
+        for index in list(self._views):
+            self._release(index)
+        self.container.height = (row_count(len(self.data), int(self.cols)) *
+                                 self._row_height())
+        self._show()
+
+    def _release(self, index):
+        view = self._views.pop(index)
+        self.container.remove_widget(view)
+        self._pool.append(view)
+
+    def _show(self, *args):
+        """Give a view to each item in view, reusing those out of it."""
+        row_height = self._row_height()
+        visible = visible_items(len(self.data), int(self.cols), row_height,
+                                self.height, self.scroll_y)
+        for index in list(self._views):
+            if index not in visible:
+                self._release(index)
+        width = self.width / float(self.cols)
+        for index in visible:
+            if index in self._views:
+                continue
+            view = _reuse(self.viewclass, self._pool, self.data[index])
+            row, col = divmod(index, int(self.cols))
+            view.size_hint = (None, None)
+            view.size = (width, row_height)
+            view.pos = (col * width,
+                        self.container.height - (row + 1) * row_height)
+            self.container.add_widget(view)
+            self._views[index] = view
+
+    def refresh(self):
+        """Reapply the data to each view currently shown."""
+        for index, view in self._views.items():
+            for key, value in self.data[index].items():
+                setattr(view, key, value)
+
+
+class RecyclePages(Carousel):
+
+    """Swipe through pages of views, filling only the pages near view.
+
+    Each page is an empty GridLayout until it is (or is next to) the page
+    showing; pages further away return their views to be reused.
+
+    Attributes:
+      viewclass -- Widget class for each item
+      data      -- one dict of viewclass properties for each item
+      rows      -- rows of items on each page
+      per_page  -- number of items on each page
+
+    Methods:
+      refresh   -- reapply the data to each view (after changing a dict)
+
+    """
+
+    data = ListProperty()
+    per_page = NumericProperty(10)
+
+    def __init__(self, viewclass, rows=2, **kwargs):
+        self.viewclass = viewclass
+        self.rows = rows
+        self._filled = set()
+        self._pool = []
+        kwargs.setdefault('direction', 'right')
+        Carousel.__init__(self, **kwargs)
+        self.bind(data=self._reset, per_page=self._reset, index=self._show)
+        self._reset()
+
+    def _reset(self, *args):
+        """Lay out empty pages for the data."""
+        for page in list(self._filled):
+            self._empty(page)
+        for slide in list(self.slides):
+            self.remove_widget(slide)
+        for i in range(page_count(len(self.data), self.per_page)):
+            self.add_widget(GridLayout(rows=self.rows))
+        self._show()
+
+    def _items(self, page):
+        return self.data[page_items(page, self.per_page)]
+
+    def _fill(self, page):
+        for data in self._items(page):
+            self.slides[page].add_widget(_reuse(self.viewclass, self._pool,
+                                                data))
+        self._filled.add(page)
+
+    def _empty(self, page):
+        layout = self.slides[page]
+        for view in list(layout.children):
+            layout.remove_widget(view)
+            self._pool.append(view)
+        self._filled.discard(page)
+
+    def _show(self, *args):
+        """Fill the pages in and beside view; empty the rest."""
+        near = near_pages(self.index or 0, len(self.slides))
+        for page in self._filled - near:
+            self._empty(page)
+        for page in near - self._filled:
+            self._fill(page)
+
+    def refresh(self):
+        """Reapply the data to each view currently shown."""
+        for page in self._filled:
+            views = reversed(self.slides[page].children)  # in order added
+            for view, data in zip(views, self._items(page)):
+                for key, value in data.items():
+                    setattr(view, key, value)
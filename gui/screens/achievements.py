@@ -1,14 +1,13 @@
 from kivy.app import App
-from kivy.properties import ObjectProperty, BooleanProperty
+from kivy.properties import ObjectProperty, BooleanProperty, StringProperty
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
-from kivy.uix.scrollview import ScrollView
 from kivy.uix.actionbar import ActionBar
 from kivy.uix.popup import Popup
 from kivy.uix.button import Button
 from kivy.uix.widget import Widget
 
+from gui.recycle import RecycleList
 from gui.screens.game import AchievementEarnedDisplay, UnlockDisplay
 
 
@@ -18,6 +17,7 @@ class AchievementDisplay(BoxLayout):
 
     achievement = ObjectProperty()
     earned = BooleanProperty()
+    progress = StringProperty()
 
     def get_shading(self, earned):  # include earned for auto-binding
         """Return the RGBA color for the images."""
@@ -82,20 +82,25 @@ class AchievementsScreen(Screen):
 
         layout = BoxLayout(orientation="vertical")
         layout.add_widget(ActionBar(size_hint=(1, .125)))
-        scroller = ScrollView(do_scroll_x=False)
-        self.main = main = GridLayout(cols=1, size_hint_y=None)
-        main.bind(minimum_height=main.setter('height'))
-        for achievement in achievements.available:
-            main.add_widget(AchievementDisplay(achievement=achievement,
-                                earned=(achievement in achievements.achieved)))
-        scroller.add_widget(main)
-        layout.add_widget(scroller)
+        self.list = RecycleList(AchievementDisplay, data=self._data())
+        layout.add_widget(self.list)
         self.add_widget(layout)
 
+    def _data(self):
+        achieved = self.achievements.achieved
+        return [{'achievement' : achievement,
+                 'earned' : achievement in achieved,
+                 'progress' : ("" if achievement in achieved
+                               else self._progress(achievement))}
+                for achievement in self.achievements.available]
+
+    def _progress(self, achievement):
+        """Return e.g. "3 / 5" for each counted criterion (as saved)."""
+        return ", ".join("%s / %s" % (min(value or 0, goal), goal)
+                         for value, goal
+                         in self.achievements.progress(achievement)
+                         if goal > 1)
+
     def update(self):
-        """Update the earned/unearned status of each displayed Achievement."""
-        for display in self.main.children:
-            try:
-                display.earned = display.achievement in self.achievements.achieved
-            except AttributeError:
-                continue
+        """Update the status and progress of each displayed Achievement."""
+        self.list.data = self._data()
@@ -1,5 +1,4 @@
 import os
-import math
 import warnings
 
 from kivy.app import App
@@ -8,13 +7,13 @@ from kivy.properties import BooleanProperty, ListProperty
 from kivy.uix.screenmanager import Screen
 from kivy.uix.widget import Widget
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
-from kivy.uix.scrollview import ScrollView
 from kivy.uix.actionbar import ActionBar
 from kivy.uix.label import Label
 from kivy.uix.popup import Popup
 
-from rendezvous import FileReader, GameSettings
+from rendezvous import FileReader, GameSettings, Storage
+
+from gui.recycle import RecycleList
 
 
 class BackgroundCategory(object):
@@ -89,6 +88,12 @@ class CategoryIcon(BoxLayout):
 
     def __init__(self, **kwargs):
         super(CategoryIcon, self).__init__(**kwargs)
+        self._build()
+        self.bind(size=self._set_pad, category=self._build)
+
+    def _build(self, *args):
+        """Show the current category (again, when this icon is reused)."""
+        self.clear_widgets()
         label = Label(text=self.category.name,
                               halign="left", valign="middle",
                               size_hint=(3, 1))
@@ -101,7 +106,6 @@ class CategoryIcon(BoxLayout):
                                               label=False))
         for i in range(3 - len(self.category.backgrounds)):
             self.add_widget(Widget())
-        self.bind(size=self._set_pad)
 
     def _set_pad(self, *args):
         self.padding = self.size[0] * 0.05, self.size[1] * 0.01
@@ -114,25 +118,15 @@ class CategoryIcon(BoxLayout):
 
     def _show_category(self):
         popup = Popup(title="%s Backgrounds" % self.category.name)
-        self.scroller = ScrollView(do_scroll_x=False)
-        self.grid = GridLayout(cols=3, size_hint_y=None)
-        for filename, index in self.category.backgrounds:
-            self.grid.add_widget(BackgroundDisplay(screen=self.screen,
-                                                   filename=filename,
-                                                   index=index,
-                                                   popup=popup))
-        for i in range(3 - len(self.category.backgrounds)):
-            self.grid.add_widget(Widget())
-        self.scroller.bind(size=self._resize)
-        self.scroller.add_widget(self.grid)
-        popup.add_widget(self.scroller)
+        scroller = RecycleList(BackgroundDisplay, cols=3, data=[
+            {'screen' : self.screen, 'filename' : filename, 'index' : index,
+             'popup' : popup}
+            for filename, index in self.category.backgrounds])
+        scroller.bind(width=lambda scroller, width:
+                      setattr(scroller, 'row_height', width / 3.0))
+        popup.add_widget(scroller)
         popup.open()
 
-    def _resize(self, *args):
-        rows = math.ceil(len(self.category.backgrounds) / 3.0)
-        self.grid.size = (self.scroller.size[0],
-                          rows * self.scroller.size[0] / 3)
-        
 
 class BackgroundCategoryDisplay(Screen):
 
@@ -141,13 +135,16 @@ class BackgroundCategoryDisplay(Screen):
     Attributes:
       available -- list of BackgroundCategory objects
       purchased -- list of purchased filenames
+      storage   -- where the files are read and saved (default:
+                   rendezvous.Storage)
 
     """
 
     purchased = ListProperty()
 
-    def __init__(self, player_file=None, **kwargs):
+    def __init__(self, player_file=None, storage=None, **kwargs):
         Screen.__init__(self, **kwargs)        
+        self.storage = storage or Storage
         self.purchased = []
         if player_file is None:
             self._purchased_file = os.path.join("player", "backgrounds.txt")
@@ -161,20 +158,15 @@ class BackgroundCategoryDisplay(Screen):
 
         layout = BoxLayout(orientation="vertical")
         layout.add_widget(ActionBar(size_hint=(1, .125)))
-        scroller = ScrollView(do_scroll_x=False)
-        self.grid = GridLayout(cols=1, size_hint_y=None)
-        self.grid.add_widget(CategoryIcon(screen=self,
-                                          category=self.purchased_cat))
+        self.list = RecycleList(CategoryIcon, data=[
+            {'screen' : self, 'category' : category}
+            for category in [self.purchased_cat] + self.categories])
         self.bind(size=self._resize_grid)
-        for cat in self.categories:
-            self.grid.add_widget(CategoryIcon(screen=self,
-                                              category=cat))
-        scroller.add_widget(self.grid)
-        layout.add_widget(scroller)
+        layout.add_widget(self.list)
         self.add_widget(layout)
 
     def _resize_grid(self, *args):
-        self.grid.height = self.width / 6 * (1 + len(self.categories))
+        self.list.row_height = self.width / 6
 
     def __getitem__(self, key):
         for cat in self.categories:
@@ -184,7 +176,8 @@ class BackgroundCategoryDisplay(Screen):
 
     def _read_available(self):
         current_category = None
-        for tag, value in FileReader(self._available_file):
+        for tag, value in FileReader(self._available_file, self.storage,
+                                     cached=True):
             
             if tag == 'CATEGORY':
                 try:
@@ -218,15 +211,15 @@ class BackgroundCategoryDisplay(Screen):
                          os.path.join(path, "%s.png" % file),
                          os.path.join(path, file),
                          file):                         
-            if os.path.isfile(filename):
+            if self.storage.exists(filename):
                 return os.path.basename(filename)
         return None
 
     def _read_purchased(self):
-        if not os.path.isfile(self._purchased_file):
+        if not self.storage.exists(self._purchased_file):
             self.purchased = [GameSettings.BACKGROUND]
             return
-        f = open(self._purchased_file, 'r')
+        f = self.storage.open(self._purchased_file, 'r')
         for filename in f.readlines():
             self.purchased.append(filename.strip())
         f.close()
@@ -234,7 +227,7 @@ class BackgroundCategoryDisplay(Screen):
     def purchase(self, filename, index):
         self.purchased.append(filename)
         self.purchased_cat.add(filename, index)
-        f = open(self._purchased_file, 'w')
+        f = self.storage.open(self._purchased_file, 'w')
         for filename in self.purchased:
             f.write('%s\n' % filename)
         f.close()
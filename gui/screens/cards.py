@@ -2,12 +2,10 @@ from kivy.app import App
 from kivy.properties import ObjectProperty, BooleanProperty
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.scrollview import ScrollView
 from kivy.uix.actionbar import ActionBar
 from kivy.uix.popup import Popup
-from kivy.uix.carousel import Carousel
-from kivy.uix.gridlayout import GridLayout
 
+from gui.recycle import RecyclePages
 from gui.screens.powerups import CardSelect
 
 from rendezvous.deck import Card
@@ -67,29 +65,30 @@ class DeckEditScreen(Screen):
         Screen.__init__(self, **kwargs)
         main = BoxLayout(orientation="vertical")
         main.add_widget(ActionBar(size_hint=(1, .125)))
-        carousel = Carousel(direction='right')
-        layout = GridLayout(rows=2)
-        i, c = 0, 0
-        for card in self.definition.cards(App.get_running_app().achievements,
-                                          use_blocks=False):
-            color = (1, 1, 1, 1)
-            if str(card) in self.definition.blocked_cards:
-                color = (.5, 0, 0, 1)
-            layout.add_widget(CardSelect(card=card,
-                                         color=color,
-                                         callback=self._card_detail,
-                                         args=(card,)))
-            i += 1
-            c += 1
-            if i == 10:
-                carousel.add_widget(layout)
-                layout = GridLayout(rows=2)
-                i = 0
-        if c < 50 + len(self.definition.specials):
-            layout.add_widget(CardSelect(card=self.LOCKED_CARD))
-        carousel.add_widget(layout)
-        main.add_widget(carousel)
+        cards = list(self.definition.cards(App.get_running_app().achievements,
+                                           use_blocks=False))
+        data = [self._data(card) for card in cards]
+        if len(cards) < 50 + len(self.definition.specials):
+            data.append({'card' : self.LOCKED_CARD, 'color' : (1, 1, 1, 1),
+                         'callback' : None, 'args' : ()})
+        self.pages = RecyclePages(CardSelect, data=data)
+        main.add_widget(self.pages)
         self.add_widget(main)
 
+    def _data(self, card):
+        color = (1, 1, 1, 1)
+        if str(card) in self.definition.blocked_cards:
+            color = (.5, 0, 0, 1)
+        return {'card' : card, 'color' : color,
+                'callback' : self._card_detail, 'args' : (card,)}
+
     def _card_detail(self, display, card):
-        CardDetail(card=card, display=display).open()        
+        popup = CardDetail(card=card, display=display)
+        popup.bind(on_dismiss=lambda *args: self._update(card))
+        popup.open()
+
+    def _update(self, card):
+        """Keep the card's (un)blocked color when its view is reused."""
+        for data in self.pages.data:
+            if data['card'] is card:
+                data.update(self._data(card))
@@ -69,6 +69,17 @@ class DeckCatalogScreen(Screen):
         main.add_widget(ActionBar())
         main.add_widget(self.carousel)
         self.add_widget(main)
+        self.carousel.bind(index=self.prefetch)
+
+    def on_enter(self):
+        self.prefetch()
+
+    def prefetch(self, *args):
+        """Prepare the displayed deck and its neighbors in the background."""
+        slide = self.carousel.current_slide
+        if slide is None:
+            return
+        App.get_running_app().prefetch_decks(slide.deck.base_filename)
 
     def update(self):
         for slide in self.carousel.slides:
@@ -60,6 +60,7 @@ class GameScreen(PowerupsAvailable, Screen):
                                        size_hint=(1, .4))
         self.tooltip = ToolTipDisplay(size_hint=(1, .5))
         self.hand_display = HandDisplay(hand=self.game.players[PLAYER],
+                                        board=self.game.board,
                                         size_hint=(1, .3))
 
         # Lay out the display
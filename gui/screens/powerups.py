@@ -5,18 +5,16 @@ from kivy.properties import ObjectProperty, NumericProperty, ListProperty
 from kivy.properties import StringProperty
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
-from kivy.uix.scrollview import ScrollView
 from kivy.uix.actionbar import ActionBar
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.widget import Widget
-from kivy.uix.carousel import Carousel
 
 from rendezvous import PowerupType, SpecialSuit
 
 from gui.components import CardDisplay, ToolTipDisplay, PowerupIcon
+from gui.recycle import RecycleList, RecyclePages
 
 
 class CardSelect(CardDisplay):
@@ -70,6 +68,7 @@ class PowerupDisplay(BoxLayout):
 
     powerup = ObjectProperty()
     count = NumericProperty()
+    screen = ObjectProperty(None, allownone=True)
 
     def on_touch_down(self, touch):
         """Make sure we don't grab drag touches."""
@@ -91,16 +90,10 @@ class PowerupDisplay(BoxLayout):
         """Select a card to purchase for PowerupType.PLAY_CARD."""
         app = App.get_running_app()
         popup = Popup(title=str(self.powerup))
-        carousel = Carousel(direction='right')
-        deck = list(app.loaded_deck.cards(app.achievements))
-        for i in range(0, len(deck), 10):
-            layout = GridLayout(rows=2)
-            for card in deck[i:i+10]:
-                layout.add_widget(CardSelect(card=card,
-                                             callback=self._confirm_card,
-                                             args=(card, popup)))
-            carousel.add_widget(layout)
-        popup.add_widget(carousel)
+        popup.add_widget(RecyclePages(CardSelect, data=[
+            {'card' : card, 'callback' : self._confirm_card,
+             'args' : (card, popup)}
+            for card in app.loaded_deck.cards(app.achievements)]))
         popup.open()
 
     def _confirm_card(self, display, card, selection_popup):
@@ -129,6 +122,8 @@ class PowerupDisplay(BoxLayout):
 
     def _increment(self, count=1):
         self.count += count
+        if self.screen is not None:
+            self.screen.update()
 
     
 class PowerupScreen(Screen):
@@ -141,19 +136,14 @@ class PowerupScreen(Screen):
 
         layout = BoxLayout(orientation="vertical")
         layout.add_widget(ActionBar(size_hint=(1, .125)))
-        scroller = ScrollView(do_scroll_x=False)
-        self.main = main = GridLayout(cols=1, size_hint_y=None)
-        main.bind(minimum_height=main.setter('height'))
-        for powerup in self.app.powerups:
-            main.add_widget(PowerupDisplay(powerup=powerup,
-                                    count=self.app.powerups.count(powerup)))
-        scroller.add_widget(main)
-        layout.add_widget(scroller)
+        self.list = RecycleList(PowerupDisplay, data=self._data())
+        layout.add_widget(self.list)
         self.add_widget(layout)
 
+    def _data(self):
+        return [{'powerup' : powerup, 'screen' : self,
+                 'count' : self.app.powerups.count(powerup)}
+                for powerup in self.app.powerups]
+
     def update(self):
-        for display in self.main.children:
-            try:
-                display.count = self.app.powerups.count(display.powerup)
-            except AttributeError:
-                pass
+        self.list.data = self._data()
@@ -34,9 +34,10 @@ class DealerDisplay(Widget):
 
     def get_dealer(self):
         """Return the suit and win/loss for the dealer image to show."""
-        won = len(self.score.wins(self.player)) - len(self.score.wins(self.player-1))
+        opponent = self.score.opponent(self.player)
+        won = self.score.win_count(self.player) - self.score.win_count(opponent)
         if won != 0: won = int(won / abs(won))
-        suit = self.score.best_suit(self.player) if won else self.score.best_suit(self.player-1)
+        suit = self.score.best_suit(self.player) if won else self.score.best_suit(opponent)
         return (suit, -won)
 
 
@@ -78,8 +79,8 @@ class FinalScoreDisplay(BoxLayout):
         
     def get_win_text(self):
         """Return the win/lose/draw text to display."""
-        pscore = len(self.score.wins(PLAYER))
-        dscore = len(self.score.wins(DEALER))
+        pscore = self.score.win_count(PLAYER)
+        dscore = self.score.win_count(DEALER)
         if pscore > dscore:
             return "YOU WIN!" 
         elif pscore == dscore:
@@ -0,0 +1,96 @@
+"""Measure the time it takes to reach the first frame.
+
+Every screen that is not needed for the first frame is registered with
+RendezVousWidget by module and class name, and is only imported and built
+on its first visit.  StartupProfile records how long each of those steps
+took, so that slow imports or screens stand out on low-end devices.
+
+"""
+
+import time
+import importlib
+
+# time.perf_counter added in Python 3.3
+_timer = getattr(time, 'perf_counter', time.time)
+
+
+class StartupProfile(object):
+
+    """Record import, load, and construction times since startup.
+
+    Attributes:
+      started     -- timer reading when the profile was created
+      imports     -- [(module name, seconds)] in import order
+      loads       -- [(description, seconds)] for data files, etc.
+      builds      -- [(screen name, seconds)] in construction order
+      first_frame -- seconds from startup to the first frame (or None)
+
+    Methods:
+      load_class  -- import a module (timed) and return the named class
+      build       -- construct a screen (timed) and return it
+      time        -- call any function (timed) and return its result
+      mark_first_frame -- note that the first frame has been drawn
+      report      -- return a human-readable summary
+
+    """
+
+    def __init__(self):
+        self.started = _timer()
+        self.imports = []
+        self.loads = []
+        self.builds = []
+        self.first_frame = None
+        self._modules = {}
+
+    def is_loaded(self, module_name):
+        """Return whether the module has been imported through this profile."""
+        return module_name in self._modules
+
+    def load_class(self, module_name, class_name):
+        """Import the module on first use and return the named class."""
+        try:
+            module = self._modules[module_name]
+        except KeyError:
+            start = _timer()
+            module = importlib.import_module(module_name)
+            self.imports.append((module_name, _timer() - start))
+            self._modules[module_name] = module
+        return getattr(module, class_name)
+
+    def build(self, name, cls, **kwargs):
+        """Construct and return the screen, recording the time taken."""
+        start = _timer()
+        screen = cls(name=name, **kwargs)
+        self.builds.append((name, _timer() - start))
+        return screen
+
+    def time(self, description, function, *args, **kwargs):
+        """Call the function and return its result, recording the time taken."""
+        start = _timer()
+        result = function(*args, **kwargs)
+        self.loads.append((description, _timer() - start))
+        return result
+
+    def mark_first_frame(self, *args):
+        """Record the time to the first frame (only the first call counts)."""
+        if self.first_frame is None:
+            self.first_frame = _timer() - self.started
+
+    def report(self):
+        """Return the profile as a multi-line string (times in ms)."""
+        def section(title, entries):
+            lines = ["%s:" % title]
+            for name, seconds in entries:
+                lines.append("  %-40s %8.1f" % (name, seconds * 1000))
+            if not entries:
+                lines.append("  (none)")
+            return lines
+
+        lines = ["Startup profile (ms)"]
+        if self.first_frame is not None:
+            lines.append("  %-40s %8.1f" % ("first frame",
+                                            self.first_frame * 1000))
+        lines += section("Data", self.loads)
+        lines += section("Imports", self.imports)
+        lines += section("Screens", self.builds)
+        return "\n".join(lines)
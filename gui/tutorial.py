@@ -187,6 +187,7 @@ class GameTutorialScreen(Screen):
         self.tooltip = ToolTipDisplay(size_hint=(1, .5))
         self.hand_display = HandDisplay(
             hand=self.manager.main.hand_display.hand,
+            board=self.manager.game.board,
             size_hint=(1, .3))
         self._layout()
 
@@ -310,13 +311,12 @@ class AnalyzeScore(object):
 
     def result(self):
         """Return the current gap in winning suits (player's - dealer's)."""
-        return (len(self.scoreboard.scoreboard.wins(PLAYER)) -
-                len(self.scoreboard.scoreboard.wins(DEALER)))
+        return (self.scoreboard.scoreboard.win_count(PLAYER) -
+                self.scoreboard.scoreboard.win_count(DEALER))
 
     def _lead(self, suit_index):
         """Return the current score gap for the suit (player's - dealer's)."""
-        return (self.scoreboard.scoreboard.scores[PLAYER][suit_index] -
-                self.scoreboard.scoreboard.scores[DEALER][suit_index])
+        return self.scoreboard.scoreboard.margin(PLAYER, suit_index)
     
     def closest_win(self):
         """Return the (suit, lead) of the narrowest current win."""
@@ -391,8 +391,8 @@ class TutorialGameOver(WinnerScreen, ScreenWithDealer):
         """Generate text based on the final score."""
 
         # Win/lose/draw
-        pwins = len(self.score.wins(PLAYER))
-        dwins = len(self.score.wins(DEALER))
+        pwins = self.score.win_count(PLAYER)
+        dwins = self.score.win_count(DEALER)
         if pwins > dwins:
             self.text.append("Aww, you beat me!")
         elif pwins < dwins:
@@ -12,20 +12,24 @@ from kivy.graphics.texture import Texture
 from kivy.properties import ObjectProperty, ListProperty
 from kivy.uix.button import Button
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.screenmanager import ScreenManager, FadeTransition, Screen
 from kivy.uix.settings import SettingBoolean, SettingsWithNoMenu, SettingTitle
 from kivy.uix.popup import Popup
 from kivy.uix.label import Label
 from kivy.uix.widget import Widget
-from kivy.uix.carousel import Carousel
 from kivy.loader import Loader
+from kivy.logger import Logger
 
 from rendezvous import GameSettings, Currency, PowerupType, SpecialSuit
+from rendezvous import InvalidRecordError
 from rendezvous.deck import DeckDefinition, Card, DeckCatalog, DeckCatalogEntry
 from rendezvous.gameplay import RendezVousGame
+from rendezvous.planner import DealerPlanner
+from rendezvous.record import GameRecorder
+from rendezvous.savegame import save_game, SavedGame
 from rendezvous.statistics import Statistics
 from rendezvous.achievements import AchievementList
+from rendezvous.economy import reward_game, reward_round
 from rendezvous.powerups import Powerups
 
 from gui import DEALER, PLAYER
@@ -34,17 +38,10 @@ from gui.components import ConfirmPopup
 from gui.screens.home import HomeScreen
 from gui.screens.game import GameScreen, RoundAchievementScreen
 from gui.screens.winner import WinnerScreen
-from gui.settings import SettingSlider, SettingAIDifficulty, SettingButton
-from gui.settings import BackgroundPicker
-from gui.screens.settings import SettingsScreen
-from gui.screens.deck import DeckCatalogScreen
-from gui.screens.cards import DeckEditScreen
-from gui.screens.statistics import StatisticsScreen
-from gui.screens.achievements import AchievementsScreen
-from gui.screens.powerups import PowerupScreen, CardSelect
-from gui.screens.backgrounds import BackgroundCategoryDisplay
-from gui.screens.kisses import KissesScreen
-from gui.tutorial import GameTutorialScreen, FirstTutorialScreen, TutorialGameOver
+from gui.startup import StartupProfile
+from gui.cache import DeckCache
+from gui.prefetch import DeckPrefetcher
+# All other screens are imported on demand (see RendezVousWidget.SCREENS)
 
 
 __version__ = '1.0.0'
@@ -69,17 +66,33 @@ class RendezVousWidget(ScreenManager):
       achieved    -- Achievements earned during the game
       dealer_play -- cards picked out for the dealer
       main        -- primary screen for gameplay
+      save_file   -- where the game in progress is saved (see savegame.py)
 
     """
 
     powerup_next_click = ObjectProperty(allownone=True)
     powerups_in_use = ListProperty()
 
+    #: Screens built on their first visit -- name : (module, class name)
+    SCREENS = {'achieve' : ('gui.screens.achievements', 'AchievementsScreen'),
+               'settings' : ('gui.screens.settings', 'SettingsScreen'),
+               'decks' : ('gui.screens.deck', 'DeckCatalogScreen'),
+               'powerups' : ('gui.screens.powerups', 'PowerupScreen'),
+               'backgrounds' : ('gui.screens.backgrounds',
+                                'BackgroundCategoryDisplay'),
+               'kisses' : ('gui.screens.kisses', 'KissesScreen'),
+               'stats' : ('gui.screens.statistics', 'StatisticsScreen'),
+               'cards' : ('gui.screens.cards', 'DeckEditScreen')}
+
+    #: Screens that are built fresh on every visit
+    FRESH_SCREENS = ('stats', 'cards', 'backgrounds')
+
     def on_powerup_next_click(self, instance, value):
         self.current_screen.gameboard.show_next_click_powerup(value)
 
     def on_powerups_in_use(self, instance, value):
-        self.current_screen.gameboard.show_active_powerups(value)
+        screen = self.current_screen if self.is_game_screen() else self.main
+        screen.gameboard.show_active_powerups(value)
 
     def __init__(self, **kwargs):
         """Arrange the widgets."""
@@ -91,42 +104,44 @@ class RendezVousWidget(ScreenManager):
 
         # Prepare internal storage
         self.game = RendezVousGame(deck=self.app.loaded_deck,
-                                   achievements=self.app.achievements)
+                                   achievements=self.app.achievements,
+                                   rng=random.Random())
+        # Recorded unseeded: the player's choices decide the game too
+        self.game.recorder = GameRecorder(os.path.join(self.app.user_dir,
+                                                       "last_game.rvr"))
         self.game.new_game()
+        self.save_file = os.path.join(self.app.user_dir, "saved_game.rvs")
         self.achieved = []              #: Achievements earned this game
         self.dealer_play = None         #: cards the dealer will play
+        self.planner = DealerPlanner()  #: chooses dealer_play in advance
         self._in_progress = False       #: currently scoring a round?
         self._end_of_round = False      #: currently paused after scoring?
         self.powerup_next_click = None  #: applies on the next card select
         self.powerups_in_use = []       #: applied this round
+        self._turn_snapshot = None      #: to replay the turn
+        self._scoring_snapshot = None   #: to replay the scoring
 
-        # Prepare the screens
-        self.home = HomeScreen(name='home')
+        # Prepare the screens needed for the first frame (others on demand)
+        self.profile = self.app.profile
+        self.home = self.profile.build('home', HomeScreen)
         self.add_widget(self.home)
-        self.main = GameScreen(game=self.game, name='main')
+        self.main = self.profile.build('main', GameScreen, game=self.game)
         self.add_widget(self.main)
-        self.achieve = AchievementsScreen(achievements=self.app.achievements,
-                                          name='achieve')
-        self.add_widget(self.achieve)
-        self.add_widget(SettingsScreen(name='settings'))
-        self.decks = DeckCatalogScreen(catalog=self.app.deck_catalog,
-                                       name='decks')
-        self.add_widget(self.decks)
-        self.add_widget(PowerupScreen(name='powerups'))
-        self.backgrounds = BackgroundCategoryDisplay(name='backgrounds',
-            player_file=os.path.join(self.app.user_dir, "backgrounds.txt"))
-        self.add_widget(self.backgrounds)
-        self.add_widget(KissesScreen(name='kisses'))
-        # 'stats' and 'cards' will be generated new on each view
 
         # Prepare the tutorial (if needed)
         if self.app.achievements.achieved == []:
             self._start_tutorial()
+        else:
+            self._resume_game()
+        self._plan_dealer_play()
 
     def _start_tutorial(self):
+        self._clear_saved_game()
         for hand in self.game.players:
             hand.deck.suits_only()
             hand.flush()
+        FirstTutorialScreen = self.profile.load_class('gui.tutorial',
+                                                      'FirstTutorialScreen')
         self.switch_to(FirstTutorialScreen(game=self.game))
 
     def plant_special(self):
@@ -142,12 +157,45 @@ class RendezVousWidget(ScreenManager):
         self.current_screen.hand_display.slots[8].highlight(BLANK)
         return special
 
+    def _screen_kwargs(self, name):
+        """Return the keyword arguments needed to build the named screen."""
+        if name == 'achieve':
+            return {'achievements' : self.app.achievements}
+        elif name == 'decks':
+            return {'catalog' : self.app.deck_catalog}
+        elif name == 'backgrounds':
+            return {'player_file' : os.path.join(self.app.user_dir,
+                                                 "backgrounds.txt")}
+        elif name == 'stats':
+            return {'statistics' : self.app.statistics}
+        elif name == 'cards':
+            return {'definition' : self.app.loaded_deck}
+        return {}
+
+    def build_screen(self, name):
+        """(Re)build the named screen, importing its module if needed."""
+        cls = self.profile.load_class(*self.SCREENS[name])
+        screen = self.profile.build(name, cls, **self._screen_kwargs(name))
+        if self.has_screen(name):
+            self.remove_widget(self.get_screen(name))
+        self.add_widget(screen)
+        return screen
+
+    def lazy_screen(self, name):
+        """Return the named screen, building it on first use."""
+        if self.has_screen(name):
+            return self.get_screen(name)
+        return self.build_screen(name)
+
+    @property
+    def backgrounds(self):
+        """The background catalog screen (built on demand)."""
+        return self.lazy_screen('backgrounds')
+
     def rebuild_decks(self):
         """Rebuild the deck catalog screen (e.g. after catalog update)."""
-        self.remove_widget(self.decks)
-        self.decks = DeckCatalogScreen(catalog=self.app.deck_catalog,
-                                       name='decks')
-        self.add_widget(self.decks)
+        if self.has_screen('decks'):
+            self.build_screen('decks')
 
     def switcher(self, screen):
         """Handle a request to switch screens."""
@@ -178,26 +226,11 @@ class RendezVousWidget(ScreenManager):
             return
         elif screen == 'powerups' and self.app.powerups_texture is None:
             return
-        # ... screens that are generated fresh each time
-        elif screen == 'stats':
-            try: self.remove_widget(self.stats)
-            except AttributeError: pass
-            self.stats = StatisticsScreen(statistics=self.app.statistics,
-                                          name='stats')
-            self.switch_to(self.stats)
-            return
-        elif screen == 'cards':
-            try: self.remove_widget(self.cards)
-            except AttributeError: pass
-            self.cards = DeckEditScreen(definition=self.app.loaded_deck,
-                                        name='cards')
-            self.switch_to(self.cards)
-            return
-        elif screen == 'backgrounds':
-            self.remove_widget(self.backgrounds)
-            self.backgrounds = BackgroundCategoryDisplay(name='backgrounds',
-                player_file=os.path.join(self.app.user_dir, "backgrounds.txt"))
-            self.add_widget(self.backgrounds)
+        # ... screens that are generated fresh each time, or on first use
+        if screen in self.FRESH_SCREENS:
+            self.build_screen(screen)
+        elif screen in self.SCREENS:
+            self.lazy_screen(screen)
 
         # Switch & auto-update
         self.current = screen
@@ -205,11 +238,10 @@ class RendezVousWidget(ScreenManager):
         except AttributeError: pass
 
     def update_achievements(self):
-        # Rebuild achievements screen from scratch
-        self.remove_widget(self.achieve)
-        self.achieve = AchievementsScreen(achievements=self.app.achievements,
-                                          name='achieve')
-        self.add_widget(self.achieve)
+        # Rebuild achievements screen from scratch (if ever viewed)
+        if not self.has_screen('achieve'):
+            return
+        self.build_screen('achieve')
         if self.current == 'achieve':
             self.current = 'home'
             self.current = 'achieve'
@@ -230,6 +262,7 @@ class RendezVousWidget(ScreenManager):
         for slot in self.current_screen.gameboard.slots[PLAYER]:
             self.card_touched(slot)  # return to hand
         self.game.players[PLAYER].cant_play(PLAYER, self.game.score)
+        self._plan_dealer_play()
         self.current_screen.gameboard.update()
         self.current_screen.hand_display.update()
         self.current_screen.scoreboard.update()
@@ -242,7 +275,7 @@ class RendezVousWidget(ScreenManager):
             self.powerup_next_click = powerup
             return
         elif powerup.type == PowerupType.REPLAY_TURN:
-            if self._end_of_round:
+            if self._end_of_round and self._turn_snapshot is not None:
                 self.app.powerups.use(powerup)
                 self.replay_turn()
             return
@@ -263,25 +296,24 @@ class RendezVousWidget(ScreenManager):
                 if self.game.board.is_full(PLAYER):
                     self._finish_play()
             else:
+                CardSelect = self.profile.load_class('gui.screens.powerups',
+                                                     'CardSelect')
+                RecyclePages = self.profile.load_class('gui.recycle',
+                                                       'RecyclePages')
                 popup = Popup(title='Select a card to play:')
-                carousel = Carousel(direction='right')
                 cards = self.app.loaded_deck.get_cards(self.app.powerups.cards())
-                for i in range(0, len(cards), 10):
-                    layout = GridLayout(rows=2)
-                    for card in cards[i:i+10]:
-                        def play_sleeve_card(display, powerup, card, popup):
-                            popup.dismiss()
-                            powerup = copy.deepcopy(powerup)
-                            powerup.value = card
-                            card.from_powerup = powerup.name
-                            self.use_powerup(powerup)
-                        layout.add_widget(CardSelect(card=card,
-                                            callback=play_sleeve_card,
-                                            args=(powerup, card, popup)))
-                    for i in range(len(cards), i+10):
-                        layout.add_widget(CardSelect(card=None))
-                    carousel.add_widget(layout)
-                popup.add_widget(carousel)
+                def play_sleeve_card(display, powerup, card, popup):
+                    popup.dismiss()
+                    powerup = copy.deepcopy(powerup)
+                    powerup.value = card
+                    card.from_powerup = powerup.name
+                    self.use_powerup(powerup)
+                data = [{'card' : card, 'callback' : play_sleeve_card,
+                         'args' : (powerup, card, popup)} for card in cards]
+                while len(data) % 10:  # keep the last page's cards in place
+                    data.append({'card' : None, 'callback' : None,
+                                 'args' : ()})
+                popup.add_widget(RecyclePages(CardSelect, data=data))
                 popup.open()
             return
 
@@ -393,11 +425,17 @@ class RendezVousWidget(ScreenManager):
         return (self.current == 'main' or self._in_tutorial())
 
     def _in_tutorial(self):
-        return isinstance(self.current_screen, GameTutorialScreen)
+        if not self.profile.is_loaded('gui.tutorial'):
+            return False  # can't be there yet!
+        return isinstance(self.current_screen,
+                          self.profile.load_class('gui.tutorial',
+                                                  'GameTutorialScreen'))
 
     def card_touched(self, card_display):
         """Handle a touch to a displayed card."""
-        if self._in_progress: return
+        if self._in_progress:
+            self.current_screen.gameboard.fast_forward()
+            return
         if self._in_tutorial():
             if self.current_screen.card_touched(): return
         elif not self.is_game_screen():
@@ -529,6 +567,8 @@ class RendezVousWidget(ScreenManager):
         if not self.game.board.is_full(PLAYER):
             card = self.current_screen.hand_display.get(card_or_display)
             self.current_screen.gameboard.place_card(card, index)
+        if GameSettings.AI_DIFFICULTY == 3:
+            self._plan_dealer_play()  # it will see this card
         if self.game.board.is_full(PLAYER):
             self._finish_play()
 
@@ -550,6 +590,8 @@ class RendezVousWidget(ScreenManager):
         if self.game.board._wait[PLAYER][index]: return
         card = self.current_screen.gameboard.remove_card(card_display)
         self._return_to_source(card)
+        if GameSettings.AI_DIFFICULTY == 3:
+            self._plan_dealer_play()
 
     def _return_to_source(self, card):
         """Return a card previously played to its proper source."""
@@ -561,13 +603,16 @@ class RendezVousWidget(ScreenManager):
         else:
             self.current_screen.hand_display.return_card(card)
 
+    def _plan_dealer_play(self):
+        """Start choosing the dealer's play in the background."""
+        self.planner.plan(DEALER, self.game.players[DEALER], self.game.board,
+                          self.game.score)
+
     def _get_dealer_play(self):
-        if GameSettings.AI_DIFFICULTY == 1:
-            self.dealer_play = self.game.players[DEALER].AI_easy(
-                                    DEALER, self.game.board, self.game.score)
-        else:
-            self.dealer_play = self.game.players[DEALER].AI_hard(
-                                    DEALER, self.game.board, self.game.score)
+        """Commit to the dealer's play (as planned, if still current)."""
+        self.dealer_play = self.planner.take(DEALER,
+                                             self.game.players[DEALER],
+                                             self.game.board, self.game.score)
 
     def _play_dealer(self, then_score=True):
         """Place the dealer's selected cards on the board."""
@@ -576,21 +621,29 @@ class RendezVousWidget(ScreenManager):
                 if powerup.type == PowerupType.SHOW_DEALER_PLAY:
                     break
             else:
+                if not self.planner.ready(DEALER, self.game.players[DEALER],
+                                          self.game.board, self.game.score):
+                    # Wait for the worker, rather than choose on the spot
+                    self._plan_dealer_play()
+                    Clock.schedule_once(
+                        lambda dt: self._play_dealer(then_score), 1 / 30.)
+                    return
                 self._get_dealer_play()
         if self._in_tutorial():
             if self.current_screen.all_cards_selected(): return
+        self._turn_snapshot = self.game.snapshot()
+        dealer_play, self.dealer_play = self.dealer_play, None
+        for card in dealer_play:
+            self.game.players[DEALER].remove(card)
+        # (may finish within this frame at low SPEED settings)
         callback = self._specials if then_score else self._mark_ready
-        self.current_screen.gameboard.play_dealer(self.dealer_play,
+        self.current_screen.gameboard.play_dealer(dealer_play,
                                                   callback=callback,
                                                   timer=GameSettings.SPEED)
-        for card in self.dealer_play:
-            self.game.players[DEALER].remove(card)
-        self.dealer_play = None
-        self._backup_score = copy.deepcopy(self.game.score.scores)
-        self._backup_waits = copy.deepcopy(self.game.board._wait)
         
     def _specials(self):
         """Apply all specials."""
+        self._scoring_snapshot = self.game.snapshot()
         self.prescore_powerups()
         self.game.board.clear_wait()
         self.current_screen.gameboard.apply_specials(self.game,
@@ -612,15 +665,16 @@ class RendezVousWidget(ScreenManager):
 
     def _reset_scoring(self):
         """Reset for another round of scoring."""
-        self.game.score.scores = copy.deepcopy(self._backup_score)
-        for card in self.game.board:
-            card.reset()
+        self.game.restore(self._scoring_snapshot)
         self.current_screen.gameboard.highlight(BLANK)
         self.current_screen.gameboard.update()
         self.current_screen.scoreboard.update()
 
     def replay_scoring(self):
         """Replay the scoring sequence at the user's request."""
+        if self._scoring_snapshot is None:  # resumed after scoring
+            self.current_screen.gameboard.prompt_for_next_round()
+            return
         self._in_progress = True
         self._reset_scoring()
         Clock.schedule_once(lambda dt: self._specials(), GameSettings.SPEED)
@@ -630,14 +684,10 @@ class RendezVousWidget(ScreenManager):
         self.powerups_in_use = []
         self._in_progress = False
         self._end_of_round = False
-        self.game.board._wait = copy.deepcopy(self._backup_waits)
-        self.game.score.scores = copy.deepcopy(self._backup_score)
+        self.game.restore(self._turn_snapshot)
         for i, hand in enumerate(self.game.players):
-            waits = self.game.board._wait[i].count(True)
-            hand.cards = hand.cards[:6-waits]
             for j, card in enumerate(self.game.board[i]):
-                card.reset()
-                if not self.game.board._wait[i][j]:
+                if card is not None and not self.game.board._wait[i][j]:
                     hand.cards.append(card)
                     self.game.board[i][j] = None
         self.current_screen.hand_display.update()
@@ -657,6 +707,7 @@ class RendezVousWidget(ScreenManager):
             self.current_screen.hand_display.update()
         self._in_progress = False
         self._end_of_round = True
+        self.save_progress()
         self.current_screen.gameboard.prompt_for_next_round()
 
     def next_round(self):
@@ -672,6 +723,8 @@ class RendezVousWidget(ScreenManager):
         if game_over:
             self.achieved += self.app.record_score(self.game.score)
             if self._in_tutorial():
+                TutorialGameOver = self.profile.load_class('gui.tutorial',
+                                                           'TutorialGameOver')
                 self._winner = TutorialGameOver(score=self.game.score,
                                                 achieved=self.achieved,
                                                 name='winner')
@@ -682,8 +735,10 @@ class RendezVousWidget(ScreenManager):
             self.switch_to(self._winner)
             self.achieved = []
             self.game.round = 0  # mark GAME OVER to trigger replay
+            self._clear_saved_game()
             return False
-        elif self.game.board.is_full(PLAYER):
+        self.save_progress()
+        if self.game.board.is_full(PLAYER):
             self.current_screen.gameboard.highlight(BLANK)
             self.current_screen.gameboard.update()
             self._get_dealer_play()
@@ -694,6 +749,7 @@ class RendezVousWidget(ScreenManager):
         self.current_screen.gameboard.update()
         self.current_screen.round_counter.round_number = self.game.round
         self.current_screen.hand_display.update()
+        self._plan_dealer_play()
 
         if self.achieved:
             self.switch_to(RoundAchievementScreen(self.achieved,
@@ -716,6 +772,55 @@ class RendezVousWidget(ScreenManager):
         self.remove_widget(self._winner)
         self._in_progress = False
         self._end_of_round = False
+        self.save_progress()
+        self._plan_dealer_play()
+
+    def save_progress(self):
+        """Save the game in progress, to resume if the app is closed.
+
+        While a round is being scored the save from the start of the turn
+        stands; once it is scored, the scored round is saved instead.
+
+        """
+        if self.game.round == 0 or self._in_tutorial():
+            return
+        if self._in_progress and not self._end_of_round:
+            return
+        save_game(self.save_file, self.game, self.powerups_in_use,
+                  scored=self._end_of_round)
+
+    def _clear_saved_game(self):
+        try:
+            os.remove(self.save_file)
+        except OSError:
+            pass
+
+    def _resume_game(self):
+        """Pick up the saved game in progress, if there is one."""
+        try:
+            saved = SavedGame(self.save_file)
+            powerups, sleeve = saved.restore(self.game)
+        except (EnvironmentError, InvalidRecordError):
+            return
+        except IndexError:  # the deck has changed since
+            self.game.new_game()
+            return
+        for card in sleeve:
+            self._return_to_source(card)
+        for powerup in powerups:
+            if powerup.type == PowerupType.SHOW_DEALER_PLAY:
+                self.app.powerups.purchase(powerup)  # dealer's play undone
+            else:
+                self.powerups_in_use.append(powerup)
+            if powerup.type == PowerupType.SHOW_DEALER_HAND:
+                self.main.gameboard.show_dealer_hand(self.game.players[DEALER])
+        self.main.gameboard.update()
+        self.main.hand_display.update()
+        self.main.scoreboard.update()
+        self.main.round_counter.round_number = self.game.round
+        if saved.scored:
+            self._end_of_round = True
+            self.main.gameboard.prompt_for_next_round()
 
     def replay_tutorial(self):
         popup = Popup(title="Replay Tutorial?", size_hint=(1, .5))
@@ -743,6 +848,7 @@ class RendezVousWidget(ScreenManager):
         self.game.new_game()
         self.achieved = []
         self.dealer_play = None
+        self.planner.cancel()
         self._in_progress = False
         self._end_of_round = False
         self._start_tutorial()
@@ -763,6 +869,7 @@ class RendezVousApp(App):
 
     def __init__(self, **kwargs):
         """Load the deck image and create the RendezVousWidget."""
+        self.profile = StartupProfile()
         App.__init__(self, **kwargs)
         self._load_sd_config()
         self.icon = os.path.join("data", "RVlogo.ico")
@@ -771,19 +878,27 @@ class RendezVousApp(App):
         user_dir = self.user_data_dir
         if not os.path.isdir(user_dir):
             user_dir = "player"
-        self.deck_catalog = DeckCatalog(os.path.join(user_dir, "decks.txt"))
+        self.deck_catalog = self.profile.time("DeckCatalog", DeckCatalog,
+                                              os.path.join(user_dir, "decks.txt"))
         if self.deck_catalog.purchased(GameSettings.CURRENT_DECK) is None:
             GameSettings.CURRENT_DECK = "Standard"
         self._preload_home_screen()
         self._load_currency(user_dir)
-        self.statistics = Statistics(os.path.join(user_dir, "stats.txt"))
-        self.achievements = AchievementList(os.path.join(user_dir, "unlocked.txt"))
-        self._loaded_decks = {}
-        self.load_deck(GameSettings.CURRENT_DECK)
+        self.statistics = self.profile.time("Statistics", Statistics,
+                                            os.path.join(user_dir, "stats.txt"))
+        self.achievements = self.profile.time("AchievementList",
+                                              AchievementList,
+                                              os.path.join(user_dir, "unlocked.txt"))
+        self._loaded_decks = DeckCache()
+        self.prefetcher = DeckPrefetcher(self._loaded_decks,
+                                         self._deck_prefetched)
+        self.profile.time("DeckDefinition", self.load_deck,
+                          GameSettings.CURRENT_DECK)
         self.load_background(GameSettings.BACKGROUND)
         loader = Loader.image(self.achievements.image_file)
         loader.bind(on_load=self._achievements_loaded)
-        self.powerups = Powerups(os.path.join(user_dir, "powerups.txt"))
+        self.powerups = self.profile.time("Powerups", Powerups,
+                                          os.path.join(user_dir, "powerups.txt"))
         loader = Loader.image(self.powerups.image_file)
         loader.bind(on_load=self._powerups_loaded)
         loader = Loader.image(os.path.join("data", "Backgrounds.png"))
@@ -878,7 +993,14 @@ class RendezVousApp(App):
             self.background_catalog = loader.image.texture
 
     def build(self):
-        return RendezVousWidget(app=self)
+        Clock.schedule_once(self._first_frame)
+        return self.profile.time("RendezVousWidget", RendezVousWidget,
+                                 app=self)
+
+    def _first_frame(self, *args):
+        """Log the startup profile once the first frame is up."""
+        self.profile.mark_first_frame()
+        Logger.info("RendezVous: %s" % self.profile.report())
 
 
     # Customization
@@ -901,21 +1023,21 @@ class RendezVousApp(App):
 
             # Cache current deck's details
             current = self.loaded_deck.base_filename
-            if current not in self._loaded_decks:
-                self._loaded_decks[current] = {}
-                self._loaded_decks[current]['deck'] = self.loaded_deck
-                self._loaded_decks[current]['texture'] = self.deck_texture
-                self._loaded_decks[current]['achtexture'] = self.deck_achievement_texture
+            self._loaded_decks.put(current, {
+                'deck' : self.loaded_deck,
+                'texture' : self.deck_texture,
+                'achtexture' : self.deck_achievement_texture})
 
         # Always update the Achievements from the files
         self.achievements.load_deck(deck_base)
 
-        # Read from cache, if available
+        # Read from cache (or prefetched), if available
         GameSettings.CURRENT_DECK = deck_base
-        if deck_base in self._loaded_decks:
-            self.loaded_deck  = self._loaded_decks[deck_base]['deck']
-            self.deck_texture = self._loaded_decks[deck_base]['texture']
-            self.deck_achievement_texture = self._loaded_decks[deck_base]['achtexture']
+        cached = self._loaded_decks.get(deck_base)
+        if cached is not None:
+            self.loaded_deck  = cached['deck']
+            self.deck_texture = cached['texture']
+            self.deck_achievement_texture = cached['achtexture']
             if self.root is not None:
                 self.root.update_achievements()
             self._update_deck()
@@ -924,6 +1046,28 @@ class RendezVousApp(App):
         # Load the deck from scratch
         self._load_deck(deck_base)
 
+    def prefetch_decks(self, deck_base):
+        """Prepare the given deck, and those near it, in the background."""
+        decks = self.deck_catalog.nearby(deck_base)
+        deck = self.deck_catalog[deck_base]
+        if (deck.base_filename == "Standard" or
+            self.deck_catalog.purchased(deck) is not None):
+            decks.insert(0, deck)
+        current = self.loaded_deck.base_filename
+        self.prefetcher.prefetch([d.base_filename for d in decks
+                                  if d.base_filename != current])
+
+    def _deck_prefetched(self, deck_base, entry):
+        """Pick up late textures if the prefetched deck is already in use."""
+        if entry['deck'] is not self.loaded_deck:
+            return
+        if self.deck_texture is None:
+            self.deck_texture = entry['texture']
+        if self.deck_achievement_texture is None and entry['achtexture']:
+            self.deck_achievement_texture = entry['achtexture']
+            if self.root is not None:
+                self.root.update_achievements()
+
     def _load_deck(self, deck_base):
         """Load the deck from its hard drive files."""
         self.loaded_deck = DeckDefinition(deck_base)
@@ -1058,25 +1202,16 @@ class RendezVousApp(App):
         
     def record_score(self, score):
         """Update meta-data at the end of each game."""
-        self.statistics.record_game(self.loaded_deck.base_filename, score, PLAYER)
-        self.winks.earn(len(score.wins(PLAYER)), "Win suits.")
-        if len(score.wins(PLAYER)) > len(score.wins(DEALER)):
-            self.winks.earn(1, "Win the game.")
-        achieved = self.achievements.check(score, PLAYER, self.statistics)
-        if achieved:
-            self.kisses.earn(len(achieved), "Game achievement(s).")
-            self.kisses.earn(len([a for a in achieved if a.reward is None]),
-                             "Extra achievement rewards.")
+        achieved = reward_game(self.loaded_deck.base_filename, score, PLAYER,
+                               self.statistics, self.achievements,
+                               self.winks, self.kisses)
         self._load_currency()
         return achieved
 
     def record_round(self, board):
         """Check for achievements at the end of each round."""
-        achieved = self.achievements.check_round(board, PLAYER)
+        achieved = reward_round(board, PLAYER, self.achievements, self.kisses)
         if achieved:
-            self.kisses.earn(len(achieved), "Round achievement(s).")
-            self.kisses.earn(len([a for a in achieved if a.reward is None]),
-                             "Extra achievement rewards.")
             self._load_currency()
         return achieved
 
@@ -1166,7 +1301,12 @@ class RendezVousApp(App):
     # Allow automatic pause and resume when switching apps
     
     def on_pause(self):
+        if self.root is not None:
+            self.root.save_progress()
+        self.achievements.save_progress()
         return True
+    def on_stop(self):
+        self.achievements.save_progress()
     def on_resume(self):
         pass
 
@@ -1197,6 +1337,8 @@ class RendezVousApp(App):
 
     def build_settings(self, settings):
         """Load the JSON file with settings details."""
+        from gui.settings import SettingSlider, SettingAIDifficulty
+        from gui.settings import SettingButton, BackgroundPicker
         settings.on_config_change = lambda i, c, k, v: self.on_config_change(i, c, k, v)
         settings_file = os.path.join("gui", "settings.json")
         fp = open(settings_file, "r")
@@ -1,11 +1,16 @@
 import warnings
-import re
 import os
 
 
 from rendezvous import settings
 GameSettings = settings.GameSettings()
 
+from rendezvous import metrics
+Metrics = metrics.Instrumentation()
+
+from rendezvous.storage import FileStorage, MemoryStorage
+Storage = FileStorage()
+
 
 class RendezVousError(Exception):
     """An error specific to RendezVous."""
@@ -22,6 +27,16 @@ class InvalidSpecialEffectError(RendezVousError):
     pass
 
 
+class InvalidRecordError(RendezVousError):
+    """A game record file is damaged or in an unknown format."""
+    pass
+
+
+class InvalidPlayError(RendezVousError):
+    """The requested play breaks the rules of the game."""
+    pass
+
+
 class DeckSyntaxWarning(SyntaxWarning):
     """There is a non-fatal error in the deck definition file."""
     pass
@@ -160,39 +175,84 @@ class PowerupType:
     PLAY_CARD        = 99  #: play a specific card from your "sleeve"
 
 
-def FileReader(filename):
+def _tokenize(lines, filename):
+
+    """Generator; return (TAG, value) for each [TAG]value line.
+
+    As the pattern '\[(.*)\](.*)' would, the tag runs from the first [ to
+    the last ] in the line, and anything before the [ is ignored.
+
+    """
+
+    for line in lines:
+        line = line.strip()
+        if not line: continue
+        start = line.find('[')
+        end = line.rfind(']')
+        if start < 0 or end < start:
+            warnings.warn("Unexpected text in %s: %s"
+                            % (filename, line),
+                          SyntaxWarning)
+            continue
+        yield (line[start + 1:end].strip().upper(), line[end + 1:].strip())
 
-    """Read [TAG]Value text files. Return a generator of (tag, value) pairs."""
-        
-    file = open(filename, 'r')
+
+def _read_tags(filename, storage):
+    """Generator; stream the (tag, value) pairs from the file."""
+    file = storage.open(filename, 'r')
     try:
-        for line in file:
-            line = line.strip()
-            if not line: continue
-            match = re.search('\[(.*)\](.*)', line)
-            if not match:
-                warnings.warn("Unexpected text in %s: %s" 
-                                % (filename, line),
-                              SyntaxWarning)
-                continue
-
-            yield(match.group(1).strip().upper(), match.group(2).strip())
+        for pair in _tokenize(file, filename):
+            yield pair
     finally:
         file.close()
 
 
+#: Parsed data files shared by the whole process:
+#:   { absolute filename : (storage stamp, [(tag, value), ...]) }
+_parsed = {}
+
+
+def FileReader(filename, storage=None, cached=False):
+
+    """Read [TAG]Value text files. Return an iterator of (tag, value) pairs.
+
+    The file is read from the given storage (default: rendezvous.Storage).
+    If cached, the pairs are kept for the rest of the process, and read
+    again only once the file's stamp (modification time and size) changes;
+    use this for data files, which are read more than once per session.
+
+    """
+
+    storage = storage or Storage
+    if cached:
+        stamp = storage.stamp(filename)
+        if stamp is not None:
+            key = os.path.abspath(filename)
+            entry = _parsed.get(key)
+            if entry is None or entry[0] != stamp:
+                entry = _parsed[key] = (stamp,
+                                        list(_read_tags(filename, storage)))
+            return iter(entry[1])
+    return _read_tags(filename, storage)
+
+
 class Currency(object):  # required for properties in v2.7
 
-    """Some form of currency with which to purchase items."""
+    """Some form of currency with which to purchase items.
+
+    The balance is saved in the directory of the given storage (default:
+    rendezvous.Storage).
+
+    """
 
-    def __init__(self, name, description, directory="player"):
+    def __init__(self, name, description, directory="player", storage=None):
         self.name = name
         self.plural = self._get_plural()
         self.description = description
+        self.storage = storage or Storage
         self._balance = 0
         self.filename = os.path.join(directory, name + ".txt")
-        if not os.path.isdir(directory):
-            os.mkdir(directory)
+        self.storage.makedirs(directory)
         self._read()
 
     def _get_plural(self):
@@ -230,7 +290,7 @@ class Currency(object):  # required for properties in v2.7
     def _read(self):
         """Read the current balance from a file."""
         try:
-            f = open(self.filename, 'r')
+            f = self.storage.open(self.filename, 'r')
         except:
             self._balance = 0
             return
@@ -239,7 +299,8 @@ class Currency(object):  # required for properties in v2.7
 
     def _write(self):
         """Save the current balance to a file."""
-        f = open(self.filename, 'w')
+        Metrics.count('write.currency')
+        f = self.storage.open(self.filename, 'w')
         try:
             f.write(str(self._balance))
         finally:
@@ -5,7 +5,8 @@ import warnings
 
 from rendezvous import AchieveType, AchievementSyntaxWarning, FileReader
 from rendezvous import SpecialSuit, SpecialValue, Operator, Alignment
-from rendezvous import GameSettings
+from rendezvous import GameSettings, Metrics, Storage
+from rendezvous.matchups import matchups, opposing
 
 
 class AchievementCriterion(object):
@@ -19,12 +20,16 @@ class AchievementCriterion(object):
       suits      -- list of suit names, or deck, or from SpecialSuit
       operator   -- from Operator (< or >= or ==)
       value      -- value to compare the suit to, or from SpecialValue
+      goal       -- progress at which the criterion is met (read-only)
 
     Note that not all attributes apply to all Achievement types.
       
     Methods:
       check       -- determine whether its been reached this game
       check_round -- determine whether its been reached this round
+      progress    -- return how close this game came to the goal
+      progress_round -- return how close this round came to the goal
+      keep        -- return the progress to keep between games/rounds
 
     """
 
@@ -416,55 +421,37 @@ class AchievementCriterion(object):
         if self.type == None or AchieveType.per_round(self.type):
             return False
 
-        substats = stats.base
-        for suit in self.suits:
-            if suit in stats.decks:
-                substats = stats.decks[suit]
-            elif suit in stats.suits:
-                substats = stats.suits[suit]
-        if self.type == AchieveType.PLAY:
-            return substats.played >= self.count
-        elif self.type == AchieveType.WIN:
-            return substats.wins >= self.count
-        elif self.type == AchieveType.LOSE:
-            return substats.losses >= self.count
-        elif self.type == AchieveType.DRAW:
-            return substats.draws >= self.count
-        elif self.type == AchieveType.STREAK:
-            if self.value == AchieveType.WIN:
-                return substats.win_streak >= self.count
-            elif self.value == AchieveType.LOSE:
-                return substats.lose_streak >= self.count
-            elif self.value == AchieveType.DRAW:
-                return substats.draw_streak >= self.count
+        count = self._count_games(stats)
+        if count is not None:
+            return count >= self.count
             
         if self.suit == SpecialSuit.EACH:
             for i, pscore in enumerate(score[player_index]):
-                if not self._check(pscore, score[player_index-1][i],
+                if not self._check(pscore, score.rival(player_index, i),
                                    self._get_target(score, player_index)):
                     return False
             return True
         elif self.suit == SpecialSuit.ANY:
             for i, pscore in enumerate(score[player_index]):
-                if self._check(pscore, score[player_index-1][i],
+                if self._check(pscore, score.rival(player_index, i),
                                self._get_target(score, player_index)):
                     return True
             return False
         elif self.suit == SpecialSuit.ONE:
             found = False
             for i, pscore in enumerate(score[player_index]):
-                if self._check(pscore, score[player_index-1][i],
+                if self._check(pscore, score.rival(player_index, i),
                                self._get_target(score, player_index)):
                     if found: return False
                     found = True
             return found
         elif self.suit == SpecialSuit.TOTAL:
             if self.value in SpecialValue.all():
-                return self._check(score.wins(player_index),
-                                   score.wins(player_index-1),
-                                   self.value)
+                opponent = score.opponent(player_index)
+                return self._check(score.win_count(player_index),
+                                   score.win_count(opponent), self.value)
             return self._check(score.total(player_index), 
-                               score.total(player_index-1),
+                               score.rival(player_index),
                                self._get_target(score, player_index))
         else:  # single suit
             index = -1
@@ -473,13 +460,13 @@ class AchievementCriterion(object):
                 if suit in score.suits:
                     index = score.suits.index(suit)
                     if self._check(score[player_index][index], 
-                                       score[player_index-1][index],
+                                       score.rival(player_index, index),
                                        self._get_target(score, player_index)):
                         found = True
                 elif suit.upper().startswith("SUIT"):
                     index = int(suit[4:]) - 1
                     if self._check(score[player_index][index], 
-                                       score[player_index-1][index],
+                                       score.rival(player_index, index),
                                        self._get_target(score, player_index)):
                         found = True
             if not found:
@@ -489,15 +476,42 @@ class AchievementCriterion(object):
             for i, suit in enumerate(score.suits):
                 if suit in self.suits: continue
                 if self._check(score[player_index][i],
-                               score[player_index-1][i],
+                               score.rival(player_index, i),
                                self._get_target(score, player_index)):
                     return False
             return True
 
-    def _check_match(self, board, player_index):
-        """Return whether this MATCH Achievement has been reached."""
+    def _count_games(self, stats):
+        """Return the games played, won, etc. toward a Statistics
+        Achievement (or None for any other type)."""
+        if not AchieveType.stats(self.type):
+            return None
+        substats = stats.base
+        for suit in self.suits:
+            if suit in stats.decks:
+                substats = stats.decks[suit]
+            elif suit in stats.suits:
+                substats = stats.suits[suit]
+        if self.type == AchieveType.PLAY:
+            return substats.played
+        elif self.type == AchieveType.WIN:
+            return substats.wins
+        elif self.type == AchieveType.LOSE:
+            return substats.losses
+        elif self.type == AchieveType.DRAW:
+            return substats.draws
+        elif self.type == AchieveType.STREAK:
+            if self.value == AchieveType.WIN:
+                return substats.win_streak
+            elif self.value == AchieveType.LOSE:
+                return substats.lose_streak
+            elif self.value == AchieveType.DRAW:
+                return substats.draw_streak
+
+    def _count_matches(self, board, player_index):
+        """Return (matches counted, matches against) for MATCH."""
         friendly = board[player_index]
-        enemy = board[player_index-1]
+        enemy = opposing(board, player_index)
         if self.alignment == Alignment.ENEMY:
             friendly, enemy = enemy, friendly
 
@@ -522,7 +536,11 @@ class AchievementCriterion(object):
                     opp += 1
             elif self.value == SpecialValue.DRAW:
                 count += 1
+        return count, opp
 
+    def _check_match(self, board, player_index):
+        """Return whether this MATCH Achievement has been reached."""
+        count, opp = self._count_matches(board, player_index)
         if self.count == SpecialSuit.TOTAL:
             return count > opp
         else:
@@ -535,16 +553,8 @@ class AchievementCriterion(object):
             return False
         elif self.type == AchieveType.MATCH:
             return self._check_match(board, player_index)
-        side = player_index
-        if self.alignment == Alignment.ENEMY:
-            side -= 1
         count = 0
-        for i, card in enumerate(board[side]):
-            if self.suit != SpecialSuit.ANY:
-                if not (card.suit.upper() == self.suit.upper() or
-                        card.name.upper() == self.suit.upper()):
-                    continue
-                    
+        for card, held in self._matching(board, player_index):
             if self.type == AchieveType.MASTER:
                 if card.name.upper() != self.suit.upper():
                     continue
@@ -552,24 +562,150 @@ class AchievementCriterion(object):
                     if card.applied_to[player_index] < 3:
                         return False
                 if card.application.has_alignment(Alignment.ENEMY):
-                    if card.applied_to[player_index-1] < 4:
+                    if sum(card.applied_to) - card.applied_to[player_index] < 4:
                         return False
                 return True
             elif self.type == AchieveType.DUNCE:
                 if card.name.upper() != self.suit.upper():
                     continue
-                return 0 == (card.applied_to[player_index] + 
-                             card.applied_to[player_index-1])
+                return 0 == sum(card.applied_to)
                 
-            if self.value > 0:
-                if not self._check(card.value, card.value, self.value):
-                    continue
-            if self.type == AchieveType.USE or board._wait[side][i]:
+            if self._card_counts(card, held):
                 count += 1
                 if count >= self.count:
                     return True
         return False
 
+    def _matching(self, board, player_index):
+        """Return (card, held) for each card on the side of the board
+        counted that is of the suit (or name) required."""
+        slots = len(board[player_index])
+        if self.alignment == Alignment.ENEMY:
+            players = matchups(len(board), slots)[player_index]
+        else:
+            players = (player_index,) * slots
+        wait = board._wait
+        if self.suit == SpecialSuit.ANY:
+            return [(board[p][i], wait[p][i]) for i, p in enumerate(players)]
+        suit = self.suit.upper()
+        matched = []
+        for i, p in enumerate(players):
+            card = board[p][i]
+            if card.suit.upper() == suit or card.name.upper() == suit:
+                matched.append((card, wait[p][i]))
+        return matched
+
+    def _card_counts(self, card, held):
+        """Return whether the card counts toward USE or WAIT."""
+        if self.value > 0:
+            if not self._check(card.value, card.value, self.value):
+                return False
+        return self.type == AchieveType.USE or held
+
+    @property
+    def goal(self):
+        """Return the progress value at which this criterion is met."""
+        if (AchieveType.stats(self.type) or
+            self.type in (AchieveType.USE, AchieveType.WAIT)):
+            return self.count
+        elif self.type == AchieveType.MATCH:
+            return 0 if self.count == SpecialSuit.TOTAL else self.count
+        elif self.type in (AchieveType.MASTER, AchieveType.DUNCE):
+            return 1
+        return 0  # SCORE: margin by which the requirement is met
+
+    def progress(self, score, player_index, stats):
+        """Return how close this game came to the goal (or None).
+
+        Statistics Achievements count the games played, won, etc. (or
+        the current streak); Score Achievements give the margin by which
+        the score met the requirement, negative if it fell short.
+
+        """
+        if self.type == None or AchieveType.per_round(self.type):
+            return None
+        count = self._count_games(stats)
+        if count is not None or self.type != AchieveType.SCORE:
+            return count
+
+        target = self._get_target(score, player_index)
+        def margin(i):
+            return self._margin(score[player_index][i],
+                                score.rival(player_index, i), target)
+        if self.suit == SpecialSuit.EACH:
+            return min(margin(i) for i in range(len(score[player_index])))
+        elif self.suit == SpecialSuit.ANY:
+            return max(margin(i) for i in range(len(score[player_index])))
+        elif self.suit == SpecialSuit.ONE:
+            margins = sorted((margin(i) for i in
+                              range(len(score[player_index]))), reverse=True)
+            if len(margins) == 1:
+                return margins[0]
+            return min(margins[0], -margins[1] - 1)  # and no other suit
+        elif self.suit == SpecialSuit.TOTAL:
+            if self.value in SpecialValue.all():  # by the suits won
+                opponent = score.opponent(player_index)
+                return self._margin(score.win_count(player_index),
+                                    score.win_count(opponent), self.value)
+            return self._margin(score.total(player_index),
+                                score.rival(player_index), target)
+        else:  # single suit
+            margins = []
+            for suit in self.suits:
+                if suit in score.suits:
+                    margins.append(margin(score.suits.index(suit)))
+                elif suit.upper().startswith("SUIT"):
+                    margins.append(margin(int(suit[4:]) - 1))
+            if not margins:
+                return None
+            best = max(margins)
+            if self.count > 0:  # not ONLY?
+                return best
+            for i, suit in enumerate(score.suits):
+                if suit not in self.suits:
+                    best = min(best, -margin(i) - 1)
+            return best
+
+    def progress_round(self, board, player_index):
+        """Return how close this round came to the goal (or None).
+
+        USE and WAIT count the cards played or held; MATCH counts the
+        matches (or, for the whole round, the margin over the matches
+        against); MASTER and DUNCE are 1 if met, else 0.
+
+        """
+        if self.type == None or not AchieveType.per_round(self.type):
+            return None
+        elif self.type == AchieveType.MATCH:
+            count, opp = self._count_matches(board, player_index)
+            if self.count == SpecialSuit.TOTAL:
+                return count - opp - 1
+            return count
+        elif self.type in (AchieveType.MASTER, AchieveType.DUNCE):
+            return int(self.check_round(board, player_index))
+        count = 0
+        for card, held in self._matching(board, player_index):
+            if self._card_counts(card, held):
+                count += 1
+        return count
+
+    def met(self, value):
+        """Return whether the progress value reaches the goal."""
+        return value is not None and value >= self.goal
+
+    def keep(self, saved, value):
+        """Return the progress to keep, given the saved and new values.
+
+        Statistics already accumulate across games, so the latest count
+        (or current streak) is kept; otherwise the best seen is kept.
+
+        """
+        if value is None:
+            return saved
+        if saved is None or AchieveType.stats(self.type):
+            return value
+        return max(saved, value)
+
     def _get_target(self, score, player_index):
         try:
             return int(self.value)
@@ -599,6 +735,23 @@ class AchievementCriterion(object):
             return score == target
         return score >= target
 
+    def _margin(self, pscore, dscore, target):
+        """Return the margin by which these scores meet the requirements
+        (as for _check, which holds exactly when this is at least 0)."""
+        if self.value == SpecialValue.WIN:
+            return pscore - dscore - 1
+        elif self.value == SpecialValue.LOSE:
+            return dscore - pscore - 1
+        elif self.value == SpecialValue.DRAW:
+            return -abs(pscore - dscore)
+
+        score = pscore if self.alignment == Alignment.FRIENDLY else dscore
+        if self.operator == Operator.LESS_THAN:
+            return target - 1 - score
+        elif self.operator == Operator.EXACTLY:
+            return -abs(score - target)
+        return score - target
+
 
 class Achievement:
     """An accomplishment to shoot for while playing.
@@ -612,6 +765,9 @@ class Achievement:
     Methods:
       check       -- determine whether this Achievement has been reached
       check_round -- determine whether its been reached this round
+      progress    -- return each criterion's progress this game
+      progress_round -- return each criterion's progress this round
+      met         -- return whether every criterion's progress is met
     
     """
     
@@ -623,6 +779,7 @@ class Achievement:
         self._append_description = append_description
         self.reward = reward
         self.criteria = []
+        self._checked = set()  # True if checked each round, False per game
         if isinstance(code, list):
             for crit in code:
                 self._parse_code(crit)
@@ -652,7 +809,10 @@ class Achievement:
 
     def _parse_code(self, code):
         """Parse the given code into a single criterion."""
-        self.criteria.append(AchievementCriterion(code))
+        crit = AchievementCriterion(code)
+        self.criteria.append(crit)
+        if crit.type is not None:
+            self._checked.add(AchieveType.per_round(crit.type))
                 
         # Auto-update description
         self.description = self._override_description
@@ -685,6 +845,25 @@ class Achievement:
             if not crit.check_round(board, player_index):
                 return False
         return True
+
+    def progress(self, score, player_index, stats):
+        """Return the progress of each criterion this game."""
+        return [crit.progress(score, player_index, stats)
+                for crit in self.criteria]
+
+    def progress_round(self, board, player_index):
+        """Return the progress of each criterion this round."""
+        return [crit.progress_round(board, player_index)
+                for crit in self.criteria]
+
+    def met(self, values):
+        """Return whether every criterion's progress reaches its goal."""
+        if not self.criteria:
+            return False
+        for crit, value in zip(self.criteria, values):
+            if not crit.met(value):
+                return False
+        return True
     
 class AchievementList(object):
     """List of available and accomplished Achievements.
@@ -694,11 +873,15 @@ class AchievementList(object):
       achieved   -- list of those the player has earned
       image_file -- grid of Achievement icons
       deck_image_file -- deck-specific version of image_file
+      storage    -- where the files are read and saved (default:
+                    rendezvous.Storage)
       
     Methods:
       unlocked  -- return whether the given SpecialCard has been unlocked
       achieve   -- mark the Achievement earned and return it
       check     -- return list of Achievements newly reached (or [])
+      progress  -- return [(progress, goal)] for each criterion
+      save_progress -- save any progress not yet saved
       get_achievement_texture -- return (L, B, W, H) for the Achievement
       
     Available Achievements File Format:  Achievements.txt
@@ -786,9 +969,21 @@ class AchievementList(object):
     
       [ACH-NAME]Name of Achievement
       
+      
+    Achievement Progress File Format:  progress.txt
+    
+      Note: This file is saved alongside the unlock file at the end of a
+      game (or by save_progress) if the progress toward an unearned
+      Achievement has changed.
+      
+      [ACH-NAME]Name of Achievement
+      [ACH-PROGRESS]Progress of each criterion, comma-separated (blank
+                    for any not yet checked)
+      
     """
     
-    def __init__(self, player_file=None, deck="Standard"):
+    def __init__(self, player_file=None, deck="Standard", storage=None):
+        self.storage = storage or Storage
         self._base_available_file = os.path.join("data", "Achievements.txt")
         self.image_file = os.path.join("data", "Achievements.png")
         self._base_available = []
@@ -797,7 +992,10 @@ class AchievementList(object):
         if player_file is None:
             self._unlocked_file = os.path.join("player", "unlocked.txt")
         else: self._unlocked_file = player_file
+        self._progress_file = os.path.join(
+            os.path.dirname(self._unlocked_file), "progress.txt")
         self._read_unlocked()
+        self._read_progress()
 
     @property
     def available(self):
@@ -832,35 +1030,110 @@ class AchievementList(object):
         if achievement not in self.achieved:
             self.achieved.append(achievement.name)
             self.achieved.extend(self._check_secret_rendezvous())
-            try:
-                f = open(self._unlocked_file, 'a')
-                f.write('[ACH-NAME]%s\n' % achievement.name)
-            finally:
-                f.close()
+            self._write_unlocked(achievement.name)
         return achievement
+
+    def _write_unlocked(self, name):
+        """Add the named Achievement to the unlock file."""
+        Metrics.count('write.achievements')
+        try:
+            f = self.storage.open(self._unlocked_file, 'a')
+            f.write('[ACH-NAME]%s\n' % name)
+        finally:
+            f.close()
         
     def check(self, score, player_index, stats):
-        """Return list of Achievements newly reached in this game."""
-        reached = []
-        for achievement in self.available:
-            if achievement not in self.achieved:
-                if achievement.check(score, player_index, stats):
+        """Return list of Achievements newly reached in this game.
+
+        Any progress kept since the last save is saved once the game has
+        been checked.
+
+        """
+        with Metrics.timer('achievements.check'):
+            reached = []
+            for achievement in self._unearned(per_round=False):
+                Metrics.count('achievements.checked')
+                values = achievement.progress(score, player_index, stats)
+                self._keep_progress(achievement, values)
+                if achievement.met(values):
                     reached.append(self.achieve(achievement))
-        if reached:
-            reached.extend(self._check_special(player_index, score=score,
-                                               stats=stats))
-        return reached
+            self.save_progress()
+            if reached:
+                reached.extend(self._check_special(player_index, score=score,
+                                                   stats=stats))
+            return reached
         
     def check_round(self, board, player_index):
-        """Return list of Achievements newly reached in this round."""
-        reached = []
-        for achievement in self.available:
-            if achievement not in self.achieved:
-                if achievement.check_round(board, player_index):
+        """Return list of Achievements newly reached in this round.
+
+        Progress is only kept in memory until the end of the game (see
+        check and save_progress).
+
+        """
+        with Metrics.timer('achievements.check_round'):
+            reached = []
+            for achievement in self._unearned(per_round=True):
+                Metrics.count('achievements.checked')
+                values = achievement.progress_round(board, player_index)
+                self._keep_progress(achievement, values)
+                if achievement.met(values):
                     reached.append(self.achieve(achievement))
-        if reached:
-            reached.extend(self._check_special(player_index, board=board))
-        return reached
+            if reached:
+                reached.extend(self._check_special(player_index, board=board))
+            return reached
+
+    def _unearned(self, per_round):
+        """Return the Achievements not yet earned with any criterion
+        checked each round (or else at the end of each game)."""
+        earned = set(str(achievement) for achievement in self.achieved)
+        return [achievement for achievement in self.available
+                if per_round in achievement._checked and
+                achievement.name not in earned]
+
+    def progress(self, achievement):
+        """Return [(progress, goal)] for each criterion of the (named)
+        Achievement; progress is None until it has been checked.
+
+        Each criterion is met once its progress reaches its goal.  The
+        progress is kept by check and check_round, so showing it here
+        re-checks nothing.
+
+        """
+        achievement = self[achievement]  # find by name if needed
+        saved = self._progress.get(achievement.name,
+                                   [None] * len(achievement.criteria))
+        return [(value, crit.goal)
+                for value, crit in zip(saved, achievement.criteria)]
+
+    def _keep_progress(self, achievement, values):
+        """Update the Achievement's progress (in memory only)."""
+        saved = self._progress.get(achievement.name)
+        if saved is None or len(saved) != len(values):
+            saved = [None] * len(values)
+        kept = [crit.keep(old, new) for crit, old, new
+                in zip(achievement.criteria, saved, values)]
+        if kept != saved:
+            self._progress[achievement.name] = kept
+            self._progress_changed = True
+
+    def save_progress(self):
+        """Save the progress toward each Achievement, if it has changed."""
+        if self._progress_changed:
+            self._write_progress()
+            self._progress_changed = False
+
+    def _write_progress(self):
+        """Save the progress toward each Achievement."""
+        Metrics.count('write.progress')
+        self.storage.makedirs(os.path.dirname(self._progress_file))
+        f = self.storage.open(self._progress_file, 'w')
+        try:
+            for name in sorted(self._progress):
+                f.write('[ACH-NAME]%s\n[ACH-PROGRESS]%s\n'
+                        % (name, ', '.join('' if value is None else str(value)
+                                           for value in self._progress[name])))
+        finally:
+            f.close()
 
     def _check_special(self, player_index, board=None, score=None, stats=None):
         """Check for uncoded special achievements."""
@@ -887,10 +1160,11 @@ class AchievementList(object):
             return []
         if GameSettings.NUM_ROUNDS < 20:
             return []
-        for dealer_score in score.scores[player_index-1]:
+        dealer = score.opponent(player_index)
+        for dealer_score in score.scores[dealer]:
             if dealer_score > 0:
                 return []
-        dealer_score = score.total(player_index-1)
+        dealer_score = score.total(dealer)
         if dealer_score >= 0:
             return []
         if score.total(player_index) != int(2 * abs(dealer_score)):
@@ -924,7 +1198,7 @@ class AchievementList(object):
         name = description = ""
         codes = []
         append_description = False
-        for (tag, value) in FileReader(filename):
+        for (tag, value) in FileReader(filename, self.storage, cached=True):
             if tag == "ACH-NAME":
                 name = value
             elif tag == "ACH-DESC":
@@ -951,16 +1225,30 @@ class AchievementList(object):
     def _read_unlocked(self):
         """Populate self.achieved with the names of unlocked Achievements."""
         self.achieved = []
-        if not os.path.isfile(self._unlocked_file):
-            try:
-                os.mkdir(os.path.dirname(self._unlocked_file))
-            except OSError:
-                pass
-            f = open(self._unlocked_file, 'w')
+        if not self.storage.exists(self._unlocked_file):
+            self.storage.makedirs(os.path.dirname(self._unlocked_file))
+            f = self.storage.open(self._unlocked_file, 'w')
             f.close()
-        for (tag, value) in FileReader(self._unlocked_file):
+        for (tag, value) in FileReader(self._unlocked_file, self.storage):
             if tag == "ACH-NAME":
                 self.achieved.append(value)
             else:
                 warnings.warn("Unknown tag in unlock file: %s" % tag,
                               AchievementSyntaxWarning)
+
+    def _read_progress(self):
+        """Populate self._progress from the progress file, if any."""
+        self._progress = {}
+        self._progress_changed = False
+        if not self.storage.exists(self._progress_file):
+            return
+        name = None
+        for (tag, value) in FileReader(self._progress_file, self.storage):
+            if tag == "ACH-NAME":
+                name = value
+            elif tag == "ACH-PROGRESS" and name is not None:
+                self._progress[name] = [int(v) if v.strip() else None
+                                        for v in value.split(',')]
+            else:
+                warnings.warn("Unknown tag in progress file: %s" % tag,
+                              AchievementSyntaxWarning)
@@ -17,15 +17,78 @@ Known Issues:
 """
 
 import random
+from operator import attrgetter
 
 from rendezvous import SpecialSuit, SpecialValue, Alignment, EffectType, Operator
+from rendezvous import Metrics, FileReader
+from rendezvous.matchups import matchups, opposing
+
+
+# Each term of PossiblePlay._calculate, with its hand-tuned weight
+FEATURES = (
+    ('BLOCK', 10),          # plays blocking or barely beating a hold
+    ('VALUE', 1),           # total value of normal cards
+    ('SPECIAL', 10),        # specials with something to apply to
+    ('BUFF', 1),            # buffs to our cards in play
+    ('BUFF_HELD', 1),       # buffs to our held cards...
+    ('BUFF_HELD_BONUS', 5), # ...and how many of them
+    ('BUFF_ENEMY', -1),     # buffs to the enemy's cards
+    ('BUFF_UNKNOWN', -1),   # one debuff assumed for unknown enemy cards
+    ('WIN', SpecialValue.WIN),        # WINs (less LOSEs) to our cards...
+    ('WIN_HELD', SpecialValue.WIN),   # ...to our held cards
+    ('WIN_ENEMY', SpecialValue.LOSE), # ...to the enemy's cards
+    ('WIN_UNKNOWN', SpecialValue.LOSE), # ...and one assumed unknown
+    ('FLIP_LOST', -1),      # our values lost to SWITCH/REVERSE/KISS...
+    ('FLIP_LOW', 1),        # ...the reverse gained by our low cards
+    ('FLIP_HIGH', 1),       # enemy high values lost
+    ('FLIP_SPOIL', -1),     # the reverse gained by enemy low cards
+    ('FLIP_ENEMY', 5),      # SWITCH/REVERSE/KISS reaching unknown enemies
+    ('CLONE', 1),           # value gained by our cards from a CLONE
+    ('CLONE_OPEN', 1),      # ...versus 6 for each open enemy space
+    ('CLONE_ENEMY', 1),     # ...versus each enemy card held
+    ('FLUSH_SPECIAL', -50), # good specials lost with a FLUSH
+    ('FLUSH_CARDS', 6),     # normal cards replaced by a FLUSH...
+    ('FLUSH_VALUE', -1),    # ...and their total value
+)
+
+DEFAULT_WEIGHTS = tuple(weight for name, weight in FEATURES)
+
+# Sort key for cards (as Card.__lt__, without a method call per comparison)
+_value = attrgetter('value')
+
+
+def load_weights(filename="data/Weights.txt"):
+    """Return the weight of each term in FEATURES, as tuned in the file.
+
+    The file holds [FEATURE]weight lines (see rendezvous.training); any
+    term not listed, or the whole table if there is no file, keeps the
+    hand-tuned weight.
+
+    """
+    tuned = {}
+    try:
+        for tag, value in FileReader(filename):
+            tuned[tag] = float(value)
+    except IOError:
+        return DEFAULT_WEIGHTS
+    return tuple(tuned.get(name, weight) for name, weight in FEATURES)
 
 
 class PossiblePlay:
 
-    """One possible set of cards to play this turn."""
+    """One possible set of cards to play this turn.
 
-    def __init__(self, cards, board, score, hand, player_index):
+    The play's value is a weighted sum of the terms in FEATURES.  The
+    weights are those tuned in data/Weights.txt (see load_weights), unless
+    others are given.  An unscored play keeps its terms instead, for
+    best_plays to value with many others at once.
+
+    """
+
+    weights = load_weights()
+
+    def __init__(self, cards, board, score, hand, player_index, rng=None,
+                 weights=None, scored=True):
         """Decide on the best configuration of cards, and score it.
 
         Arguments:
@@ -34,17 +97,28 @@ class PossiblePlay:
           score -- 2D [player][suit] current scores in each suit
           hand  -- list of all cards available to be played
           player_index -- index of the current player
+          rng   -- source of randomness (default: the random module)
+          weights -- weight of each term in FEATURES (default: as loaded)
+          scored  -- value the play now (or leave value None, and keep
+                     its features() as terms)
 
         """
+        self.rng = random if rng is None else rng
+        if weights is not None:
+            self.weights = weights
         self.cards = cards
         self.board = board
         self.score = score
         self.hand = hand
         self.player = player_index
+        self._matchups = matchups(len(board), len(board[player_index]))
         self._apply_specials()
         self._arrange()
         self._remove_specials()
-        self.value = self._calculate()
+        if scored:
+            self.value = self._calculate()
+        else:
+            self.value, self.terms = None, self.features()
 
     def __lt__(self, other):
         """Sort by the value of this play."""
@@ -57,6 +131,11 @@ class PossiblePlay:
         """Human-readable notation of the play."""
         return "play %s for %s pts" % ([str(c) for c in self.cards], self.value)
 
+    @property
+    def enemy(self):
+        """The cards this player's cards face on the board, by slot."""
+        return opposing(self.board, self.player, self._matchups)
+
     def _board_empty(self, player_index):
         """Return True if the board passed is empty (all None) for this player."""
         for card in self.board[player_index]:
@@ -67,150 +146,182 @@ class PossiblePlay:
         """See if the player's board is empty (none held)."""
         return self._board_empty(self.player)
     def dealer_empty(self):
-        """See if the dealer's board is empty (none held)."""
-        return self._board_empty(self.player - 1)
+        """See if the opposing cards are empty (none held)."""
+        return all(card is None for card in self.enemy)
 
     def _apply_specials(self):
         """Apply buffs/debuffs before arranging cards."""
+        enemy = self.enemy
+        self._effects = [(card, card.snapshot()) for card in
+                         self.cards + enemy if card is not None]
         for card in self.cards:
             if card.suit != SpecialSuit.SPECIAL:
                 continue
+            match = card.application.matcher()
             if card.effect.effect == EffectType.BUFF:
                 for ocard in self.cards:
-                    if card.application.match(Alignment.FRIENDLY, ocard):
+                    if match(Alignment.FRIENDLY, ocard):
                         ocard.apply(card.effect)
-                for ecard in self.board[self.player - 1]:
+                for ecard in enemy:
                     if ecard is not None:
-                        if card.application.match(Alignment.ENEMY, ecard):
+                        if match(Alignment.ENEMY, ecard):
                             ecard.apply(card.effect)
             elif card.effect.effect == EffectType.SWITCH:
                 for ocard in self.cards:
                     if (ocard.suit != SpecialSuit.SPECIAL and
-                        (card.application.has_alignment(Alignment.ENEMY) or
-                         card.application.match(Alignment.FRIENDLY, ocard))):
+                        (Alignment.ENEMY in match.alignments or
+                         match(Alignment.FRIENDLY, ocard))):
                         ocard.value *= -1
-                for ecard in self.board[self.player - 1]:
+                for ecard in enemy:
                     if ecard is not None and ecard.suit != SpecialSuit.SPECIAL:
-                        if (card.application.has_alignment(Alignment.FRIENDLY) or
-                            card.application.match(Alignment.ENEMY, ecard)):
+                        if (Alignment.FRIENDLY in match.alignments or
+                            match(Alignment.ENEMY, ecard)):
                             ecard.value *= -1
             elif card.effect.effect == EffectType.REVERSE:
                 for ocard in self.cards:
-                    if card.application.match(Alignment.FRIENDLY, ocard):
+                    if match(Alignment.FRIENDLY, ocard):
                         ocard.value = 11 - ocard.value
-                for ecard in self.board[self.player - 1]:
+                for ecard in enemy:
                     if ecard is not None:
-                        if card.application.match(Alignment.ENEMY, ecard):
+                        if match(Alignment.ENEMY, ecard):
                             ecard.value = 11 - ecard.value
 
     def _remove_specials(self):
         """Remove the effects of specials temporarily applied."""
-        for card in self.cards + self.board[self.player - 1]:
-            try:
-                card.reset()
-            except AttributeError:
-                pass
+        for card, effects in self._effects:
+            card.restore(effects)
+        del self._effects  # (not kept while waiting to be ranked)
 
     def _arrange(self):
         """Determine the best order for the cards."""
         for card in self.cards:
             if (card.suit == SpecialSuit.SPECIAL and
                 card.effect.effect == EffectType.CLONE):
-                self.cards.sort(reverse=
-                        card.application.has_alignment(Alignment.FRIENDLY))
+                self.cards.sort(key=_value, reverse=Alignment.FRIENDLY in
+                                card.application.matcher().alignments)
                 return
         if self.dealer_empty():
-            random.shuffle(self.cards)
+            self.rng.shuffle(self.cards)
             return
         offset = 0
-        self.cards.sort()
-        for i, dealer in enumerate(self.board[self.player - 1]):
+        self.cards.sort(key=_value)
+        enemy = self.enemy
+        for i, dealer in enumerate(enemy):
             if self.board[self.player][i] is not None:
                 offset += 1
                 continue
-            if self.board[self.player-1][i] is not None:
-                target = self.board[self.player-1][i].value
+            if enemy[i] is not None:
+                target = enemy[i].value
                 if target == SpecialValue.SPECIAL:
                     continue
                 for j, card in enumerate(self.cards):
                     if (card.value > target and  # beats target, not used
-                        (j > i or self.board[self.player-1][j] is None)):
+                        (j > i or enemy[j] is None)):
                         self.cards[i-offset], self.cards[j] = \
                                     self.cards[j], self.cards[i-offset]
-                        self.cards[i-offset+1:] = sorted(self.cards[i-offset+1:])
+                        rest = self.cards[i-offset+1:]
+                        self.cards[i-offset+1:] = sorted(rest, key=_value)
                         break
                 else:
                     self.cards[i-offset], self.cards[0] = self.cards[0], self.cards[i-offset]
         
     def _calculate(self):
         """Score this potential play."""
-        value = 0
+        return sum(w * f for w, f in zip(self.weights, self.features())
+                   if f)
+
+    def features(self):
+        """Return the total of each term in FEATURES for this play."""
+        (block, value, special, buff, buff_held, buff_held_bonus,
+         buff_enemy, buff_unknown, win, win_held, win_enemy, win_unknown,
+         flip_lost, flip_low, flip_high, flip_spoil, flip_enemy, clone,
+         clone_open, clone_enemy, flush_special, flush_cards,
+         flush_value) = [0] * len(FEATURES)
+        enemy = self.enemy
         for i, card in enumerate(self.cards):
 
             # Bonus for a block or close win over a hold
-            if self.board[self.player-1][i] is not None:
-                evalue = self.board[self.player-1][i].value
+            if enemy[i] is not None:
+                evalue = enemy[i].value
                 if card.value == SpecialValue.SPECIAL:
-                    value += 10
+                    block += 1
                 elif card.value > evalue and card.value - evalue < 2:
-                    value += 10
+                    block += 1
 
             # Standard cards worth their value
             if card.value != SpecialValue.SPECIAL:
                 value += card.value
                 continue
 
-            # 10-pt bonus for SpecialCards!
-            if (card.application.has_alignment(Alignment.ENEMY) or
-                card.application.filter(Alignment.FRIENDLY, self.cards) != []):
-                value += 10
+            # Bonus for SpecialCards!
+            match = card.application.matcher()
+            enemies = Alignment.ENEMY in match.alignments
+            if enemies or any(match(Alignment.FRIENDLY, ocard)
+                              for ocard in self.cards):
+                special += 1
 
             # Adjust buffed card values and known debuffs
-            if card.effect.effect == EffectType.BUFF:
+            # (counting WINs and LOSEs apart, being so much larger)
+            if (card.effect.effect == EffectType.BUFF and
+                card.effect.value in (SpecialValue.WIN, SpecialValue.LOSE)):
+                wins = 1 if card.effect.value == SpecialValue.WIN else -1
+                for ocard in self.cards:
+                    if match(Alignment.FRIENDLY, ocard):
+                        win += wins
+                for hcard in self.board[self.player]:
+                    if match(Alignment.FRIENDLY, hcard):
+                        win_held += wins
+                        buff_held_bonus += 1
+                for ecard in enemy:
+                    if match(Alignment.ENEMY, ecard):
+                        win_enemy += wins
+                if enemies:
+                    win_unknown += wins
+            elif card.effect.effect == EffectType.BUFF:
                 for ocard in self.cards:
-                    if card.application.match(Alignment.FRIENDLY, ocard):
-                        value += card.effect.value
+                    if match(Alignment.FRIENDLY, ocard):
+                        buff += card.effect.value
                 for hcard in self.board[self.player]:
-                    if card.application.match(Alignment.FRIENDLY, hcard):
-                        value += card.effect.value + 5
-                for ecard in self.board[self.player-1]:
-                    if card.application.match(Alignment.ENEMY, ecard):
-                        value -= card.effect.value
+                    if match(Alignment.FRIENDLY, hcard):
+                        buff_held += card.effect.value
+                        buff_held_bonus += 1
+                for ecard in enemy:
+                    if match(Alignment.ENEMY, ecard):
+                        buff_enemy += card.effect.value
                 # Assume one unknown debuff
-                if card.application.has_alignment(Alignment.ENEMY):
-                    value -= card.effect.value
+                if enemies:
+                    buff_unknown += card.effect.value
 
             # Score low cards (<5) for SWITCH/REVERSE/KISS
             elif (card.effect.effect == EffectType.SWITCH or
                   card.effect.effect == EffectType.REVERSE or
                   card.effect.effect == EffectType.KISS):
                 for ocard in self.cards:
-                    if card.application.match(Alignment.FRIENDLY, ocard):
-                        value -= ocard.value
+                    if match(Alignment.FRIENDLY, ocard):
+                        flip_lost += ocard.value
                         if ocard.value < 5:
-                            value += 11 - ocard.value
-                for ecard in self.board[self.player-1]:
-                    if card.application.match(Alignment.ENEMY, ecard):
+                            flip_low += 11 - ocard.value
+                for ecard in enemy:
+                    if match(Alignment.ENEMY, ecard):
                         if ecard.value > 6:
-                            value += ecard.value
+                            flip_high += ecard.value
                         elif ecard.value < 5:
-                            value -= 11 - ecard.value
-                if card.application.has_alignment(Alignment.ENEMY):
-                    value += 5
+                            flip_spoil += 11 - ecard.value
+                if enemies:
+                    flip_enemy += 1
 
             # Score all cards as the CLONE
             elif card.effect.effect == EffectType.CLONE:
                 rcard = card.requirement.filter(Alignment.FRIENDLY, self.cards)[0]
                 for ocard in self.cards:
-                    if card.application.match(Alignment.FRIENDLY, ocard, None):
-                        value -= ocard.value
-                        value += rcard.value
-                if card.application.has_alignment(Alignment.ENEMY):
-                    for ecard in self.board[self.player-1]:
+                    if match(Alignment.FRIENDLY, ocard, None):
+                        clone += rcard.value - ocard.value
+                if enemies:
+                    for ecard in enemy:
                         if ecard is None:
-                            value += 6 - rcard.value
+                            clone_open += 6 - rcard.value
                         else:
-                            value += ecard.value - rcard.value
+                            clone_enemy += ecard.value - rcard.value
 
             # Score low cards (and not good specials!) with FLUSH
             elif card.effect.effect == EffectType.FLUSH:
@@ -222,10 +333,15 @@ class PossiblePlay:
                                                        EffectType.REVERSE,
                                                        EffectType.KISS,
                                                        EffectType.FLUSH):
-                                value -= 50
+                                flush_special += 1
                         else:
-                            value += 6 - ocard.value
-        return value
+                            flush_cards += 1
+                            flush_value += ocard.value
+        return (block, value, special, buff, buff_held, buff_held_bonus,
+                buff_enemy, buff_unknown, win, win_held, win_enemy,
+                win_unknown, flip_lost, flip_low, flip_high, flip_spoil,
+                flip_enemy, clone, clone_open, clone_enemy, flush_special,
+                flush_cards, flush_value)
 
     def verify(self):
         """Double-check that the SpecialCard requirements are met."""
@@ -235,13 +351,155 @@ class PossiblePlay:
                                                self.board[self.player]):
                     return False
         return True
-    
+
+
+class HandAnalysis(object):
+
+    """What the dealer has worked out about a hand, kept between decisions.
+
+    For the Applications of each special in the hand (its own, and the
+    style of each of its requirements), the set of normal cards in the
+    hand matched as FRIENDLY is kept.  As cards come and go only they are
+    matched, and a special's sets are dropped with the special, so a
+    decision after a refill costs only the cards drawn.
+
+    A Hand keeps its analysis up to date as it changes (see Hand.refill,
+    flush, remove and pop); sync catches up with anything else, such as a
+    snapshot being restored or cards changing under an effect.
+
+    Methods:
+      add      -- note cards joining the hand
+      discard  -- note cards leaving the hand
+      sync     -- catch up with the hand's current cards
+      filter   -- Application.filter, for cards in the hand
+      required -- Requirement.filter, for cards in the hand
+      verify   -- Requirement.verify, for the hand plus other cards
+
+    """
+
+    def __init__(self, cards=()):
+        self._cards = {}    # id(card) : (card, suit, value) when matched
+        self._matches = {}  # id(application) : [application, match, ids,
+                            #                    specials using it]
+        self.add(cards)
+
+    @staticmethod
+    def _applications(special):
+        """Yield every Application a special matches cards against."""
+        yield special.application
+        requirements = [special.requirement]
+        while requirements:
+            requirement = requirements.pop()
+            if hasattr(requirement, 'items'):
+                requirements.extend(requirement.items)
+            elif requirement.style is not None:
+                yield requirement.style
+
+    def add(self, cards):
+        """Note each card joining the hand, matching the normal ones."""
+        for card in cards:
+            self._cards[id(card)] = (card, card.suit, card.value)
+            if card.suit == SpecialSuit.SPECIAL:
+                for application in self._applications(card):
+                    self._track(application)[3] += 1
+                continue
+            for application, match, matched, users in self._matches.values():
+                if match(Alignment.FRIENDLY, card):
+                    matched.add(id(card))
+
+    def discard(self, cards):
+        """Forget each card leaving the hand."""
+        for card in cards:
+            if self._cards.pop(id(card), None) is None:
+                continue
+            if card.suit == SpecialSuit.SPECIAL:
+                for application in self._applications(card):
+                    entry = self._matches.get(id(application))
+                    if entry is not None:
+                        entry[3] -= 1
+                        if entry[3] <= 0:
+                            del self._matches[id(application)]
+                continue
+            for application, match, matched, users in self._matches.values():
+                matched.discard(id(card))
+
+    def sync(self, cards):
+        """Catch up with any change to the cards the hand holds."""
+        present = set()
+        changed = []
+        for card in cards:
+            present.add(id(card))
+            known = self._cards.get(id(card))
+            if (known is None or known[1] != card.suit or
+                known[2] != card.value):
+                changed.append(card)
+        gone = [card for key, (card, suit, value) in self._cards.items()
+                if key not in present]
+        if changed or gone:
+            self.discard(changed + gone)
+            self.add(changed)
+
+    def _track(self, application):
+        """Return the Application's entry, matching the hand if it is new."""
+        try:
+            return self._matches[id(application)]
+        except KeyError:
+            pass
+        match = application.matcher()
+        matched = set(key for key, (card, suit, value) in self._cards.items()
+                      if match(Alignment.FRIENDLY, card))
+        entry = self._matches[id(application)] = [application, match,
+                                                  matched, 0]
+        return entry
+
+    def _matching(self, application):
+        """Return the ids of the cards in the hand the Application matches."""
+        return self._track(application)[2]
+
+    def filter(self, application, cards):
+        """Return application.filter(Alignment.FRIENDLY, cards)."""
+        matched = self._matching(application)
+        return [card for card in cards if id(card) in matched]
+
+    def required(self, requirement, cards):
+        """Return requirement.filter(Alignment.FRIENDLY, cards)."""
+        if hasattr(requirement, 'items'):
+            result = []
+            for item in requirement.items:
+                result.extend(self.required(item, cards))
+            return result
+        if requirement.style is None:
+            return cards
+        return self.filter(requirement.style, cards)
+
+    def verify(self, requirement, others=()):
+        """Return requirement.verify(the hand's cards + others)."""
+        combo = getattr(requirement, 'type', None)
+        if combo is not None:
+            test = all if combo == requirement.AND else any
+            return test(self.verify(item, others)
+                        for item in requirement.items)
+        elif hasattr(requirement, 'items'):
+            return self.verify(requirement.items[0], others)
+        if requirement.style is None:
+            return True
+        match = requirement.style.matcher()
+        counter = len(self._matching(requirement.style))
+        counter += sum(1 for card in others if match(Alignment.FRIENDLY, card))
+        if requirement.operator == Operator.AT_LEAST:
+            return counter >= requirement.count
+        elif requirement.operator == Operator.NO_MORE_THAN:
+            return counter <= requirement.count
+        else:
+            return counter == requirement.count
+
 
 class ArtificialIntelligence:
 
     """Used to determine the best cards to play from the hand."""
 
-    def __init__(self, player, hand, board, score):
+    def __init__(self, player, hand, board, score, rng=None, weights=None,
+                 analysis=None, scored=True):
         """Analyze hand and prepare intelligent options.
 
         Arguments:
@@ -249,7 +507,17 @@ class ArtificialIntelligence:
           hand   -- list of available cards (or Hand object)
           board  -- 2D [player][index] list of spaces (or Gameboard)
           score  -- 2D [player][suit] list of scores (or Scoreboard)
+          rng    -- source of randomness (default: the random module)
+          weights -- weights for valuing each play (see PossiblePlay)
+          analysis -- HandAnalysis to reuse (default: the Hand's own)
+          scored -- value and rank the plays (or leave that to best_plays)
         """
+        if analysis is None:
+            analysis = getattr(hand, 'analysis', None) or HandAnalysis()
+        self.analysis = analysis
+        self.rng = random if rng is None else rng
+        self.weights = weights
+        self.scored = scored
         self.player = player
         self.hand = hand
         self.board = board
@@ -260,21 +528,24 @@ class ArtificialIntelligence:
         """Consider all of the variables and explore possible plays.
 
         Outputs:
-          self.possible_plays -- all (or a selection of the best) plays
+          self.possible_plays -- all (or a selection of the best) plays,
+                                 best first (unless not scored)
 
         """
-        self.possible_plays = []
-        self._consider_holds()
-        if self._cards_needed == 0:
-            self.possible_plays.append(PossiblePlay([], self.board,
-                                                        self.score, self.hand,
-                                                        self.player))
-            return
-        self._consider_specials()
-        self._consider_values()
-        self._meet_targets()
-        self.possible_plays.sort(reverse=True)
-        self._verify()
+        with Metrics.timer('ai.analyze'):
+            self.analysis.sync(self.hand)
+            self.possible_plays = []
+            self._consider_holds()
+            if self._cards_needed == 0:
+                self._add_play([])
+                return
+            self._consider_specials()
+            self._consider_values()
+            self._meet_targets()
+            Metrics.count('ai.candidates', len(self.possible_plays))
+            if self.scored:
+                self.possible_plays.sort(reverse=True)
+                self._verify()
 
     def get_best_play(self):
         """Return the best play available.
@@ -283,6 +554,13 @@ class ArtificialIntelligence:
         """
         return self.possible_plays[0].cards
 
+    def _add_play(self, cards):
+        """Consider playing these cards."""
+        self.possible_plays.append(PossiblePlay(cards, self.board, self.score,
+                                                self.hand, self.player,
+                                                self.rng, self.weights,
+                                                self.scored))
+
     def _consider_holds(self):
         
         """Consider the effect of any holds present on the board.
@@ -296,7 +574,7 @@ class ArtificialIntelligence:
         self._cards_needed = self.board[self.player].count(None)
         
         self._targets = []
-        for ecard in self.board[self.player - 1]:
+        for ecard in opposing(self.board, self.player):
             if ecard is not None and ecard.value != SpecialValue.SPECIAL:
                 self._targets.append(ecard.value)
                 
@@ -304,15 +582,16 @@ class ArtificialIntelligence:
         """Consider the available SpecialCards and their requirements."""
         for g in given:
             self.hand.remove(g)
-        self.hand.sort(reverse=True)
+        self.analysis.sync(self.hand)
+        self.hand.sort(key=_value, reverse=True)
         for card in self.hand:
             if card.suit != SpecialSuit.SPECIAL:
                 continue
 
             # Do we even have the requirements?
             if not (card.requirement.has_operator(Operator.NO_MORE_THAN) or
-                    card.requirement.verify(list(self.hand) +
-                                            self.board[self.player])):
+                    self.analysis.verify(card.requirement,
+                                         self.board[self.player])):
                 continue
 
             # Grab cards logically
@@ -323,18 +602,18 @@ class ArtificialIntelligence:
                         
             # Save play only if we found enough cards
             if len(cards) == self._cards_needed:
-                self.possible_plays.append(PossiblePlay(cards, self.board,
-                                                        self.score, self.hand,
-                                                        self.player))
+                self._add_play(cards)
         self.hand.extend(given)
+        self.analysis.sync(self.hand)
 
     def _reverse_values(self, special):
         """Should we favor low cards with this special?"""
+        aligned = special.application.matcher().alignments
         return (special.effect.effect in (EffectType.SWITCH,
                                           EffectType.REVERSE,
                                           EffectType.KISS) or
                 (special.effect.effect == EffectType.CLONE and
-                 special.application.has_alignment(Alignment.FRIENDLY)))
+                 Alignment.FRIENDLY in aligned))
         
     def _grab_requirements(self, special, cards):
         """Grab the best cards meeting the requirements.
@@ -345,7 +624,7 @@ class ArtificialIntelligence:
         # Find cards that will meet the requirements
         required = applied = []
         required = list(filter(lambda x: x.suit != SpecialSuit.SPECIAL,
-                    special.requirement.filter(Alignment.FRIENDLY, self.hand)))
+                    self.analysis.required(special.requirement, self.hand)))
         applied = special.requirement.filter(Alignment.FRIENDLY,
                                              self.board[self.player] + cards)
         needed = max(0, special.requirement.totalcount() - len(applied))
@@ -357,7 +636,7 @@ class ArtificialIntelligence:
         # Pick out the best cards
         reverse_values = self._reverse_values(special)
         if not special.requirement.has_operator(Operator.NO_MORE_THAN):
-            required.sort(reverse=not reverse_values)
+            required.sort(key=_value, reverse=not reverse_values)
             # FRIENDLY clone needs one high card, then all low
             # ENEMY clone needs one low card, then all high
             if special.effect.effect == EffectType.CLONE:
@@ -370,26 +649,28 @@ class ArtificialIntelligence:
     def _grab_applied(self, special, cards):
         """Grab best cards the special will apply to."""
         reverse_values = self._reverse_values(special)
-        self.hand.sort(reverse=not reverse_values)
+        self.hand.sort(key=_value, reverse=not reverse_values)
         applies = list(filter(lambda x: x not in cards,
-                              special.application.filter(Alignment.FRIENDLY,
-                                                         self.hand)))
+                              self.analysis.filter(special.application,
+                                                   self.hand)))
         if not special.requirement.has_operator(Operator.AT_LEAST):
-            required = special.requirement.filter(Alignment.FRIENDLY, self.hand)
+            required = self.analysis.required(special.requirement,
+                                              self.hand)
             applies = list(filter(lambda x: x not in required, applies))
         cards.extend(applies[:self._cards_needed - len(cards)])
         return cards
         
     def _grab_filler(self, special, cards):
         """Grab additional filler cards to play with the special."""
-        self.hand.sort(reverse=True)
+        self.hand.sort(key=_value, reverse=True)
         
         # Grab best filler cards (no specials)
         extra = list(filter(lambda x: x not in cards and
                                       x.suit != SpecialSuit.SPECIAL,
                             self.hand))
         if not special.requirement.has_operator(Operator.AT_LEAST):
-            required = special.requirement.filter(Alignment.FRIENDLY, self.hand)
+            required = self.analysis.required(special.requirement,
+                                              self.hand)
             extra = list(filter(lambda x: x not in required, extra))
         cards.extend(extra[:self._cards_needed - len(cards)])
             
@@ -419,12 +700,10 @@ class ArtificialIntelligence:
         possible = list(filter(lambda x: x not in given and
                                          x.suit != SpecialSuit.SPECIAL,
                                self.hand))
-        possible.sort(reverse=True)
+        possible.sort(key=_value, reverse=True)
         cards = given + possible[:self._cards_needed-len(given)]
         if len(cards) == self._cards_needed:
-            self.possible_plays.append(PossiblePlay(cards, self.board,
-                                                    self.score, self.hand,
-                                                    self.player))
+            self._add_play(cards)
 
     def _meet_targets(self):
         """Consider additional possibilities based on hold targets."""
@@ -432,7 +711,7 @@ class ArtificialIntelligence:
             return
         possible = list(filter(lambda x: x.suit != SpecialSuit.SPECIAL,
                                self.hand))
-        possible.sort()
+        possible.sort(key=_value)
         given = []
         for target in self._targets:
             for card in possible:
@@ -447,8 +726,57 @@ class ArtificialIntelligence:
     def _verify(self):
         """Double-check requirements on specials for the best play only."""
         while self.possible_plays:
+            Metrics.count('ai.evaluated')
             if not self.possible_plays[0].verify():
                 self.possible_plays.pop(0)
             else:
                 break
-        
+
+
+def best_plays(decisions, weights=None):
+
+    """Return the best play for each of many decisions at once.
+
+    Each decision is a (player, hand, board, score, rng) tuple, as given
+    to ArtificialIntelligence, and each play is exactly what get_best_play
+    would return for it alone (or None where it finds no play; see
+    Hand.AI_hard).  Candidates are still found one decision at a time and
+    in order, so any sharing a hand or rng see the same sorting and draws
+    as if chosen one by one.  The features of every candidate are then
+    encoded as one array, valued against the weights (default: as loaded)
+    and ranked within each decision together, with NumPy.
+
+    """
+
+    import numpy
+
+    with Metrics.timer('ai.batch'):
+        candidates = [ArtificialIntelligence(player, hand, board, score, rng,
+                                             scored=False).possible_plays
+                      for player, hand, board, score, rng in decisions]
+        plays = [play for possible in candidates for play in possible]
+        terms = numpy.array([play.terms for play in plays],
+                            dtype=float).reshape(-1, len(FEATURES))
+        if weights is None:
+            weights = PossiblePlay.weights
+
+        # Summed term by term, as PossiblePlay._calculate, for equal ties
+        values = numpy.zeros(len(plays))
+        for column, weight in zip(terms.T, weights):
+            values += weight * column
+        decision = numpy.repeat(numpy.arange(len(candidates)),
+                                [len(possible) for possible in candidates])
+        ranked = numpy.lexsort((-values, decision))  # stable: ties in order
+
+        best = [None] * len(candidates)
+        done = set()
+        for i in ranked.tolist():
+            d = int(decision[i])
+            if d in done:
+                continue
+            Metrics.count('ai.evaluated')
+            plays[i].value = values[i]
+            if plays[i].verify():
+                best[d] = plays[i].cards
+                done.add(d)
+    return best
@@ -6,36 +6,79 @@ import warnings
 
 from rendezvous import DeckSyntaxWarning, MissingDeckError, FileReader
 from rendezvous import Operator, SpecialSuit, SpecialValue, Alignment
-from rendezvous import EffectType, GameSettings, TargetField
+from rendezvous import EffectType, GameSettings, TargetField, Metrics
+from rendezvous import Storage
 from rendezvous.specials import Requirement, Application, Effect
 
 
-class Card:
+class Card(object):
+
     """A single standard RendezVous card.
 
+    The card itself never changes: each Effect applied is pushed onto a
+    stack instead, as a small record of the suit and value beneath it and
+    a note for the description.  The suit and value on top of the stack
+    are kept as attributes (so reading them costs nothing), the
+    description is only put together when it is read, and undoing effects
+    just cuts the stack back to an earlier snapshot.
+
     Attributes:
       name        -- a user-friendly name for the card
       description -- a user-friendly description of the card's purpose
-      suit        -- the name of the card's suit
-      value       -- the numerical value of the card
+      suit        -- the name of the card's suit (with effects applied)
+      value       -- the numerical value of the card (with effects applied)
+      original    -- the card's own (suit, value)
 
     Methods:
       apply       -- apply an Effect to this card
+      reset       -- undo every Effect applied
+      snapshot    -- return the current state of the effect stack
+      restore     -- return to the state of an earlier snapshot
 
     """
 
     def __init__(self, suit, value):
         """Set name and description based on the suit and value combination."""
         self.name = "%s %s" % (suit, value)
-        self.description = "A normal %s card with value %s." % (suit, value)
+        self._text = "A normal %s card with value %s." % (suit, value)
+        self._stack = []  # (suit, value, note, note args) beneath each effect
         self.suit = suit
         self.value = value
         self.original = (suit, value)
 
+    @property
+    def description(self):
+        return self._text + "".join(note % args for s, v, note, args
+                                    in self._stack if note)
+
+    @description.setter
+    def description(self, text):
+        """Replace the whole description, including any effects noted."""
+        self._text = text
+        self._stack = [(suit, value, None, ()) for suit, value, note, args
+                       in self._stack]
+
     def reset(self):
         """Undo the effects of all SpecialCards."""
+        del self._stack[:]
         self.suit, self.value = self.original
-        self.description = "A normal %s card with value %s." % self.original
+        self._text = "A normal %s card with value %s." % self.original
+
+    def snapshot(self):
+        """Return the current effects, to return to later (see restore)."""
+        return (self.suit, self.value, self._text, tuple(self._stack))
+
+    def restore(self, snapshot):
+        """Return to exactly the effects of an earlier snapshot."""
+        self.suit, self.value, self._text, stack = snapshot
+        self._stack = list(stack)
+
+    def __copy__(self):
+        """Copy the card with its own effect stack."""
+        card = self.__class__.__new__(self.__class__)
+        card.__dict__.update(self.__dict__)
+        card._stack = list(self._stack)
+        return card
 
     def __str__(self):
         """Return the name of the card."""
@@ -60,82 +103,83 @@ class Card:
         """Compare by value only."""
         return self.value < other.value
 
+    def _push(self, suit, value, note=None, *args):
+        """Apply a new suit and value, noting it in the description."""
+        self._stack.append((self.suit, self.value, note, args))
+        self.suit, self.value = suit, value
+
     def apply(self, effect):
         
         """Apply the given effect to this card, and update the description."""
         
-        if self.value == SpecialValue.KISS:
+        suit, value = self.suit, self.value
+        if value == SpecialValue.KISS:
             return
         
         if effect.effect == EffectType.BUFF:
             if effect.value in SpecialValue.all():
-                self.value = effect.value
                 if effect.value == SpecialValue.WIN:
-                    self.description += "  Winning!"
+                    self._push(suit, effect.value, "  Winning!")
                 elif effect.value == SpecialValue.LOSE:
-                    self.description += "  Losing!"
-            elif self.value in SpecialValue.all():
+                    self._push(suit, effect.value, "  Losing!")
+                else:
+                    self._push(suit, effect.value)
+            elif value in SpecialValue.all():
                 return
             else:
-                self.value += effect.value
+                value += effect.value
                 if effect.value >= 0:
-                    self.description += "  Buffed to %s." % self.value
+                    self._push(suit, value, "  Buffed to %s.", value)
                 else:
-                    self.description += "  Debuffed to %s." % self.value
+                    self._push(suit, value, "  Debuffed to %s.", value)
 
         elif effect.effect == EffectType.MULTIPLY:
-            self.value = float(self.value) * effect.value
-            if effect.value > 1: self.value = int(self.value + 0.99)
-            else: self.value = int(self.value)
+            value = float(value) * effect.value
+            if effect.value > 1: value = int(value + 0.99)
+            else: value = int(value)
             if effect.value == 2:
-                self.description += "  Doubled."
+                self._push(suit, value, "  Doubled.")
             elif effect.value == 3:
-                self.description += "  Tripled."
+                self._push(suit, value, "  Tripled.")
             elif effect.value == 0.5:
-                self.description += "  Halved."
+                self._push(suit, value, "  Halved.")
             elif effect.value > 1:
-                self.description += ("  Increased to %s%% (%s)."
-                                     % (int(effect.value * 100), self.value))
+                self._push(suit, value, "  Increased to %s%% (%s).",
+                           int(effect.value * 100), value)
             else:
-                self.description += ("  Reduced to %s%% (%s)."
-                                     % (int(effect.value * 100), self.value))
+                self._push(suit, value, "  Reduced to %s%% (%s).",
+                           int(effect.value * 100), value)
             
         elif effect.effect == EffectType.KISS:
-            self.value = SpecialValue.KISS
-            self.description += "  Kissed!"
+            self._push(suit, SpecialValue.KISS, "  Kissed!")
             
         elif effect.effect == EffectType.REVERSE:
-            if self.value in (SpecialValue.WIN, SpecialValue.LOSE):
-                self.value = -self.value
-                self.description += "  Reversed."
-            elif self.value in SpecialValue.all():
+            if value in (SpecialValue.WIN, SpecialValue.LOSE):
+                self._push(suit, -value, "  Reversed.")
+            elif value in SpecialValue.all():
                 return
             else:
-                self.value = 11 - self.value
-                self.description += "  Reversed to %s." % self.value
+                self._push(suit, 11 - value, "  Reversed to %s.", 11 - value)
                 
         elif effect.effect == EffectType.REPLACE:
             if isinstance(effect.value, str):
-                self.suit = effect.value
-                self.description += "  Replaced suit with %s." % self.suit
+                self._push(effect.value, value,
+                           "  Replaced suit with %s.", effect.value)
             elif isinstance(effect.value, int):
-                self.value = effect.value
-                self.description += "  Replaced value with %s." % self.value
+                self._push(suit, effect.value,
+                           "  Replaced value with %s.", effect.value)
             else:
-                self.suit = effect.value.suit
-                self.value = effect.value.value
-                self.description += ("  Replaced by %s %s."
-                                     % (self.suit, self.value))
+                suit, value = effect.value.suit, effect.value.value
+                self._push(suit, value, "  Replaced by %s %s.", suit, value)
 
         elif effect.effect == EffectType.SWITCH:
-            self.value = effect.value
-            self.description += "  Switched to %s." % self.value
+            self._push(suit, effect.value, "  Switched to %s.", effect.value)
 
         elif effect.effect == EffectType.CLONE:
             if effect.value is self:
                 return
-            (self.suit, self.value) = (effect.value.suit, effect.value.value)
-            self.description += "  Cloned to %s." % effect.value
+            self._push(effect.value.suit, effect.value.value,
+                       "  Cloned to %s.", str(effect.value))
     
 
 class SpecialCard(Card):
@@ -188,25 +232,34 @@ class Deck:
     
     """A player's deck of cards.
 
+    Attributes:
+      rng      -- source of randomness (random.Random or the random module)
+
     Methods:
-      shuffle -- reshuffle the entire deck and start from the beginning
-      draw    -- return the top card from the deck
+      shuffle  -- reshuffle the entire deck and start from the beginning
+      draw     -- return the top card from the deck
+      snapshot -- return the current order and position (see restore)
+      restore  -- return to a previous snapshot
 
     """
 
-    def __init__(self, definition, shuffle=True, achievements=None):
+    def __init__(self, definition, shuffle=True, achievements=None, rng=None):
         """Prep the card list."""
         self.definition = definition
         self.achievements = achievements
+        self.rng = random if rng is None else rng
         self._cards = list(definition.cards(self.achievements))
+        self._position = 0
         self._next = self._draw()
         if shuffle:
             self.shuffle()
 
     def shuffle(self):
         """Shuffle the full deck together."""
+        Metrics.count('deck.shuffle')
         self._cards = list(self.definition.cards(self.achievements))
-        random.shuffle(self._cards)
+        self.rng.shuffle(self._cards)
+        self._position = 0
         self._next = self._draw()
 
     def suits_only(self, shuffle=True):
@@ -214,13 +267,30 @@ class Deck:
         self._cards = list(self.definition.cards(use_blocks=False,
                                                  skip_specials=True))
         if shuffle:
-            random.shuffle(self._cards)
+            self.rng.shuffle(self._cards)
+        self._position = 0
         self._next = self._draw()
 
     def _draw(self):
         """Generator; return each card in the current deck."""
-        for card in self._cards:
-            yield card
+        cards = self._cards
+        while self._position < len(cards):
+            self._position += 1
+            yield cards[self._position - 1]
+
+    def snapshot(self):
+        """Return (card list, position) to restore later.
+
+        The card list is shared rather than copied: it is replaced, never
+        reordered in place, on each shuffle.
+
+        """
+        return (self._cards, self._position)
+
+    def restore(self, snapshot):
+        """Return to the order and position of a previous snapshot."""
+        self._cards, self._position = snapshot
+        self._next = self._draw()
 
     def draw(self, auto_shuffle=True):
         """Return the next card in the current deck."""
@@ -348,7 +418,7 @@ class DeckDefinition:
         self.values = list(range(1, 11))
         self.specials = []
         special_detail = {}
-        for (tag, value) in FileReader(self.def_file):
+        for (tag, value) in FileReader(self.def_file, cached=True):
             if tag == "DECK-NAME":
                 self.name = value
 
@@ -558,10 +628,12 @@ class DeckDefinition:
                 if not use_blocks or special.name not in self.blocked_cards:
                     yield copy.copy(special)
                 
-    def get_special(self, name=None):
-        """Return the named SpecialCard, or None."""
+    def get_special(self, name=None, rng=None):
+        """Return the named SpecialCard (or a random one), or None."""
         if name is None:
-            return copy.copy(random.choice(self.specials))
+            if rng is None:
+                rng = random
+            return copy.copy(rng.choice(self.specials))
         for special in self.specials:
             if special.name == name:
                 return copy.copy(special)
@@ -671,9 +743,15 @@ class DeckCatalogEntry:
 
 class DeckCatalog:
 
-    """List of decks available for purchase and play."""
+    """List of decks available for purchase and play.
+
+    Files are read and saved in the given storage (default:
+    rendezvous.Storage).
+
+    """
 
-    def __init__(self, purchased_file=None, directory=None):
+    def __init__(self, purchased_file=None, directory=None, storage=None):
+        self.storage = storage or Storage
         if purchased_file is None:
             purchased_file = os.path.join("player", "decks.txt")
         if directory is None:
@@ -723,7 +801,7 @@ class DeckCatalog:
 
     def _read_available(self, directory):
         """Locate all available deck files."""
-        for (dirpath, dirnames, filenames) in os.walk(directory):
+        for (dirpath, dirnames, filenames) in self.storage.walk(directory):
             for file in filenames:
                 if file[-4:] != ".txt":
                     continue
@@ -732,7 +810,8 @@ class DeckCatalog:
                 base = file[:-4]
                 name = desc = ""
                 definition_file = os.path.join(dirpath, base) + ".txt"
-                for (tag, value) in FileReader(definition_file):
+                for (tag, value) in FileReader(definition_file, self.storage,
+                                               cached=True):
                     if tag == "DECK-NAME":
                         name = value
                     elif tag == "DECK-DESC":
@@ -745,16 +824,17 @@ class DeckCatalog:
     def _read_purchased(self, filename):
         """Read the list of purchased decks."""
         self._purchased_filename = filename
-        if not os.path.isfile(filename):
-            f = open(filename, 'w')
+        if not self.storage.exists(filename):
+            f = self.storage.open(filename, 'w')
             f.close()
-        for (tag, value) in FileReader(filename):
+        for (tag, value) in FileReader(filename, self.storage):
             if tag == "DECK-NAME":
                 self._purchased.append(value)
 
     def _write(self):
         """Write the list of purchased decks."""
-        f = open(self._purchased_filename, 'w')
+        Metrics.count('write.decks')
+        f = self.storage.open(self._purchased_filename, 'w')
         try:
             for deck_name in self._purchased:
                 f.write("[DECK-NAME]%s\n" % deck_name)
@@ -775,4 +855,28 @@ class DeckCatalog:
         self._write()
         return deck
 
+    def nearby(self, deck_name, count=2):
+        """Return up to count playable decks closest to the given deck.
+
+        Decks are taken alternately after and before the given deck in
+        catalog (display) order, skipping decks that have not been purchased.
+        The Standard deck is always playable.
+
+        """
+        decks = self.decks
+        start = decks.index(self[deck_name])
+        found = []
+        for offset in range(1, len(decks)):
+            for index in (start + offset, start - offset):
+                if not 0 <= index < len(decks):
+                    continue
+                deck = decks[index]
+                if (deck.base_filename != "Standard" and
+                    deck.name not in self._purchased):
+                    continue
+                found.append(deck)
+                if len(found) >= count:
+                    return found
+        return found
+
     
@@ -0,0 +1,359 @@
+"""Simulate the game's economy: winks, kisses and the pace of unlocks.
+
+Each virtual player plays a run of headless games against the dealer,
+keeping their own statistics, achievements and currencies in a
+MemoryStorage (nothing is written to disk).  At the end of every round
+and game they are rewarded by reward_round and reward_game, the very
+rules the app uses, so the statistics, achievement checks and currency
+earnings are all the real thing.  Players differ in skill: each decision is the hard
+AI's with the player's own probability, and the easy AI's otherwise.
+
+Players are independent, so they are spread across processes and their
+EconomyStats merged as each batch finishes.
+
+Each game costs roughly 10-15 ms of one core, half of it the hard AI
+choosing plays and a tenth the achievement checks, so a sweep of 10,000
+players by 100 games (a million games) takes about three CPU-hours: some
+25 minutes across 8 processes.  Scale the players down for a quick look.
+
+Run from the command line:
+
+    python -m rendezvous.economy [deck] [-p PLAYERS] [-g GAMES]
+                                 [-j PROCESSES]
+
+"""
+
+import copy
+import random
+import argparse
+
+from rendezvous import Currency, Storage, MemoryStorage
+from rendezvous.deck import DeckDefinition
+from rendezvous.gameplay import RendezVousGame
+from rendezvous.statistics import Statistics
+from rendezvous.achievements import AchievementList
+from rendezvous.powerups import Powerups
+
+PLAYER = 1
+DEALER = 0
+
+#: Kisses to buy a background (see gui.screens.backgrounds) or a deck
+BACKGROUND_PRICE = 5
+DECK_PRICE = 15
+
+
+def _pay_achievements(kisses, achieved, reason):
+    """Pay a kiss for each Achievement, and another for each without a
+    SpecialCard to unlock."""
+    if achieved:
+        kisses.earn(len(achieved), "%s achievement(s)." % reason)
+        kisses.earn(len([a for a in achieved if a.reward is None]),
+                    "Extra achievement rewards.")
+
+
+def reward_round(board, player, achievements, kisses):
+    """Check for achievements at the end of a round; return those reached."""
+    achieved = achievements.check_round(board, player)
+    _pay_achievements(kisses, achieved, "Round")
+    return achieved
+
+
+def reward_game(deck_base, score, player, statistics, achievements, winks,
+                kisses):
+    """Record the end of a game and pay out; return achievements reached.
+
+    A wink is earned for each suit won, and one more for winning the game.
+
+    """
+    statistics.record_game(deck_base, score, player)
+    winks.earn(score.win_count(player), "Win suits.")
+    if score.win_count(player) > score.win_count(score.opponent(player)):
+        winks.earn(1, "Win the game.")
+    achieved = achievements.check(score, player, statistics)
+    _pay_achievements(kisses, achieved, "Game")
+    return achieved
+
+
+def fresh_achievements(achievements, storage):
+    """Return a copy of the AchievementList with none earned, saving to
+    the given storage; the Achievement definitions are shared."""
+    other = copy.copy(achievements)
+    other.storage = storage
+    other.achieved = []
+    other._progress = {}
+    other._progress_changed = False
+    return other
+
+
+class EconomyStats(object):
+
+    """Totals across many simulated players.
+
+    Attributes:
+      players  -- number of players simulated
+      games    -- games each player played
+      won      -- games won, across all players
+      rewards  -- {achievement name : name of the SpecialCard it unlocks}
+      unlocks  -- {achievement name : {game : players first earning it}}
+      balances -- {currency name : [{balance : players}, after each game]}
+
+    Methods:
+      merge      -- add another EconomyStats into this one
+      unlock     -- return the distribution of games to earn an Achievement
+      balance    -- return the distribution of a balance after a game
+      afford     -- return the game by which most players could afford
+      report     -- return a human-readable summary
+
+    """
+
+    CURRENCIES = ('wink', 'kiss')
+
+    def __init__(self, games=0):
+        self.players = 0
+        self.games = games
+        self.won = 0
+        self.rewards = {}
+        self.unlocks = {}
+        self.balances = dict((name, [{} for g in range(games)])
+                             for name in self.CURRENCIES)
+
+    def add_player(self, earned, balances, won):
+        """Add one player's run.
+
+        Arguments:
+          earned   -- {achievement name : game it was first earned}
+          balances -- {currency name : [balance after each game]}
+          won      -- number of games won
+
+        """
+        self.players += 1
+        self.won += won
+        for name, game in earned.items():
+            counts = self.unlocks.setdefault(name, {})
+            counts[game] = counts.get(game, 0) + 1
+        for name, history in balances.items():
+            for counts, balance in zip(self.balances[name], history):
+                counts[balance] = counts.get(balance, 0) + 1
+
+    def merge(self, other):
+        """Add the totals from other into this."""
+        self.players += other.players
+        self.won += other.won
+        self.rewards.update(other.rewards)
+        for name, counts in other.unlocks.items():
+            mine = self.unlocks.setdefault(name, {})
+            for game, players in counts.items():
+                mine[game] = mine.get(game, 0) + players
+        for name, history in other.balances.items():
+            for mine, counts in zip(self.balances[name], history):
+                for balance, players in counts.items():
+                    mine[balance] = mine.get(balance, 0) + players
+        return self
+
+    def _percentile(self, counts, fraction):
+        """Return the value reached by this fraction of all players (or
+        None if too few ever reached one)."""
+        needed = fraction * self.players
+        total = 0
+        for value in sorted(counts):
+            total += counts[value]
+            if total >= needed:
+                return value
+        return None
+
+    def unlock(self, name, fractions=(0.1, 0.5, 0.9)):
+        """Return (fraction of players earning it, game by which each
+        fraction had) for the named Achievement."""
+        counts = self.unlocks.get(name, {})
+        reached = (float(sum(counts.values())) / self.players
+                   if self.players else 0)
+        return reached, [self._percentile(counts, f) for f in fractions]
+
+    def balance(self, currency, game, fractions=(0.1, 0.5, 0.9)):
+        """Return the balance at each percentile (as fractions) of players
+        after the game (numbered from 1)."""
+        counts = self.balances[currency][game - 1]
+        return [self._percentile(counts, f) for f in fractions]
+
+    def afford(self, currency, price, fraction=0.5):
+        """Return the first game after which this fraction of players had
+        the price saved up (spending nothing), or None."""
+        for game, counts in enumerate(self.balances[currency]):
+            rich = sum(players for balance, players in counts.items()
+                       if balance >= price)
+            if rich >= fraction * self.players:
+                return game + 1
+        return None
+
+    def report(self):
+        """Return tables of unlock pacing, balances and prices."""
+        def show(value):
+            return "%6s" % ("-" if value is None else value)
+
+        lines = ["%d players x %d games, %.1f%% of games won" %
+                 (self.players, self.games,
+                  100.0 * self.won / (self.players * self.games)
+                  if self.players and self.games else 0), "",
+                 "Games to earn each achievement (percentiles of players)",
+                 "%-32s %-24s %7s %6s %6s %6s" % ("Achievement", "Unlocks",
+                                                  "Earned", "p10", "p50",
+                                                  "p90")]
+        order = sorted(self.rewards,
+                       key=lambda n: (-self.unlock(n)[0], n))
+        for name in order:
+            reached, games = self.unlock(name)
+            lines.append("%-32s %-24s %6.1f%% %s" % (
+                name[:32], (self.rewards[name] or "")[:24], reached * 100,
+                " ".join(show(g) for g in games)))
+
+        lines += ["", "Balances after each game (p10/p50/p90 of players)",
+                  "%6s %20s %20s" % ("Game", "Winks", "Kisses")]
+        marks = sorted(set(g for g in (1, 5, 10, 25, 50, 100, 250, 500,
+                                       1000, self.games)
+                           if 0 < g <= self.games))
+        for game in marks:
+            lines.append("%6d %20s %20s" % (game, "/".join(
+                str(b) for b in self.balance('wink', game)), "/".join(
+                str(b) for b in self.balance('kiss', game))))
+
+        lines += ["", "Games until half of players can afford (no spending)",
+                  "%-24s %8s %8s" % ("Item", "Price", "Games")]
+        for powerup in Powerups.available:
+            lines.append("%-24s %3d %-4s %s" % (
+                powerup.name, powerup.price, "wink",
+                show(self.afford('wink', powerup.price))))
+        for item, price in (("Background", BACKGROUND_PRICE),
+                            ("Deck", DECK_PRICE)):
+            lines.append("%-24s %3d %-4s %s" % (
+                item, price, "kiss", show(self.afford('kiss', price))))
+        return "\n".join(lines)
+
+
+def simulate_player(definition, achievements, seed, games, stats=None):
+
+    """Play one virtual player's run of games; return the EconomyStats.
+
+    Arguments:
+      definition   -- the DeckDefinition to play
+      achievements -- an AchievementList to start from (a fresh copy is
+                      used, so one can be shared between players)
+      seed         -- seed for the player's skill and games
+      games        -- number of games to play
+      stats        -- EconomyStats to add the player to (default: new)
+
+    """
+
+    if stats is None:
+        stats = EconomyStats(games)
+    rng = random.Random(seed)
+    skill = rng.random()  # chance of each play being the hard AI's
+    storage = MemoryStorage()
+    achievements = fresh_achievements(achievements, storage)
+    statistics = Statistics(storage=storage)
+    winks = Currency('wink', "", storage=storage)
+    kisses = Currency('kiss', "", storage=storage)
+    for achievement in achievements:
+        stats.rewards[achievement.name] = achievement.reward
+
+    game = RendezVousGame(deck=definition, achievements=achievements,
+                          rng=rng)
+    earned = {}
+    balances = dict((name, []) for name in stats.CURRENCIES)
+    won = 0
+    for number in range(1, games + 1):
+        game.new_game()
+        while True:
+            for p, hand in enumerate(game.players):
+                if p == DEALER or rng.random() < skill:
+                    play = hand.AI_hard(p, game.board, game.score)
+                else:
+                    play = hand.AI_easy(p, game.board, game.score)
+                for card in play:
+                    hand.remove(card)
+                game.board.play_cards(p, play)
+            game.score_round()
+            for achievement in reward_round(game.board, PLAYER,
+                                            achievements, kisses):
+                earned.setdefault(achievement.name, number)
+            if game.next_round():
+                break
+        for achievement in reward_game(definition.base_filename, game.score,
+                                       PLAYER, statistics, achievements,
+                                       winks, kisses):
+            earned.setdefault(achievement.name, number)
+        won += game.score.win_count(PLAYER) > game.score.win_count(DEALER)
+        balances['wink'].append(winks.balance)
+        balances['kiss'].append(kisses.balance)
+    stats.add_player(earned, balances, won)
+    return stats
+
+
+def _simulate_batch(args):
+    """Worker: play each player's games; return the merged totals."""
+    deck, seeds, games = args
+    definition = DeckDefinition(deck)
+    achievements = AchievementList(deck=deck, storage=MemoryStorage(Storage))
+    stats = EconomyStats(games)
+    for seed in seeds:
+        simulate_player(definition, achievements, seed, games, stats)
+    return stats
+
+
+def simulate(deck="Standard", players=1000, games=100, processes=None,
+             seed=0, batch=20, callback=None):
+
+    """Simulate players across processes; return the merged EconomyStats.
+
+    Arguments:
+      deck      -- base filename of the deck to play
+      players   -- number of virtual players
+      games     -- games each player plays
+      processes -- worker processes (default: one per core; 1 for none)
+      seed      -- first seed; player n uses seed + n, so results are
+                   identical however the work is split
+      batch     -- players per task sent to a worker
+      callback  -- optional callback(stats) after each batch is merged
+
+    """
+
+    tasks = [(deck, range(start, min(start + batch, seed + players)), games)
+             for start in range(seed, seed + players, batch)]
+    stats = EconomyStats(games)
+    if processes == 1:
+        results = map(_simulate_batch, tasks)
+        pool = None
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(processes)
+        results = pool.imap_unordered(_simulate_batch, tasks)
+    try:
+        for result in results:
+            stats.merge(result)
+            if callback is not None:
+                callback(stats)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Simulate the pace of earning winks, kisses and unlocks.")
+    parser.add_argument('deck', nargs='?', default="Standard",
+                        help="base filename of the deck (default: Standard)")
+    parser.add_argument('-p', '--players', type=int, default=1000)
+    parser.add_argument('-g', '--games', type=int, default=100,
+                        help="games each player plays (default: 100)")
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    stats = simulate(args.deck, args.players, args.games, args.processes,
+                     args.seed)
+    print(stats.report())
+
+
+if __name__ == '__main__':
+    main()
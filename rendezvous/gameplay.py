@@ -1,9 +1,20 @@
 import random
+import itertools
 
 from rendezvous import GameSettings, SpecialSuit, SpecialValue, EffectType
-from rendezvous import Alignment, TargetField
+from rendezvous import Alignment, TargetField, Metrics
 from rendezvous.deck import Deck, DeckDefinition
-from rendezvous.dealer import ArtificialIntelligence
+from rendezvous.dealer import ArtificialIntelligence, HandAnalysis
+from rendezvous.matchups import matchups, rival
+
+#: Metrics event name for each EffectType, e.g. 'special.BUFF'
+_SPECIAL_EVENTS = dict((value, 'special.%s' % name)
+                       for name, value in vars(EffectType).items()
+                       if not name.startswith('_'))
+
+#: Most hands a computer player will flush looking for any valid play
+MAX_FLUSHES = 10
+
 
 class Hand:
 
@@ -12,16 +23,20 @@ class Hand:
     Attributes:
       cards -- the current hand of Cards
       deck  -- the player's deck from which to draw
+      analysis -- what the dealer has worked out about these cards
 
     Methods:
       refill  -- bring the hand back up to its full count
       flush   -- empty the hand and refill it from the deck
       AI_play -- intelligently choose cards to play
+      find_play -- return any valid play, if there is one
 
     """
 
     def __init__(self, deck):
         self.deck = deck
+        self.cards = []
+        self.analysis = HandAnalysis()
         self.flush()
 
     # Treat as container (shortcut to .cards)
@@ -39,13 +54,18 @@ class Hand:
         return self.cards.index(card)
 
     def pop(self, index=-1):
-        return self.cards.pop(index)
+        card = self.cards.pop(index)
+        self.analysis.discard([card])
+        return card
 
     def remove(self, card):
-        self.cards.remove(card)
+        index = self.cards.index(card)
+        self.analysis.discard([self.cards.pop(index)])
 
     def extend(self, cards):
+        cards = list(cards)
         self.cards.extend(cards)
+        self.analysis.add(cards)
 
     def sort(self, *args, **kwargs):
         self.cards.sort(*args, **kwargs)
@@ -54,36 +74,77 @@ class Hand:
     
     def refill(self):
         """Fill up to maximum capacity from the deck."""
+        drawn = []
         while len(self.cards) < GameSettings.CARDS_IN_HAND:
-            self.cards.append(self.deck.draw())
+            drawn.append(self.deck.draw())
+            self.cards.append(drawn[-1])
+        self.analysis.add(drawn)
 
     def AI_easy(self, player_index, gameboard, score):
-        """Select cards to play (by brute force)."""
+        """Select cards to play (by brute force).
+
+        While the first cards include invalid specials, they are discarded
+        and redrawn at no cost, up to MAX_FLUSHES times; after that, any
+        valid play is found as for AI_hard.
+
+        """
         needed = gameboard[player_index].count(None)
         play = self.cards[:needed]
+        redraws = 0
         while gameboard.validate(play):  # invalid specials found
+            if redraws == MAX_FLUSHES:
+                return self._any_play(player_index, gameboard, score)
+            self.analysis.discard(play)
             self.cards = self.cards[needed:]
             self.refill()
             play = self.cards[:needed]
+            redraws += 1
         return play
 
     def AI_hard(self, player_index, gameboard, score):
         """Intelligently select cards to play."""
-        while True:
-            ai = ArtificialIntelligence(player_index, self, gameboard, score)
-            try:
-                return ai.get_best_play()
-            except IndexError:  # no valid plays
-                self.cant_play(player_index, score)
+        ai = ArtificialIntelligence(player_index, self, gameboard, score,
+                                    self.deck.rng)
+        try:
+            return ai.get_best_play()
+        except IndexError:  # no plays the AI could find
+            return self._any_play(player_index, gameboard, score)
+
+    def find_play(self, player_index, gameboard):
+        """Return cards making a valid play on the board, or None."""
+        return find_play(self.cards, gameboard[player_index])
+
+    def _any_play(self, player_index, gameboard, score):
+        """Return any valid play, taking the cut for each hand without one.
+
+        After MAX_FLUSHES hands, the holds are assumed impossible to
+        satisfy: the cut is still taken for each hand, but the play need
+        only be valid on its own, without the held cards.
+
+        """
+        play = self.find_play(player_index, gameboard)
+        flushes = 0
+        while play is None:
+            self.cant_play(player_index, score)
+            flushes += 1
+            if flushes < MAX_FLUSHES:
+                play = self.find_play(player_index, gameboard)
+            else:
+                needed = gameboard[player_index].count(None)
+                play = find_play(self.cards, [None] * needed)
+        return play
 
     def cant_play(self, player_index, score):
         """Take the points cut for not being able to play."""
+        Metrics.count('hand.cant_play')
         for i in range(len(score[player_index])):
             score[player_index][i] -= 10
         self.flush()
 
     def flush(self):
         """Empty hand and refill from deck."""
+        Metrics.count('hand.flush')
+        self.analysis.discard(self.cards)
         self.cards = []
         self.refill()
 
@@ -103,6 +164,7 @@ class Gameboard:
       clear_wait -- reset the holds for the next round
       clear      -- clear all cards, ignoring holds
       is_full    -- return whether the player's side is full already
+      holds      -- return the player's side with only the held cards
 
     """
 
@@ -111,18 +173,23 @@ class Gameboard:
         self._clear_board()
 
     def __len__(self):
-        return GameSettings.NUM_PLAYERS
+        return len(self.board)
 
     def __getitem__(self, key):
         return self.board[key]
 
     def __iter__(self):
-        return iter(self.board[0] + self.board[1])
+        return itertools.chain.from_iterable(self.board)
 
     def is_full(self, player):
         """Return boolean indicating whether player's side is full."""
         return None not in self.board[player]
 
+    def holds(self, player):
+        """Return the player's side with only held cards (the rest None)."""
+        return [card if hold else None
+                for card, hold in zip(self.board[player], self._wait[player])]
+
     def play_cards(self, player, cards):
         """Place the player's card(s) onto the board where available."""
         indices = []
@@ -166,7 +233,8 @@ class Gameboard:
         self.clear_wait()
         self._clear_board()
 
-    def validate(self, cards):
+    @staticmethod
+    def validate(cards):
         """Confirm cards may be played together; return invalid indices list."""
         invalid = []
         for i, card in enumerate(cards):
@@ -176,18 +244,118 @@ class Gameboard:
         return invalid
 
 
-class Scoreboard:
+def find_play(cards, side):
+
+    """Return cards to fill the open spaces on one side validly, or None.
+
+    Arguments:
+      cards -- all cards available to play (a Hand or list)
+      side  -- one player's side of the board: held cards, with None
+               for each open space
+
+    The search is exhaustive, so None means no choice of these cards
+    passes Gameboard.validate alongside the held cards.  Cards that no
+    requirement can tell apart (normal cards of the same suit and value,
+    or specials of the same name) are only tried once, and plays using
+    more normal cards are tried first.
+
+    """
+
+    held = [card for card in side if card is not None]
+    needed = len(side) - len(held)
+    normals = [card for card in cards if card.suit != SpecialSuit.SPECIAL]
+    if (len(normals) >= needed and
+        all(card.suit != SpecialSuit.SPECIAL for card in held)):
+        return normals[:needed]  # no requirements to meet
+
+    groups = []
+    index = {}
+    for card in itertools.chain(normals, (card for card in cards
+                                          if card.suit == SpecialSuit.SPECIAL)):
+        key = (card.suit, getattr(card, 'name', card.value))
+        if key not in index:
+            index[key] = len(groups)
+            groups.append([])
+        groups[index[key]].append(card)
+    left = [0] * (len(groups) + 1)  # cards available from groups[i:]
+    for i in range(len(groups) - 1, -1, -1):
+        left[i] = left[i + 1] + len(groups[i])
+
+    def search(i, chosen):
+        remaining = needed - len(chosen)
+        if remaining == 0:
+            return None if Gameboard.validate(held + chosen) else chosen
+        if left[i] < remaining:
+            return None
+        for count in range(min(len(groups[i]), remaining), -1, -1):
+            found = search(i + 1, chosen + groups[i][:count])
+            if found is not None:
+                return found
+        return None
+
+    return search(0, [])
+
+
+class _ScoreRow(list):
+
+    """One player's scores by suit, reporting each change to its Scoreboard.
+
+    Setting a single score (score[player][suit] = value, or += value) keeps
+    the Scoreboard's aggregates current.  Other list mutations are not
+    tracked; replace Scoreboard.scores instead.
+
+    """
+
+    __slots__ = ('scoreboard', 'player')
+
+    def __init__(self, scoreboard, player, scores=()):
+        list.__init__(self, scores)
+        self.scoreboard = scoreboard
+        self.player = player
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            list.__setitem__(self, index, value)
+            self.scoreboard._rebuild()
+            return
+        if index < 0:
+            index += len(self)
+        self.scoreboard._adjust(self.player, index, value - self[index])
+
+
+def _leader(scores):
+    """Return the index of the single highest score, or None if tied."""
+    high_score = max(scores)
+    if len(scores) < 2 or scores.count(high_score) > 1:
+        return None
+    return scores.index(high_score)
+
+
+class Scoreboard(object):
 
     """Tracks the score for the game.
 
+    Totals, suit columns and the leader in each suit are kept up to date as
+    each score changes, so reading them costs the same no matter how often
+    they are asked for during and after a game.  A player wins a suit (and
+    leads by a margin) over the best of the other players.
+
     Attributes:
       suits  -- the names of the current deck's suits
       scores -- the current scores by [player][suit]
 
     Methods:
-      score -- update based on the cards in play
-      zero  -- reset all scores to zero
-      total -- returns the total score for a specific player
+      score     -- update based on the cards in play
+      zero      -- reset all scores to zero
+      total     -- returns the total score for a specific player
+      rival     -- returns the best other score, in total or in one suit
+      margin    -- returns a player's lead, in total or in one suit
+      opponent  -- returns the best of the other players
+      wins      -- returns the suits this player is winning
+      win_count -- returns the number of suits this player is winning
+      winner    -- returns the winner(s) of a suit
+      by_suit   -- returns every player's score in a suit
+      best_suit -- returns the suit where the player has the biggest lead
 
     """
 
@@ -196,13 +364,67 @@ class Scoreboard:
         self.zero()
 
     def __len__(self):
-        return GameSettings.NUM_PLAYERS
+        return len(self._scores)
 
     def __getitem__(self, key):
-        return self.scores[key]
+        return self._scores[key]
 
     def __iter__(self):
-        return iter(zip(*self.scores))
+        return iter([tuple(column) for column in self._columns])
+
+    @property
+    def suits(self):
+        return self._suits
+
+    @suits.setter
+    def suits(self, suits):
+        self._suits = suits
+        self._suit_index = dict((suit, i) for i, suit in enumerate(suits))
+        if hasattr(self, '_scores'):
+            self._rebuild()
+
+    @property
+    def scores(self):
+        return self._scores
+
+    @scores.setter
+    def scores(self, scores):
+        self._scores = [_ScoreRow(self, p, row) for p, row in enumerate(scores)]
+        self._rebuild()
+
+    def _rebuild(self):
+        """Recalculate all aggregates from the raw scores."""
+        scores = self._scores
+        self._totals = [sum(row) for row in scores]
+        self._columns = [list(column) for column in zip(*scores)]
+        self._leaders = [_leader(column) for column in self._columns]
+        self._win_counts = [self._leaders.count(p) for p in range(len(scores))]
+        self._wins = [None] * len(scores)
+        self._best = [None] * len(scores)
+
+    def _adjust(self, player, index, delta):
+        """Add delta to one score, updating the aggregates to match."""
+        if not delta:
+            return
+        scores = self._scores
+        list.__setitem__(scores[player], index, scores[player][index] + delta)
+        self._totals[player] += delta
+        self._columns[index][player] += delta
+        self._best = [None] * len(scores)
+        leader = _leader(self._columns[index])
+        previous = self._leaders[index]
+        if leader != previous:
+            self._leaders[index] = leader
+            if previous is not None:
+                self._win_counts[previous] -= 1
+                self._wins[previous] = None
+            if leader is not None:
+                self._win_counts[leader] += 1
+                self._wins[leader] = None
+
+    def _index(self, suit):
+        """Return the index of a suit given by name or index."""
+        return self._suit_index.get(suit, suit)
 
     def zero(self):
         """Zero the score for all players and suits."""
@@ -211,39 +433,68 @@ class Scoreboard:
 
     def total(self, player):
         """Return player's total score."""
-        return sum(self.scores[player])
+        return self._totals[player]
+
+    def rival(self, player, suit=None):
+        """Return the best other score, in total or in one suit."""
+        if suit is None:
+            return rival(self._totals, player)
+        return rival(self._columns[self._index(suit)], player)
+
+    def margin(self, player, suit=None):
+        """Return player's lead over the others, in total or in one suit."""
+        if suit is None:
+            return self._totals[player] - rival(self._totals, player)
+        column = self._columns[self._index(suit)]
+        return column[player] - rival(column, player)
+
+    def opponent(self, player):
+        """Return the other player with the most suits won (then points)."""
+        player %= len(self._scores)
+        others = [p for p in range(len(self._scores)) if p != player]
+        if not others:
+            return player
+        return max(others,
+                   key=lambda p: (self._win_counts[p], self._totals[p]))
 
     def wins(self, player):
         """Return the suits this player has won."""
-        return [suit for i, suit in enumerate(self.suits)
-                if self[player][i] > self[player-1][i]]
+        player %= len(self._scores)
+        if self._wins[player] is None:
+            self._wins[player] = [self.suits[i] for i, leader
+                                  in enumerate(self._leaders)
+                                  if leader == player]
+        return list(self._wins[player])
+
+    def win_count(self, player):
+        """Return the number of suits this player has won."""
+        return self._win_counts[player]
 
     def winner(self, suit):
         """Return the winner(s) of the given suit."""
-        if suit in self.suits:
-            suit = self.suits.index(suit)
-        suit_scores = list(zip(*self.scores))[suit]
+        suit_scores = self._columns[self._index(suit)]
         high_score = max(suit_scores)
         return [i for i, score in enumerate(suit_scores) if score == high_score]
 
     def by_suit(self, suit):
         """Return a tuple of the scores in the given suit."""
-        if suit in self.suits:
-            suit = self.suits.index(suit)
-        return list(zip(*self.scores))[suit]
+        return tuple(self._columns[self._index(suit)])
 
     def best_suit(self, player):
         """Return the suit where the player has the biggest lead."""
-        deltas = list(map(lambda x: x[player] - x[player-1], zip(*self.scores)))
-        best_lead = max(deltas)
-        return self.suits[deltas.index(best_lead)]
+        if self._best[player] is None:
+            deltas = [column[player] - rival(column, player)
+                      for column in self._columns]
+            self._best[player] = self.suits[deltas.index(max(deltas))]
+        return self._best[player]
 
     def score(self, board):
         """Score the board, adjusting each player's totals."""
-        for i in range(GameSettings.CARDS_ON_BOARD):
-            for p in range(GameSettings.NUM_PLAYERS):
-                self._score_match(p, board[p][i], p-1, board[p-1][i])
-                # wraps around when -1 is last player
+        table = matchups()
+        for i in range(len(table[0])):
+            for p, opponents in enumerate(table):
+                enemy = opponents[i]
+                self._score_match(p, board[p][i], enemy, board[enemy][i])
 
     def _score_match(self, player, player_card, enemy, enemy_card):
 
@@ -281,7 +532,7 @@ class Scoreboard:
     def _win(self, player, suit, value=10):
         """Record a win for player in suit for value points (default: 10)."""
         if suit != SpecialSuit.SPECIAL:
-            self.scores[player][self.suits.index(suit)] += value
+            self._adjust(player, self._suit_index[suit], value)
 
     def _lose(self, player, suit):
         """Record a loss for player in suit of 10 points."""
@@ -289,6 +540,113 @@ class Scoreboard:
 
 
 
+class GameSnapshot(object):
+
+    """The complete state of a RendezVousGame at one moment.
+
+    Everything is held in tuples that share the Card objects (and each
+    deck's card list) with the live game, so taking a snapshot copies only
+    references.  Specials may change any card that is played afterwards,
+    so the snapshot of each one's effect stack is recorded as well, for
+    the cards in every hand as well as those on the board.
+
+    Attributes:
+      hands  -- (Hand, tuple of Cards, Deck, Deck.snapshot()) per player
+      board  -- the board's Cards by [player][index]
+      waits  -- the board's holds by [player][index]
+      cards  -- ((Card, Card.snapshot()), ...) for the hands and board
+      scores -- the scores by [player][suit]
+      round  -- the round number
+
+    """
+
+    __slots__ = ('hands', 'board', 'waits', 'cards', 'scores', 'round')
+
+    def __init__(self, game):
+        self.hands = tuple((hand, tuple(hand.cards), hand.deck,
+                            hand.deck.snapshot()) for hand in game.players)
+        self.board = tuple(tuple(side) for side in game.board.board)
+        self.waits = tuple(tuple(side) for side in game.board._wait)
+        self.cards = tuple((card, card.snapshot())
+                           for cards in ([hand[1] for hand in self.hands] +
+                                         list(self.board))
+                           for card in cards if card is not None)
+        self.scores = tuple(tuple(player) for player in game.score.scores)
+        self.round = getattr(game, 'round', 0)
+
+    def restore(self, game):
+        """Return the game to exactly this state."""
+        for hand, cards, deck, position in self.hands:
+            hand.cards = list(cards)
+            hand.deck = deck
+            deck.restore(position)
+        game.players[:] = [hand for hand, c, d, p in self.hands]
+        game.board.board = [list(side) for side in self.board]
+        game.board._wait = [list(side) for side in self.waits]
+        for card, effects in self.cards:
+            card.restore(effects)
+        game.score.scores = [list(player) for player in self.scores]
+        game.round = self.round
+
+
+class SpecialPlan(object):
+
+    """Which cards the specials on one board may affect, found once.
+
+    No special matches another special card, so only the slots holding
+    normal cards when scoring begins are ever checked; they are listed
+    once for each player and alignment, in the order _apply visits them.
+    The checks themselves are left until each special resolves, so each
+    is made only once, after every earlier special has taken effect.
+    A special created partway through (by RANDOMIZE) is simply rejected
+    by the checks of any later specials, so the plan stays valid.
+
+    Attributes:
+      players -- number of players on the board
+      slots   -- number of cards on each side
+      table   -- opponents by [player][slot] (see matchups)
+
+    Methods:
+      targets -- return the (player, slot, opponent) to check, in order
+
+    """
+
+    __slots__ = ('players', 'slots', 'table', '_normal', '_targets')
+
+    def __init__(self, board):
+        self.players = len(board.board)
+        self.slots = len(board.board[0])
+        self.table = matchups(self.players, self.slots)
+        self._normal = [[card is not None and
+                         card.suit != SpecialSuit.SPECIAL for card in side]
+                        for side in board.board]
+        self._targets = {}
+
+    def targets(self, player, alignments, by_slot=False):
+        """Return the cells a special of this player's could match.
+
+        Arguments:
+          player     -- the player who played the special
+          alignments -- alignments the special can match (from matcher)
+          by_slot    -- order slot by slot, rather than player by player
+
+        """
+        key = (player, alignments, by_slot)
+        try:
+            return self._targets[key]
+        except KeyError:
+            pass
+        cells = [(p, c, self.table[p][c])
+                 for p in range(self.players)
+                 if (Alignment.FRIENDLY if p == player else Alignment.ENEMY)
+                    in alignments
+                 for c in range(self.slots) if self._normal[p][c]]
+        if by_slot:
+            cells.sort(key=lambda cell: (cell[1], cell[0]))
+        self._targets[key] = cells
+        return cells
+
+
 class RendezVousGame:
 
     """A single game of RendezVous.
@@ -297,30 +655,40 @@ class RendezVousGame:
       players     -- the Hands participating in the game
       board       -- the Gameboard accepting play
       score       -- the Scoreboard keeping track
+      rng         -- source of all randomness in the game; pass a seeded
+                     random.Random to make the game reproducible
+      recorder    -- optional GameRecorder to log each round (see record.py)
 
     Methods:
       new_game       -- begin a new game
       score_round    -- apply specials and score the current round of play
       next_round     -- advance to the next round of play
       validate       -- confirm that the play is acceptable
+      plan_specials  -- return a SpecialPlan for the board as it is now
+      snapshot       -- return a GameSnapshot of the current state
+      restore        -- return to the state of a GameSnapshot
 
     """
 
-    def __init__(self, deck=DeckDefinition(), achievements=None):
+    def __init__(self, deck=DeckDefinition(), achievements=None, rng=None):
         """Create the elements of the game."""
         self.deck = deck
         self.achievements = achievements
-        self.players = [Hand(Deck(self.deck, achievements=achievements))
+        self.rng = random if rng is None else rng
+        self.players = [Hand(Deck(self.deck, achievements=achievements,
+                                  rng=self.rng))
                         for i in range(GameSettings.NUM_PLAYERS)]
         self.board = Gameboard()
         self.score = Scoreboard(self.deck)
+        self.recorder = None
 
     def load_deck(self, deck):
         """Switch to a new deck."""
         self.deck = deck
         self.score.suits = deck.suits
         for hand in self.players:
-            hand.deck = Deck(deck, achievements=self.achievements)
+            hand.deck = Deck(deck, achievements=self.achievements,
+                             rng=self.rng)
             hand.flush()
         
     def new_game(self):
@@ -331,15 +699,20 @@ class RendezVousGame:
         self.board.clear()
         self.score.zero()
         self.round = 1
+        if self.recorder is not None:
+            self.recorder.start(self)
 
     def score_round(self):
         """Score the current round, applying all specials."""
-        self.board.clear_wait()
-        self._apply_specials()
-        self.score.score(self.board)
+        with Metrics.timer('game.score_round'):
+            self.board.clear_wait()
+            self._apply_specials()
+            self.score.score(self.board)
 
     def next_round(self):
         """Clear the board; refill the hands; return True if game over."""
+        if self.recorder is not None:
+            self.recorder.record_round(self)
         for hand in self.players:
             hand.refill()
         self.board.next_round()
@@ -349,18 +722,41 @@ class RendezVousGame:
     def validate(self, player):
         """Return list of invalid board indices (if any)."""
         return self.board.validate(self.board[player])
+
+    def plan_specials(self):
+        """Return a SpecialPlan for the board, to pass to each _apply."""
+        return SpecialPlan(self.board)
+
+    def snapshot(self):
+        """Return a GameSnapshot of the current state (see restore)."""
+        return GameSnapshot(self)
+
+    def restore(self, snapshot):
+        """Return to the exact state of an earlier snapshot."""
+        snapshot.restore(self)
     
     def _apply_specials(self):
         """Apply all special cards in play, left-to-right, top-to-bottom."""
-        for i in range(GameSettings.CARDS_ON_BOARD):
-            for p in range(GameSettings.NUM_PLAYERS):
-                if self.board[p][i].suit == SpecialSuit.SPECIAL:
-                    self._apply(p, i)
+        with Metrics.timer('game.apply_specials'):
+            plan = self.plan_specials()
+            for i in range(plan.slots):
+                for p in range(plan.players):
+                    if self.board[p][i].suit == SpecialSuit.SPECIAL:
+                        self._apply(p, i, plan)
+
+    def _apply(self, player_index, board_index, plan=None):
+        """Apply the special card at the given location across the board.
+
+        Pass the same SpecialPlan (see plan_specials) for every special
+        applied in one scoring to save finding the targets each time.
 
-    def _apply(self, player_index, board_index):
-        """Apply the special card at the given location across the board."""
+        """
+        if plan is None:
+            plan = self.plan_specials()
         special = self.board[player_index][board_index]
-        special.applied_to = [0 for p in range(GameSettings.NUM_PLAYERS)]
+        special.applied_to = [0] * plan.players
+        if Metrics.active:
+            Metrics.count(_SPECIAL_EVENTS.get(special.effect.effect, 'special'))
 
         # Flush applies to the hand, not to individual cards      
         if special.effect.effect == EffectType.FLUSH:
@@ -372,34 +768,38 @@ class RendezVousGame:
             special.effect.value = special.requirement.filter(
                         Alignment.FRIENDLY, self.board[player_index])[0]
 
+        match = special.application.matcher()
+        board = self.board.board
+
         # Switches have to be careful not to undo themselves
         if special.effect.effect == EffectType.SWITCH:
-            for c in range(GameSettings.CARDS_ON_BOARD):
-                for p in range(GameSettings.NUM_PLAYERS):
-                    if special.application.match(p == player_index,
-                                                 self.board[p][c],
-                                                 self.board[p-1][c]):
-                        special.applied_to[p] += 1
-                        self._apply_to_card(special.effect, p, c)
-                        # check the newly switched card
-                        if special.application.match(p != player_index,
-                                                     self.board[p][c],
-                                                     self.board[p-1][c]):
-                            special.applied_to[p-1] += 1
-                            self._apply_to_card(special.effect, p, c)
-                        break  # skip any other checks in this match
+            # Any card switched may then match as the other alignment
+            alignments = frozenset((Alignment.FRIENDLY, Alignment.ENEMY))
+            switched = set()
+            slot = None
+            for p, c, enemy in plan.targets(player_index, alignments, True):
+                if c != slot:
+                    slot = c
+                    switched.clear()
+                if p in switched or enemy in switched:
+                    continue  # skip any other checks in this match
+                if match(p == player_index, board[p][c], board[enemy][c]):
+                    special.applied_to[p] += 1
+                    self._apply_to_card(special.effect, p, c, enemy)
+                    # check the newly switched card
+                    if match(p != player_index, board[p][c], board[enemy][c]):
+                        special.applied_to[enemy] += 1
+                        self._apply_to_card(special.effect, p, c, enemy)
+                    switched.update((p, enemy))
             return
 
         # Apply to some or all of the cards in play
-        for p in range(GameSettings.NUM_PLAYERS):
-            for c in range(GameSettings.CARDS_ON_BOARD):
-                if special.application.match(p == player_index,
-                                             self.board[p][c],
-                                             self.board[p-1][c]):
-                    special.applied_to[p] += 1
-                    self._apply_to_card(special.effect, p, c)
+        for p, c, enemy in plan.targets(player_index, match.alignments):
+            if match(p == player_index, board[p][c], board[enemy][c]):
+                special.applied_to[p] += 1
+                self._apply_to_card(special.effect, p, c, enemy)
 
-    def _apply_to_card(self, effect, player, index):
+    def _apply_to_card(self, effect, player, index, enemy=None):
 
         # Most effects are handled by the card itself
         if effect.effect in (EffectType.BUFF, EffectType.KISS,
@@ -409,14 +809,16 @@ class RendezVousGame:
 
         # Switch values with the opposing card on the board
         elif effect.effect == EffectType.SWITCH:
+            if enemy is None:
+                enemy = matchups()[player][index]
             hold_value = self.board[player][index].value
-            effect.value = self.board[player-1][index].value
+            effect.value = self.board[enemy][index].value
             if (hold_value == SpecialValue.SPECIAL or
                 effect.value == SpecialValue.SPECIAL):
                 return
             self.board[player][index].apply(effect)
             effect.value = hold_value
-            self.board[player-1][index].apply(effect)
+            self.board[enemy][index].apply(effect)
 
         # Mark the card held for the next round
         elif effect.effect == EffectType.WAIT:
@@ -425,15 +827,15 @@ class RendezVousGame:
         # Randomize a new suit, value, or card
         elif effect.effect == EffectType.RANDOMIZE:
             if effect.value == TargetField.SUIT:
-                self.board[player][index].suit = random.choice(self.score.suits)
+                self.board[player][index].suit = self.rng.choice(self.score.suits)
             elif effect.value == TargetField.VALUE:
-                self.board[player][index].value = random.randint(1, 10)
+                self.board[player][index].value = self.rng.randint(1, 10)
             else:  #effect.value == TargetField.ALL:
-                if random.randint(1, 6) == 0:
-                    self.board[player][index] = self.deck.get_special()
+                if self.rng.randint(1, 6) == 0:
+                    self.board[player][index] = self.deck.get_special(rng=self.rng)
                     return
-                self.board[player][index].suit = random.choice(self.score.suits)
-                self.board[player][index].value = random.randint(1, 10)
+                self.board[player][index].suit = self.rng.choice(self.score.suits)
+                self.board[player][index].value = self.rng.randint(1, 10)
             
         else:
             raise InvalidSpecialEffectError()
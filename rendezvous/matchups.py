@@ -0,0 +1,63 @@
+"""Which player's card each card on the board is matched against.
+
+Each player's card in a slot is scored against exactly one opponent's card
+in the same slot, so scoring a board is always players * slots matches.
+With two players, each faces the other in every slot.  With more, the
+opponent rotates from slot to slot: in slot i each player faces the one
+(i % (players - 1)) + 1 places before them, so every player is faced by
+exactly one card in each slot.
+
+A player who faces the same opponent in every slot (as with two players)
+simply faces that opponent's side of the board.  Outside the board (in
+totals, suits won and the like) a player is measured against the best of
+the other players; see rival.
+
+"""
+
+from rendezvous import GameSettings
+
+_tables = {}
+_uniform = {}
+
+
+def matchups(players=None, slots=None):
+
+    """Return the table of opponents by [player][slot].
+
+    Tables are built once for each size and shared, so they must not be
+    changed.  The default size comes from GameSettings.
+
+    """
+
+    if players is None:
+        players = GameSettings.NUM_PLAYERS
+    if slots is None:
+        slots = GameSettings.CARDS_ON_BOARD
+    try:
+        return _tables[(players, slots)]
+    except KeyError:
+        rotation = max(players - 1, 1)
+        table = tuple(tuple((p - 1 - i % rotation) % players
+                            for i in range(slots))
+                      for p in range(players))
+        _tables[(players, slots)] = table
+        _uniform[(players, slots)] = tuple(row[0] if len(set(row)) == 1 else None
+                                for row in table)
+        return table
+
+
+def opposing(board, player, table=None):
+    """Return the cards the player's cards face, by slot (do not change)."""
+    if table is None:
+        table = matchups(len(board), len(board[player]))
+    opponent = _uniform[(len(table), len(table[player]))][player]
+    if opponent is not None:
+        return board[opponent]
+    return [board[opponent][i] for i, opponent in enumerate(table[player])]
+
+
+def rival(values, player):
+    """Return the best of the other players' values (their own, if alone)."""
+    player %= len(values)
+    others = values[:player] + values[player+1:]
+    return max(others) if others else values[player]
@@ -0,0 +1,160 @@
+"""Counters and timers reported by the game engine.
+
+The engine reports to a single Instrumentation hub, rendezvous.Metrics.
+Nothing is recorded until a subscriber is registered; until then each hook
+costs one attribute check, so the hooks stay in production builds.
+
+Events reported:
+  ai.analyze            -- time: ArtificialIntelligence.analyze
+  ai.candidates         -- count: possible plays generated
+  ai.evaluated          -- count: possible plays verified for play
+  hand.flush            -- count: hands flushed (incl. FLUSH specials)
+  hand.cant_play        -- count: hands declared unplayable
+  deck.shuffle          -- count: decks reshuffled
+  game.apply_specials   -- time: RendezVousGame._apply_specials
+  game.score_round      -- time: RendezVousGame.score_round
+  special.<EffectType>  -- count: special cards applied, by effect
+  achievements.check    -- time: AchievementList.check
+  achievements.check_round -- time: AchievementList.check_round
+  achievements.checked  -- count: individual Achievements checked
+  write.<file type>     -- count: persistence writes (achievements, decks,
+                           currency, powerups, progress, statistics)
+
+"""
+
+import time
+
+# time.perf_counter added in Python 3.3
+_timer = getattr(time, 'perf_counter', time.time)
+
+COUNT = 'count'
+TIME = 'time'
+
+
+class _NullTimer(object):
+
+    """Context manager that does nothing (when nobody is subscribed)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer(object):
+
+    """Context manager that reports its elapsed time on exit."""
+
+    def __init__(self, hub, name):
+        self.hub = hub
+        self.name = name
+
+    def __enter__(self):
+        self.start = _timer()
+        return self
+
+    def __exit__(self, *args):
+        self.hub.emit(TIME, self.name, _timer() - self.start)
+        return False
+
+
+class Instrumentation(object):
+
+    """Dispatch engine events to any registered subscribers.
+
+    Each subscriber is called as callback(kind, name, value), where kind is
+    COUNT (value is the increment) or TIME (value is seconds elapsed).
+
+    Attributes:
+      active  -- whether anyone is subscribed (check before doing extra work)
+
+    Methods:
+      subscribe   -- register a callback (or a MetricsSink)
+      unsubscribe -- remove a callback
+      count       -- report a counter increment
+      timer       -- return a context manager that reports elapsed time
+      emit        -- report an event of any kind
+
+    """
+
+    def __init__(self):
+        self._subscribers = []
+        self.active = False
+
+    def subscribe(self, callback):
+        """Register the callback for all future events; return it."""
+        self._subscribers.append(callback)
+        self.active = True
+        return callback
+
+    def unsubscribe(self, callback):
+        """Stop sending events to the callback."""
+        try:
+            self._subscribers.remove(callback)
+        except ValueError:
+            pass
+        self.active = bool(self._subscribers)
+
+    def emit(self, kind, name, value):
+        for callback in self._subscribers:
+            callback(kind, name, value)
+
+    def count(self, name, value=1):
+        """Report a counter increment."""
+        if self.active:
+            self.emit(COUNT, name, value)
+
+    def timer(self, name):
+        """Return a context manager that reports the time spent inside."""
+        if not self.active:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+
+class MetricsSink(object):
+
+    """Aggregate events into totals; subscribe with Metrics.subscribe(sink).
+
+    Attributes:
+      counts  -- {name : total}
+      timings -- {name : [calls, total seconds, max seconds]}
+
+    Methods:
+      reset   -- clear all totals
+      report  -- return a human-readable summary
+
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counts = {}
+        self.timings = {}
+
+    def __call__(self, kind, name, value):
+        if kind == COUNT:
+            self.counts[name] = self.counts.get(name, 0) + value
+        else:
+            try:
+                timing = self.timings[name]
+            except KeyError:
+                timing = self.timings[name] = [0, 0.0, 0.0]
+            timing[0] += 1
+            timing[1] += value
+            timing[2] = max(timing[2], value)
+
+    def report(self):
+        """Return all totals as a multi-line string (times in ms)."""
+        lines = []
+        for name in sorted(self.counts):
+            lines.append("%-28s %10d" % (name, self.counts[name]))
+        for name in sorted(self.timings):
+            calls, total, longest = self.timings[name]
+            lines.append("%-28s %10d calls  %10.3f ms avg  %10.3f ms max"
+                         % (name, calls, total * 1000 / calls, longest * 1000))
+        return "\n".join(lines)
@@ -0,0 +1,140 @@
+"""Choose the dealer's play on a worker thread before it is needed.
+
+The dealer's choice depends only on its hand, the board, the scores, and
+the state of its deck's random number generator.  A plan is made from
+private copies of all of these, so the worker never touches a Card the
+game (or its display) is using.  When the play is finally wanted, the
+plan is used only if the game still looks exactly as it did when the plan
+began; the hand's order and the generator are then brought to the same
+state AI_hard would have left them in, so a planned game plays out
+exactly like one chosen on the spot.
+
+Anything a plan cannot decide (such as being unable to play at all) is
+left to the usual Hand methods when the play is taken.
+
+"""
+
+import copy
+import random
+import threading
+
+from rendezvous import GameSettings
+from rendezvous.dealer import ArtificialIntelligence
+
+
+class _Plan(object):
+
+    """One speculative choice, made on its own thread."""
+
+    __slots__ = ('key', 'state', 'cards', 'thread', 'order', 'play',
+                 'rng')
+
+    def __init__(self, key, state, cards, board, player, rng):
+        self.key = key
+        self.state = state
+        self.cards = cards
+        self.rng = rng
+        self.order = self.play = None
+        self.thread = threading.Thread(target=self._choose,
+                                       args=(player, board))
+        self.thread.daemon = True
+
+    def _choose(self, player, board):
+        """Worker thread: run the AI over the copies."""
+        hand = list(self.cards)
+        try:
+            play = ArtificialIntelligence(player, hand, board, None,
+                                          self.rng).get_best_play()
+        except IndexError:  # no valid plays; the game must handle it
+            return
+        index = dict((id(card), i) for i, card in enumerate(self.cards))
+        self.order = [index[id(card)] for card in hand]
+        self.play = [index[id(card)] for card in play]
+
+
+class DealerPlanner(object):
+
+    """Speculatively choose a player's play in the background.
+
+    Attributes:
+      difficulty -- AI_DIFFICULTY to plan for (default: from GameSettings)
+
+    Methods:
+      plan   -- begin choosing a play for the game as it is now
+      ready  -- whether take would return at once for the game as it is
+      take   -- return the play for the game as it is now, using the plan
+                if it still applies
+      cancel -- forget any plan in progress
+
+    """
+
+    def __init__(self, difficulty=None):
+        self.difficulty = difficulty
+        self._plan = None
+
+    def _difficulty(self):
+        if self.difficulty is None:
+            return GameSettings.AI_DIFFICULTY
+        return self.difficulty
+
+    @staticmethod
+    def _key(player, hand, gameboard, score):
+        """Return everything the dealer's choice depends on (but the rng)."""
+        return (player, tuple(id(card) for card in hand.cards),
+                tuple(None if card is None else
+                      (id(card), card.suit, card.value)
+                      for side in gameboard.board for card in side),
+                tuple(tuple(row) for row in score.scores))
+
+    def plan(self, player, hand, gameboard, score):
+        """Begin choosing a play, unless one is underway for these inputs.
+
+        Call from the thread that owns the game; the worker is given
+        copies of everything it needs.
+
+        """
+        if self._difficulty() == 1:
+            return  # AI_easy needs no head start
+        key = self._key(player, hand, gameboard, score)
+        state = hand.deck.rng.getstate()
+        if (self._plan is not None and self._plan.key == key and
+            self._plan.state == state):
+            return
+        rng = random.Random()
+        rng.setstate(state)
+        board = [[None if card is None else copy.copy(card) for card in side]
+                 for side in gameboard.board]
+        self._plan = _Plan(key, state, [copy.copy(card) for card in hand],
+                           board, player, rng)
+        self._plan.thread.start()
+
+    def ready(self, player, hand, gameboard, score):
+        """Return whether take can answer without choosing on the spot."""
+        if self._difficulty() == 1:
+            return True
+        plan = self._plan
+        return (plan is not None and
+                plan.key == self._key(player, hand, gameboard, score) and
+                plan.state == hand.deck.rng.getstate() and
+                not plan.thread.is_alive())
+
+    def take(self, player, hand, gameboard, score):
+        """Return the cards to play, choosing them now if not planned."""
+        plan, self._plan = self._plan, None
+        if self._difficulty() == 1:
+            return hand.AI_easy(player, gameboard, score)
+        rng = hand.deck.rng
+        if (plan is not None and
+            plan.key == self._key(player, hand, gameboard, score) and
+            plan.state == rng.getstate()):
+            plan.thread.join()
+            if plan.play is not None:
+                cards = list(hand.cards)
+                hand.cards[:] = [cards[i] for i in plan.order]
+                rng.setstate(plan.rng.getstate())
+                return [cards[i] for i in plan.play]
+        return hand.AI_hard(player, gameboard, score)
+
+    def cancel(self):
+        """Forget any plan (the worker finishes, but is ignored)."""
+        self._plan = None
@@ -1,7 +1,7 @@
 import os
 import copy
 
-from rendezvous import PowerupType, FileReader
+from rendezvous import PowerupType, FileReader, Metrics, Storage
 
 
 class Powerup:
@@ -75,7 +75,8 @@ class Powerups:
                          0, PowerupType.PLAY_CARD)
                  ]
 
-    def __init__(self, player_file=None):
+    def __init__(self, player_file=None, storage=None):
+        self.storage = storage or Storage
         self.image_file = os.path.join("data", "Powerups.png")
         if player_file is None:
             self._purchased_file = os.path.join("player", "powerups.txt")
@@ -126,11 +127,10 @@ class Powerups:
     def _read_purchased(self):
         """Read the saved list of purchased powerups."""
         self.purchased = {}
-        if not os.path.isfile(self._purchased_file):
-            try: os.mkdir(os.path.dirname(self._purchased_file))
-            except OSError: pass
+        if not self.storage.exists(self._purchased_file):
+            self.storage.makedirs(os.path.dirname(self._purchased_file))
             return
-        for (tag, value) in FileReader(self._purchased_file):
+        for (tag, value) in FileReader(self._purchased_file, self.storage):
             if tag == 'CARDS_TO_PLAY':
                 self.purchased['cards_to_play'] = value.split(', ')
                 continue
@@ -176,7 +176,8 @@ class Powerups:
 
     def _write(self):
         """Output the list of purchased powerups."""
-        f = open(self._purchased_file, 'w')
+        Metrics.count('write.powerups')
+        f = self.storage.open(self._purchased_file, 'w')
         for powerup, count in self.purchased.items():
             if powerup != 'cards_to_play':
                 f.write('[%s]%s\n' % (powerup.name, count))
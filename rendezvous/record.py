@@ -0,0 +1,272 @@
+"""Record each round of a game in a compact binary file, and replay it.
+
+Game Record Format:  *.rvr
+
+  The file begins with a fixed-size header, followed by one fixed-width
+  record per round (little-endian throughout).  Because every record has
+  the same size, any round can be read by seeking straight to it.
+
+  Header:
+    magic    -- 4 bytes, b'RVGR'
+    version  -- unsigned byte
+    seeded   -- boolean byte; whether the seed below is meaningful (the
+                game app records unseeded games, see GameRecorder)
+    seed     -- unsigned 64-bit integer
+    deck     -- 32 bytes, the deck's base filename (UTF-8, NUL-padded)
+    players  -- unsigned byte, number of players
+    slots    -- unsigned byte, cards on the board per player
+    suits    -- unsigned byte, number of suits in the deck
+    first    -- unsigned short, the first round recorded (normally 1)
+
+  Round record:
+    round    -- unsigned short, the round number
+    then for each player, for each board slot:
+      card    -- unsigned short, index into DeckDefinition.cards(), or EMPTY
+      suit    -- signed byte, final suit index (-1 for a SpecialCard)
+      value   -- signed int, final value after specials
+      wait    -- boolean byte; whether the card is held to the next round
+      applied -- unsigned byte for each player, number of that player's
+                 cards this special applied to (its applied_to)
+    then for each player, for each suit:
+      score   -- signed int, the score after this round
+
+  Score deltas are recovered by comparing consecutive records.
+
+"""
+
+import struct
+
+from rendezvous import InvalidRecordError, SpecialSuit
+from rendezvous.deck import Card, DeckDefinition
+from rendezvous.gameplay import Gameboard, Scoreboard
+
+
+MAGIC = b'RVGR'
+VERSION = 2
+EMPTY = 0xFFFF
+HEADER = struct.Struct('<4sB?Q32sBBBH')
+SLOT = 'HbiB'  # followed by the applied counts, one per player
+
+
+def _card_ids(definition):
+    """Return {key : index} for every card the deck could put in play."""
+    ids = {}
+    for i, card in enumerate(definition.cards(use_blocks=False)):
+        ids[_card_key(card)] = i
+    return ids
+
+
+def _card_key(card):
+    if card.suit == SpecialSuit.SPECIAL:
+        return card.name
+    return card.original
+
+
+def _record_struct(players, slots, suits):
+    return struct.Struct('<H' + (SLOT + 'B' * players) * (players * slots) +
+                         'i' * (players * suits))
+
+
+class GameRecorder(object):
+
+    """Write a game record incrementally, one round at a time.
+
+    Attach to a RendezVousGame as game.recorder; the game calls start() from
+    new_game() and record_round() from next_round().  Each round is written
+    to its own slot in the file, so a replayed round overwrites itself.
+    Loading a new deck mid-game starts a new record from the current round.
+
+    The game app records without a seed: its games are decided by the
+    player's choices as much as by the rng, and a resumed game's rng
+    does not follow from any seed, so its records are always unseeded.
+
+    Attributes:
+      filename -- the file being written
+      seed     -- the seed used for the game's rng (or None if unknown)
+
+    Methods:
+      start        -- write the header for a new game
+      record_round -- write the current round's board and scores
+
+    """
+
+    def __init__(self, filename, seed=None):
+        self.filename = filename
+        self.seed = seed
+        self._record = None
+
+    def start(self, game):
+        """Begin a new record (overwriting any previous one)."""
+        self._deck = game.deck
+        self._first = game.round
+        self._ids = _card_ids(game.deck)
+        self._suits = list(game.score.suits)
+        players, slots = len(game.board.board), len(game.board.board[0])
+        self._players = players
+        self._record = _record_struct(players, slots, len(self._suits))
+        header = HEADER.pack(MAGIC, VERSION, self.seed is not None,
+                             self.seed or 0,
+                             game.deck.base_filename.encode('utf-8'),
+                             players, slots, len(self._suits), self._first)
+        with open(self.filename, 'wb') as f:
+            f.write(header)
+
+    def record_round(self, game):
+        """Write the current round (call before the board is cleared)."""
+        if self._record is None or game.deck is not self._deck:
+            self.start(game)
+        fields = [game.round]
+        for p, side in enumerate(game.board.board):
+            for c, card in enumerate(side):
+                fields.extend(self._pack_card(card, game.board._wait[p][c]))
+        for player in game.score.scores:
+            fields.extend(player)
+        offset = HEADER.size + (game.round - self._first) * self._record.size
+        with open(self.filename, 'r+b') as f:
+            f.seek(offset)
+            f.write(self._record.pack(*fields))
+            f.truncate()
+
+    def _pack_card(self, card, wait):
+        none = (0,) * self._players
+        if card is None:
+            return (EMPTY, -1, 0, False) + none
+        if card.suit == SpecialSuit.SPECIAL:
+            applied = tuple(getattr(card, 'applied_to', none))
+            return (self._ids.get(card.name, EMPTY), -1, 0, wait) + applied
+        return (self._ids.get(card.original, EMPTY),
+                self._suits.index(card.suit), int(card.value), wait) + none
+
+
+class RoundRecord(object):
+
+    """The unpacked record of a single round.
+
+    Attributes:
+      round  -- the round number
+      cards  -- (card, suit, value, wait, applied...) by [player][slot],
+                with an applied count for each player
+      scores -- the scores after this round by [player][suit]
+
+    """
+
+    def __init__(self, round_number, cards, scores):
+        self.round = round_number
+        self.cards = cards
+        self.scores = scores
+
+
+class GameReplayer(object):
+
+    """Read a game record and rebuild the state of any round.
+
+    Attributes:
+      seed       -- the seed used for the game's rng (or None if unknown)
+      deck       -- the deck's base filename
+      definition -- the DeckDefinition used to rebuild cards
+      players    -- number of players
+      slots      -- cards on the board per player
+      first      -- the first round recorded
+
+    Methods:
+      read       -- return the RoundRecord for the given round
+      gameboard  -- return the Gameboard as it stood at the end of a round
+      scoreboard -- return the Scoreboard as it stood at the end of a round
+      deltas     -- return the change in score during a round
+
+    """
+
+    def __init__(self, filename, definition=None):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            header = f.read(HEADER.size)
+        try:
+            (magic, version, seeded, seed, deck, self.players, self.slots,
+             suits, self.first) = HEADER.unpack(header)
+        except struct.error:
+            raise InvalidRecordError("truncated header in %s" % filename)
+        if magic != MAGIC or version != VERSION:
+            raise InvalidRecordError("%s is not a game record" % filename)
+        self.seed = seed if seeded else None
+        self.deck = deck.rstrip(b'\0').decode('utf-8')
+        if definition is None:
+            definition = DeckDefinition(self.deck)
+        self.definition = definition
+        self._cards = list(definition.cards(use_blocks=False))
+        self._suits = suits
+        self._record = _record_struct(self.players, self.slots, suits)
+
+    def __len__(self):
+        """Return the last round recorded (0 if none)."""
+        with open(self.filename, 'rb') as f:
+            f.seek(0, 2)
+            count = (f.tell() - HEADER.size) // self._record.size
+        return self.first - 1 + count if count else 0
+
+    def read(self, round_number):
+        """Seek to and unpack the given round (numbered from 1)."""
+        if round_number < self.first:
+            raise IndexError("round %s not recorded" % round_number)
+        with open(self.filename, 'rb') as f:
+            f.seek(HEADER.size +
+                   (round_number - self.first) * self._record.size)
+            data = f.read(self._record.size)
+        if not data:
+            raise IndexError("round %s not recorded" % round_number)
+        try:
+            fields = self._record.unpack(data)
+        except struct.error:
+            raise InvalidRecordError("truncated round %s in %s"
+                                     % (round_number, self.filename))
+        cards = []
+        i = 1
+        width = len(SLOT) + self.players
+        for p in range(self.players):
+            cards.append([fields[i + width * c : i + width * (c + 1)]
+                          for c in range(self.slots)])
+            i += width * self.slots
+        scores = [list(fields[i + s * self._suits : i + (s + 1) * self._suits])
+                  for s in range(self.players)]
+        return RoundRecord(fields[0], cards, scores)
+
+    def gameboard(self, round_number):
+        """Rebuild the Gameboard at the end of the given round."""
+        record = self.read(round_number)
+        board = Gameboard()
+        board.board = [[self._rebuild(slot) for slot in side]
+                       for side in record.cards]
+        board._wait = [[bool(slot[3]) for slot in side]
+                       for side in record.cards]
+        return board
+
+    def scoreboard(self, round_number):
+        """Rebuild the Scoreboard at the end of the given round."""
+        score = Scoreboard(self.definition)
+        score.scores = self.read(round_number).scores
+        return score
+
+    def deltas(self, round_number):
+        """Return the change in each score by [player][suit] this round.
+
+        The first round recorded is compared against zero scores.
+
+        """
+        after = self.read(round_number).scores
+        if round_number == self.first:
+            return after
+        before = self.read(round_number - 1).scores
+        return [[a - b for a, b in zip(*pair)] for pair in zip(after, before)]
+
+    def _rebuild(self, slot):
+        card_id, suit, value, wait = slot[:len(SLOT)]
+        if card_id == EMPTY:
+            return None
+        original = self._cards[card_id]
+        if original.suit == SpecialSuit.SPECIAL:
+            special = self.definition.get_special(original.name)
+            special.applied_to = list(slot[len(SLOT):])
+            return special
+        card = Card(*original.original)
+        card.suit = self.definition.suits[suit]
+        card.value = value
+        return card
@@ -0,0 +1,311 @@
+"""Save a game in progress in a small binary file, to resume it later.
+
+The whole game is packed into one flat record of integers (cards by their
+index into the deck definition), so saving and loading each take one
+struct call rather than walking an object graph as pickle would.
+
+A game is saved in one of two states.  While the player is choosing a
+play, the turn is saved as it stood before any cards were played: cards
+played this turn are returned to their hands (and sleeve cards to the
+sleeve list, to go back to the powerup tray), leaving only the cards held
+on the board.  Once a round is scored, the board is saved as it stands,
+specials applied, until the next round begins.
+
+Saved Game Format:  *.rvs
+
+  All little-endian.  The header is followed by the counts of each
+  variable-length section, then the sections themselves.  The file is
+  written in full to a temporary file first and then moved into place, so
+  a crash while saving leaves the previous save intact.
+
+  Header:
+    magic    -- 4 bytes, b'RVSG'
+    version  -- unsigned byte
+    scored   -- boolean byte; whether the round has been scored
+    length   -- unsigned byte, length of the deck name
+    deck     -- the deck's base filename (UTF-8, length bytes)
+    players  -- unsigned byte, number of players
+    slots    -- unsigned byte, cards on the board per player
+    suits    -- unsigned byte, number of suits in the deck
+    round    -- unsigned short, the round number
+
+  Counts:
+    for each player:
+      deck   -- unsigned short, cards left to draw in the player's deck
+      hand   -- unsigned byte, cards in the player's hand
+    powerups -- unsigned byte, powerups in use this round
+    sleeve   -- unsigned byte, sleeve cards to return to the tray
+
+  Sections (cards are unsigned short indices into
+  DeckDefinition.cards(use_blocks=False), as in a game record):
+    for each player: the cards left in the deck, in the order drawn,
+                     then the cards in hand
+    for each player, for each board slot:
+      card    -- unsigned short, card index or EMPTY
+      flags   -- unsigned byte; 1 if held, 2 if played from the sleeve,
+                 4 if the special has applied_to counts
+      suit    -- signed byte, suit index after specials (-1 if none)
+      value   -- signed int, value after specials
+      applied -- unsigned byte for each player, the special's applied_to
+    for each player, for each suit:
+      score   -- signed int
+    for each powerup in use:
+      powerup -- unsigned byte, index into Powerups.available
+      value   -- signed int, the powerup's value
+    for each sleeve card: card index
+
+"""
+
+import os
+import copy
+import struct
+
+from rendezvous import InvalidRecordError, SpecialSuit, PowerupType
+from rendezvous.powerups import Powerups
+from rendezvous.record import EMPTY, _card_ids, _card_key
+
+
+MAGIC = b'RVSG'
+VERSION = 2
+HEADER = struct.Struct('<4sB?B')
+SIZES = struct.Struct('<BBBH')
+SLOT = 'HBbi'
+
+HELD = 1
+SLEEVE = 2
+APPLIED = 4
+
+# os.replace added in Python 3.3
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _counts_format(players):
+    return '<' + 'HB' * players + 'BB'
+
+
+def _body_format(players, slots, suits, decks, hands, powerups, sleeve):
+    return '<' + ''.join('H' * (deck + hand)
+                         for deck, hand in zip(decks, hands)) + \
+           (SLOT + 'B' * players) * (players * slots) + \
+           'i' * (players * suits) + 'Bi' * powerups + 'H' * sleeve
+
+
+def _played(card, hand):
+    """Return whether the card was played from the given hand."""
+    for other in hand.cards:
+        if other is card:
+            return False
+    return True
+
+
+def save_game(filename, game, powerups=(), scored=False):
+
+    """Save the game in progress to the file.
+
+    Arguments:
+      filename -- the file to write
+      game     -- the RendezVousGame
+      powerups -- the Powerups in use this round
+      scored   -- whether the round has been scored (else the turn is
+                  saved from before any cards were played)
+
+    """
+
+    deck_name = game.deck.base_filename.encode('utf-8')
+    if len(deck_name) > 255:
+        raise ValueError("deck name too long to save: %s"
+                         % game.deck.base_filename)
+    ids = _card_ids(game.deck)
+    suits = list(game.score.suits)
+    players, slots = len(game.board.board), len(game.board.board[0])
+    hands = [list(hand.cards) for hand in game.players]
+    board = [list(side) for side in game.board.board]
+    sleeve = []
+    if not scored:
+        for p, side in enumerate(board):
+            for c, card in enumerate(side):
+                if card is None or game.board._wait[p][c]:
+                    continue
+                side[c] = None
+                if hasattr(card, 'from_powerup'):
+                    sleeve.append(card)
+                elif _played(card, game.players[p]):
+                    hands[p].append(card)
+
+    decks = []
+    for hand in game.players:
+        cards, position = hand.deck.snapshot()
+        decks.append(cards[position:])
+    counts = []
+    for deck, hand in zip(decks, hands):
+        counts.extend((len(deck), len(hand)))
+    counts.extend((len(powerups), len(sleeve)))
+
+    fields = []
+    for deck, hand in zip(decks, hands):
+        fields.extend(ids[_card_key(card)] for card in deck)
+        fields.extend(ids[_card_key(card)] for card in hand)
+    for p, side in enumerate(board):
+        for c, card in enumerate(side):
+            fields.extend(_pack_card(card, game.board._wait[p][c], ids,
+                                     suits, players))
+    for player in game.score.scores:
+        fields.extend(player)
+    for powerup in powerups:
+        value = powerup.value
+        fields.extend((Powerups.available.index(powerup),
+                       value if isinstance(value, int) else 0))
+    fields.extend(ids[_card_key(card)] for card in sleeve)
+
+    header = (HEADER.pack(MAGIC, VERSION, scored, len(deck_name)) +
+              deck_name + SIZES.pack(players, slots, len(suits), game.round))
+    body = struct.pack(_body_format(players, slots, len(suits), counts[0:-2:2],
+                                    counts[1:-2:2], len(powerups),
+                                    len(sleeve)), *fields)
+    temp = filename + '.tmp'
+    try:
+        with open(temp, 'wb') as f:
+            f.write(header + struct.pack(_counts_format(players), *counts) +
+                    body)
+            f.flush()
+            os.fsync(f.fileno())
+        _replace(temp, filename)
+    except EnvironmentError:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
+
+
+def _pack_card(card, wait, ids, suits, players):
+    """Return the fields for one board slot."""
+    if card is None:
+        return (EMPTY, 0, -1, 0) + (0,) * players
+    flags = HELD if wait else 0
+    if hasattr(card, 'from_powerup'):
+        flags |= SLEEVE
+    applied = getattr(card, 'applied_to', None)
+    if applied is not None:
+        flags |= APPLIED
+    else:
+        applied = (0,) * players
+    if card.suit == SpecialSuit.SPECIAL:
+        return (ids[card.name], flags, -1, 0) + tuple(applied)
+    return ((ids[card.original], flags, suits.index(card.suit),
+             int(card.value)) + tuple(applied))
+
+
+class SavedGame(object):
+
+    """A game in progress, read from a saved game file.
+
+    Attributes:
+      deck     -- the deck's base filename
+      round    -- the round number
+      scored   -- whether the round had been scored
+
+    Methods:
+      restore  -- return a RendezVousGame to the saved state
+
+    """
+
+    def __init__(self, filename):
+        with open(filename, 'rb') as f:
+            data = f.read()
+        try:
+            magic, version, self.scored, length = HEADER.unpack_from(data)
+            if magic != MAGIC or version != VERSION:
+                raise InvalidRecordError("%s is not a saved game" % filename)
+            start = HEADER.size + length
+            deck = data[HEADER.size:start]
+            (self._players, self._slots, self._suits,
+             self.round) = SIZES.unpack_from(data, start)
+        except struct.error:
+            raise InvalidRecordError("truncated header in %s" % filename)
+        try:
+            self.deck = deck.decode('utf-8')
+        except UnicodeDecodeError:
+            raise InvalidRecordError("bad deck name in %s" % filename)
+        start += SIZES.size
+        counts_format = _counts_format(self._players)
+        try:
+            counts = struct.unpack_from(counts_format, data, start)
+            self._decks, self._hands = counts[0:-2:2], counts[1:-2:2]
+            self._powerups, self._sleeve = counts[-2:]
+            self._fields = struct.unpack(
+                _body_format(self._players, self._slots, self._suits,
+                             self._decks, self._hands, self._powerups,
+                             self._sleeve),
+                data[start + struct.calcsize(counts_format):])
+        except struct.error:
+            raise InvalidRecordError("truncated saved game in %s" % filename)
+
+    def restore(self, game):
+
+        """Return the game to the saved state.
+
+        The game must already be playing the saved deck.  Return
+        (Powerups in use, sleeve Cards to return to the powerup tray).
+
+        """
+
+        if game.deck.base_filename != self.deck:
+            raise InvalidRecordError("saved game uses the %s deck" % self.deck)
+        cards = list(game.deck.cards(use_blocks=False))
+        suits = list(game.score.suits)
+        fields = iter(self._fields)
+
+        def card(card_id):
+            return copy.copy(cards[card_id])
+
+        for hand, deck, held in zip(game.players, self._decks, self._hands):
+            hand.deck.restore(([card(next(fields)) for i in range(deck)], 0))
+            hand.analysis.discard(hand.cards)
+            hand.cards = []
+            hand.extend([card(next(fields)) for i in range(held)])
+
+        game.board.board = [[None] * self._slots
+                            for p in range(self._players)]
+        game.board._wait = [[False] * self._slots
+                            for p in range(self._players)]
+        for p in range(self._players):
+            for c in range(self._slots):
+                slot = [next(fields) for i in range(len(SLOT) + self._players)]
+                game.board.board[p][c] = self._unpack_card(card, suits, slot)
+                game.board._wait[p][c] = bool(slot[1] & HELD)
+
+        game.score.scores = [[next(fields) for s in range(self._suits)]
+                             for p in range(self._players)]
+        game.round = self.round
+
+        powerups = []
+        for i in range(self._powerups):
+            powerup = copy.deepcopy(Powerups.available[next(fields)])
+            powerup.value = next(fields)
+            powerups.append(powerup)
+        sleeve = [self._sleeve_card(card(next(fields)))
+                  for i in range(self._sleeve)]
+        return powerups, sleeve
+
+    def _unpack_card(self, card, suits, slot):
+        card_id, flags, suit, value = slot[:4]
+        if card_id == EMPTY:
+            return None
+        rebuilt = card(card_id)
+        if flags & SLEEVE:
+            self._sleeve_card(rebuilt)
+        if flags & APPLIED:
+            rebuilt.applied_to = list(slot[4:])
+        if (rebuilt.suit != SpecialSuit.SPECIAL and
+            (suits[suit], value) != rebuilt.original):
+            rebuilt._push(suits[suit], value)
+        return rebuilt
+
+    @staticmethod
+    def _sleeve_card(card):
+        """Mark the card as played from the sleeve (see Up Your Sleeve)."""
+        for powerup in Powerups.available:
+            if powerup.type == PowerupType.PLAY_CARD:
+                card.from_powerup = powerup.name
+        return card
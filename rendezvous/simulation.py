@@ -0,0 +1,286 @@
+"""Simulate many headless games to measure each SpecialCard's contribution.
+
+For every round of every game, each special on the board is scored twice:
+once as played, and once with that special skipped (from a snapshot of the
+same state and rng).  The difference in the owner's lead over the round is
+that special's swing.  Games are independent, so they are spread across
+processes and their SpecialStats are merged as each batch finishes.
+
+Run from the command line:
+
+    python -m rendezvous.simulation [deck] [-g GAMES] [-j PROCESSES]
+
+"""
+
+import random
+import argparse
+
+from rendezvous import GameSettings, SpecialSuit, EffectType
+from rendezvous.deck import DeckDefinition
+from rendezvous.dealer import ArtificialIntelligence
+from rendezvous.gameplay import RendezVousGame
+from rendezvous.matchups import rival
+
+
+class SpecialStats(object):
+
+    """Totals for each SpecialCard across many simulated games.
+
+    Attributes:
+      games    -- number of player-games simulated
+      wins     -- number of those player-games won
+      specials -- {special name : {field : total}}, with fields:
+          in_hand   -- decisions made with this special in hand
+          playable  -- ... where the AI found a valid play including it
+          chosen    -- ... where the AI chose to play it
+          applied   -- rounds it was resolved on the board (incl. holds)
+          misfires  -- ... where it applied to no cards (the DUNCE case)
+          swing     -- total change in the owner's lead it caused
+          games     -- player-games in which it was played
+          wins      -- ... which were won
+
+    Methods:
+      merge   -- add another SpecialStats into this one
+      summary -- return derived rates for each special
+      report  -- return a human-readable table
+
+    """
+
+    FIELDS = ('in_hand', 'playable', 'chosen', 'applied', 'misfires',
+              'swing', 'games', 'wins')
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.specials = {}
+
+    def __getitem__(self, name):
+        try:
+            return self.specials[name]
+        except KeyError:
+            totals = self.specials[name] = dict((f, 0) for f in self.FIELDS)
+            return totals
+
+    def merge(self, other):
+        """Add the totals from other into this."""
+        self.games += other.games
+        self.wins += other.wins
+        for name, totals in other.specials.items():
+            mine = self[name]
+            for field in self.FIELDS:
+                mine[field] += totals[field]
+        return self
+
+    def summary(self):
+        """Return {name : {rate : value}} of per-special rates.
+
+        Rates:
+          playable -- fraction of decisions in hand where it was playable
+          chosen   -- fraction of decisions in hand where it was played
+          misfire  -- fraction of resolutions that applied to no cards
+          swing    -- average change in the owner's lead per resolution
+          lift     -- win rate when played minus win rate when not played
+
+        """
+        def rate(a, b):
+            return float(a) / b if b else None
+
+        result = {}
+        for name, t in self.specials.items():
+            without = rate(self.wins - t['wins'], self.games - t['games'])
+            with_ = rate(t['wins'], t['games'])
+            result[name] = {
+                'playable' : rate(t['playable'], t['in_hand']),
+                'chosen' : rate(t['chosen'], t['in_hand']),
+                'misfire' : rate(t['misfires'], t['applied']),
+                'swing' : rate(t['swing'], t['applied']),
+                'lift' : (with_ - without
+                          if None not in (with_, without) else None)}
+        return result
+
+    def report(self):
+        """Return a table of each special's rates, by descending lift."""
+        def show(value, percent=True):
+            if value is None:
+                return "%8s" % "-"
+            if percent:
+                return "%7.1f%%" % (value * 100)
+            return "%8.1f" % value
+
+        summary = self.summary()
+        lines = ["%d player-games, %.1f%% won" %
+                 (self.games, 100.0 * self.wins / self.games if self.games
+                  else 0),
+                 "%-28s %8s %8s %8s %8s %8s" % ("Special", "Playable",
+                                                "Chosen", "Misfire",
+                                                "Swing", "Lift")]
+        order = sorted(summary, key=lambda n: summary[n]['lift'] or 0,
+                       reverse=True)
+        for name in order:
+            s = summary[name]
+            lines.append("%-28s %s %s %s %s %s" % (
+                name, show(s['playable']), show(s['chosen']),
+                show(s['misfire']), show(s['swing'], False), show(s['lift'])))
+        return "\n".join(lines)
+
+
+def _lead(scores, player):
+    """Return the player's total lead over the best other player."""
+    totals = [sum(row) for row in scores]
+    return totals[player] - rival(totals, player)
+
+
+def _score_without(game, skip):
+    """Score the round as score_round does, but skip one special."""
+    game.board.clear_wait()
+    plan = game.plan_specials()
+    for i in range(plan.slots):
+        for p in range(plan.players):
+            if (p, i) != skip and game.board[p][i].suit == SpecialSuit.SPECIAL:
+                game._apply(p, i, plan)
+    game.score.score(game.board)
+
+
+def _choose(game, player, stats):
+    """Choose the player's play (as Hand.AI_hard does), noting specials."""
+    hand = game.players[player]
+    ai = ArtificialIntelligence(player, hand, game.board, game.score, game.rng)
+    if ai.possible_plays:
+        play = ai.get_best_play()
+    else:
+        play = hand._any_play(player, game.board, game.score)
+    for card in hand:
+        if card.suit != SpecialSuit.SPECIAL:
+            continue
+        totals = stats[card.name]
+        totals['in_hand'] += 1
+        for possible in ai.possible_plays:
+            if card in possible.cards and possible.verify():
+                totals['playable'] += 1
+                break
+        if card in play:
+            totals['chosen'] += 1
+    return play
+
+
+def _score_round(game, stats, played):
+    """Score the round, attributing the swing to each special."""
+    specials = [(p, i) for i in range(GameSettings.CARDS_ON_BOARD)
+                for p in range(GameSettings.NUM_PLAYERS)
+                if game.board[p][i].suit == SpecialSuit.SPECIAL]
+    if not specials:
+        game.score_round()
+        return
+    snapshot = game.snapshot()
+    state = game.rng.getstate()
+    before = [list(player) for player in game.score.scores]
+    leads = {}
+    for p, i in specials:
+        _score_without(game, (p, i))
+        leads[(p, i)] = _lead(game.score.scores, p) - _lead(before, p)
+        game.restore(snapshot)
+        game.rng.setstate(state)
+    game.score_round()
+    for p, i in specials:
+        special = game.board[p][i]
+        totals = stats[special.name]
+        totals['applied'] += 1
+        totals['swing'] += (_lead(game.score.scores, p) - _lead(before, p) -
+                            leads[(p, i)])
+        if (special.effect.effect != EffectType.FLUSH and
+            not sum(special.applied_to)):
+            totals['misfires'] += 1
+        played[p].add(special.name)
+
+
+def simulate_game(definition, seed, stats=None):
+    """Play one seeded game between two hard AIs; return its SpecialStats."""
+    if stats is None:
+        stats = SpecialStats()
+    game = RendezVousGame(deck=definition, rng=random.Random(seed))
+    game.new_game()
+    played = [set() for p in range(GameSettings.NUM_PLAYERS)]
+    while True:
+        for p in range(GameSettings.NUM_PLAYERS):
+            play = _choose(game, p, stats)
+            for card in play:
+                game.players[p].remove(card)
+            game.board.play_cards(p, play)
+        _score_round(game, stats, played)
+        if game.next_round():
+            break
+    for p in range(GameSettings.NUM_PLAYERS):
+        won = (game.score.win_count(p) >
+               game.score.win_count(game.score.opponent(p)))
+        stats.games += 1
+        stats.wins += won
+        for name in played[p]:
+            stats[name]['games'] += 1
+            stats[name]['wins'] += won
+    return stats
+
+
+def _simulate_batch(args):
+    """Worker: simulate games for each seed; return the merged totals."""
+    deck, seeds = args
+    definition = DeckDefinition(deck)
+    stats = SpecialStats()
+    for seed in seeds:
+        simulate_game(definition, seed, stats)
+    return stats
+
+
+def simulate(deck="Standard", games=1000, processes=None, seed=0,
+             batch=50, callback=None):
+
+    """Simulate games across processes; return the merged SpecialStats.
+
+    Arguments:
+      deck      -- base filename of the deck to simulate
+      games     -- number of games to play
+      processes -- worker processes (default: one per core; 1 for none)
+      seed      -- first seed; game n uses seed + n, so results are
+                   identical however the work is split
+      batch     -- games per task sent to a worker
+      callback  -- optional callback(stats) after each batch is merged
+
+    """
+
+    tasks = [(deck, range(start, min(start + batch, seed + games)))
+             for start in range(seed, seed + games, batch)]
+    stats = SpecialStats()
+    if processes == 1:
+        results = map(_simulate_batch, tasks)
+        pool = None
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(processes)
+        results = pool.imap_unordered(_simulate_batch, tasks)
+    try:
+        for result in results:
+            stats.merge(result)
+            if callback is not None:
+                callback(stats)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Measure each special card's contribution to winning.")
+    parser.add_argument('deck', nargs='?', default="Standard",
+                        help="base filename of the deck (default: Standard)")
+    parser.add_argument('-g', '--games', type=int, default=1000)
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    stats = simulate(args.deck, args.games, args.processes, args.seed)
+    print(stats.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,7 @@
 import os
 import re
 
-from rendezvous import SpecialValue
+from rendezvous import SpecialValue, Metrics, Storage
 
 class BaseStats(object):  # required for properties in v2.7
 
@@ -110,13 +110,15 @@ class Statistics:
       base   -- BaseStats for games played/won/etc in general
       decks  -- { 'base_filename' : BaseStats for that deck }
       suits  -- { 'name' : BaseStats for that suit }
+      storage -- where the file is saved (default: rendezvous.Storage)
       
     Methods:
       record_game -- note the end of a game
       
     """
     
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, storage=None):
+        self.storage = storage or Storage
         self.base = BaseStats()
         self.decks = {}
         self.suits = {}
@@ -124,26 +126,26 @@ class Statistics:
     
     def record_game(self, deck_base, score, player_index):
         """Note the end of a game."""
-        self.base.record(len(score.wins(player_index)),
-                         len(score.wins(player_index-1)))
+        wins = score.win_count(player_index)
+        losses = score.win_count(score.opponent(player_index))
+        self.base.record(wins, losses)
         if deck_base not in self.decks:
             self.decks[deck_base] = BaseStats()
-        self.decks[deck_base].record(len(score.wins(player_index)),
-                                     len(score.wins(player_index-1)))
+        self.decks[deck_base].record(wins, losses)
         for i, suit in enumerate(score.suits):
             if suit not in self.suits:
                 self.suits[suit] = BaseStats()
             self.suits[suit].record(score.scores[player_index][i],
-                                    score.scores[player_index-1][i])
+                                    score.rival(player_index, i))
         self._save()
         
     def _load(self, filename):
         if filename is None:
             filename = os.path.join("player", "stats.txt")
         self.filename = filename
-        if not os.path.isfile(filename):
+        if not self.storage.exists(filename):
             return
-        f = open(filename, 'r')
+        f = self.storage.open(filename, 'r')
         try:
             self.base = BaseStats(f.readline().strip())
             for line in f.readlines():
@@ -157,7 +159,8 @@ class Statistics:
             f.close()
             
     def _save(self):
-        f = open(self.filename, 'w')
+        Metrics.count('write.statistics')
+        f = self.storage.open(self.filename, 'w')
         try:
             f.write("%s\n" % self.base)
             for deck, stats in self.decks.items():
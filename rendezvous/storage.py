@@ -0,0 +1,146 @@
+"""Where the game's files are read from and saved to.
+
+Every class that loads data files or saves player files (Currency,
+Statistics, Powerups, AchievementList, DeckCatalog and the backgrounds
+screen) goes through a storage backend, rendezvous.Storage by default:
+
+  FileStorage   -- the real filesystem (the default)
+  MemoryStorage -- files held in a dict, so headless work (simulation,
+                   tests, benchmarks) never touches the disk
+
+Each backend opens files much as the builtin open does (in 'r', 'w' or
+'a' text mode), and answers whether a file exists, which files are in a
+directory, and (for FileReader's cache) whether a file has changed.
+
+"""
+
+import os
+import io
+
+
+class FileStorage(object):
+
+    """Files kept on disk.
+
+    Methods:
+      open     -- open a file, as the builtin open
+      exists   -- return whether the file exists
+      makedirs -- create a directory (and its parents) if not there yet
+      walk     -- yield (dirpath, dirnames, filenames), as os.walk
+      stamp    -- return the file's (modification time, size), or None
+
+    """
+
+    def open(self, filename, mode='r'):
+        return open(filename, mode)
+
+    def exists(self, filename):
+        return os.path.isfile(filename)
+
+    def makedirs(self, directory):
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def walk(self, directory):
+        return os.walk(directory)
+
+    def stamp(self, filename):
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return (stat.st_mtime, stat.st_size)
+
+
+class _MemoryFile(io.StringIO):
+
+    """A file opened for writing in a MemoryStorage, saved when closed."""
+
+    def __init__(self, storage, filename, text=u""):
+        io.StringIO.__init__(self)
+        self.write(text)
+        self._storage = storage
+        self._filename = filename
+
+    def close(self):
+        if not self.closed:
+            self._storage.files[self._filename] = self.getvalue()
+        io.StringIO.close(self)
+
+
+class MemoryStorage(object):
+
+    """Files kept in memory.
+
+    Files not (yet) saved in memory are read from the base storage, if
+    any, so MemoryStorage(FileStorage()) reads the shipped data files but
+    keeps every change to itself.
+
+    Attributes:
+      files -- { 'filename' : text }
+      base  -- storage to read files not in memory from (or None)
+
+    Methods:
+      open     -- open a file, as the builtin open
+      exists   -- return whether the file exists
+      makedirs -- does nothing (directories are implied)
+      walk     -- yield (dirpath, dirnames, filenames), as os.walk
+      stamp    -- return the base storage's stamp for files not in memory
+                  (files in memory are never cached, so None)
+
+    """
+
+    def __init__(self, base=None, files=None):
+        self.base = base
+        self.files = {}
+        for filename, text in (files or {}).items():
+            self.files[self._key(filename)] = text
+
+    def _key(self, filename):
+        return os.path.normpath(filename)
+
+    def open(self, filename, mode='r'):
+        key = self._key(filename)
+        if 'w' in mode:
+            return _MemoryFile(self, key)
+        if 'a' in mode:
+            return _MemoryFile(self, key, self.files.get(key, u""))
+        if key in self.files:
+            return io.StringIO(self.files[key])
+        if self.base is not None:
+            return self.base.open(filename, mode)
+        raise IOError(2, "No such file in memory", filename)
+
+    def exists(self, filename):
+        if self._key(filename) in self.files:
+            return True
+        return self.base is not None and self.base.exists(filename)
+
+    def makedirs(self, directory):
+        pass
+
+    def stamp(self, filename):
+        if self._key(filename) in self.files or self.base is None:
+            return None
+        return self.base.stamp(filename)
+
+    def walk(self, directory):
+        """Walk the base storage, with any files saved in memory added."""
+        found, order = {}, []
+        if self.base is not None:
+            for dirpath, dirnames, filenames in self.base.walk(directory):
+                found[self._key(dirpath)] = (dirpath, dirnames,
+                                             list(filenames))
+                order.append(self._key(dirpath))
+        top = self._key(directory)
+        for key in sorted(self.files):
+            dirpath, filename = os.path.split(key)
+            if dirpath != top and not dirpath.startswith(top + os.sep):
+                continue
+            if dirpath not in found:
+                found[dirpath] = (dirpath, [], [])
+                order.append(dirpath)
+            if filename not in found[dirpath][2]:
+                found[dirpath][2].append(filename)
+        for key in order:
+            yield found[key]
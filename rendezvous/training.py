@@ -0,0 +1,324 @@
+"""Tune the weights the dealer uses to value each possible play.
+
+PossiblePlay values a play as a weighted sum of the terms in FEATURES.
+In headless self-play, every valid play the AI considers is scored (from
+a snapshot) against what the other player actually played, recording
+each play's terms alongside the change in the player's lead over that
+round; now and then a play other than the best is chosen, so the games
+wander away from the weights' own favourites.  A least squares fit (in
+NumPy) then gives the weights that best rank the plays in each decision,
+exported as the table PossiblePlay loads at startup.  A duel between the
+tuned and hand-tuned dealers checks the result, timing every decision
+each side makes.
+
+Run from the command line:
+
+    python -m rendezvous.training [deck] [-g GAMES] [-j PROCESSES]
+                                  [-o data/Weights.txt] [-d DUEL_GAMES]
+
+"""
+
+import time
+import random
+import argparse
+
+from rendezvous import GameSettings
+from rendezvous.deck import DeckDefinition
+from rendezvous.dealer import ArtificialIntelligence, FEATURES
+from rendezvous.dealer import DEFAULT_WEIGHTS
+from rendezvous.gameplay import RendezVousGame
+from rendezvous.matchups import rival
+
+# time.perf_counter added in Python 3.3
+timer = getattr(time, 'perf_counter', time.time)
+
+# Terms valuing the hand left for later rounds, which one round can't judge
+LATER = ('FLUSH_SPECIAL', 'FLUSH_CARDS', 'FLUSH_VALUE')
+
+
+def _lead(scores, player):
+    """Return the player's total lead over the best other player."""
+    totals = [sum(row) for row in scores]
+    return totals[player] - rival(totals, player)
+
+
+def _choose(game, player, weights=None, explore=0, rng=None):
+    """Return the play chosen (as Hand.AI_hard) and every valid play.
+
+    Valid plays are listed as (cards, features), with probability explore
+    of a random one being chosen instead of the best.  There are none
+    listed when the AI found none (see Hand._any_play) or needs none.
+
+    """
+    hand = game.players[player]
+    ai = ArtificialIntelligence(player, hand, game.board, game.score,
+                                game.rng, weights)
+    if not ai.possible_plays:
+        return hand._any_play(player, game.board, game.score), []
+    valid = [(possible.cards, possible.features())
+             for possible in ai.possible_plays if possible.verify()]
+    chosen = valid[0][0]
+    if explore and rng.random() < explore:
+        chosen = rng.choice(valid)[0]
+    if not chosen:
+        return chosen, []
+    return chosen, valid
+
+
+def _score(game, plays):
+    """Take each play (already on the board) from the hand, then score.
+
+    Return the change in each player's lead.
+
+    """
+    for p, play in enumerate(plays):
+        for card in play:
+            game.players[p].remove(card)
+    before = [list(player) for player in game.score.scores]
+    game.score_round()
+    return [_lead(game.score.scores, p) - _lead(before, p)
+            for p in range(len(plays))]
+
+
+def self_play(definition, seed, weights=None, explore=0.2, samples=None):
+
+    """Play one seeded game; return a sample for each decision made.
+
+    Each sample lists (features, lead change) for every valid play the AI
+    considered, each scored (from a snapshot) against what the other
+    player actually played.  Only the differences within a sample say
+    anything about the weights, so decisions with one choice are skipped.
+
+    Arguments:
+      definition -- the DeckDefinition to play with
+      seed       -- seed for the game (and for exploring)
+      weights    -- weights both players use (default: as loaded)
+      explore    -- chance of playing a random valid play instead
+      samples    -- list to extend with the samples (default: a new one)
+
+    """
+
+    if samples is None:
+        samples = []
+    game = RendezVousGame(deck=definition, rng=random.Random(seed))
+    game.new_game()
+    rng = random.Random(-seed - 1)
+    players = range(GameSettings.NUM_PLAYERS)
+    while True:
+
+        # Choose in turn, as the board fills
+        plays, options, spaces = [], [], []
+        for p in players:
+            play, valid = _choose(game, p, weights, explore, rng)
+            plays.append(play)
+            options.append(valid)
+            spaces.append(game.board.play_cards(p, play))
+        snapshot = game.snapshot()
+        state = game.rng.getstate()
+
+        # Score each option in place of the play chosen
+        for p in players:
+            if len(options[p]) < 2:
+                continue
+            sample = []
+            for cards, features in options[p]:
+                game.restore(snapshot)
+                game.rng.setstate(state)
+                for i in spaces[p]:
+                    game.board[p][i] = None
+                game.board.play_cards(p, cards)
+                leads = _score(game, plays[:p] + [cards] + plays[p + 1:])
+                sample.append((features, leads[p]))
+            samples.append(sample)
+
+        game.restore(snapshot)
+        game.rng.setstate(state)
+        _score(game, plays)
+        if game.next_round():
+            return samples
+
+
+def _collect_batch(args):
+    """Worker: play games for each seed; return all their samples."""
+    deck, seeds, weights, explore = args
+    definition = DeckDefinition(deck)
+    samples = []
+    for seed in seeds:
+        self_play(definition, seed, weights, explore, samples)
+    return samples
+
+
+def collect(deck="Standard", games=1000, processes=None, seed=0,
+            weights=None, explore=0.2, batch=50):
+
+    """Play games across processes; return all their samples.
+
+    Arguments:
+      deck      -- base filename of the deck to play
+      games     -- number of games to play
+      processes -- worker processes (default: one per core; 1 for none)
+      seed      -- first seed; game n uses seed + n
+      weights   -- weights both players use (default: as loaded)
+      explore   -- chance of playing a random valid play instead
+      batch     -- games per task sent to a worker
+
+    """
+
+    tasks = [(deck, range(start, min(start + batch, seed + games)),
+              weights, explore)
+             for start in range(seed, seed + games, batch)]
+    if processes == 1:
+        results = map(_collect_batch, tasks)
+        pool = None
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(processes)
+        results = pool.imap(_collect_batch, tasks)
+    samples = []
+    try:
+        for result in results:
+            samples.extend(result)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return samples
+
+
+def fit(samples, prior=DEFAULT_WEIGHTS, ridge=0.01, keep=LATER, signs=True):
+
+    """Return the weights best ranking the plays within each sample.
+
+    This is a least squares fit, solved in one step with NumPy, of the
+    lead change each play gained over the average play in its sample
+    (only the order within one decision matters), with a light ridge
+    penalty to keep rare terms from swinging wildly.  The weights are
+    rescaled to the prior's units (VALUE keeps its weight); terms the
+    games never varied, or listed to keep, keep their prior weight.  A
+    term fit against the sign of its prior weight is dropped to zero
+    rather than made to count the other way.
+
+    Arguments:
+      samples -- lists of (features, lead change) per decision (see collect)
+      prior   -- weights to fall back on
+      ridge   -- penalty per play on each (unit variance) weight
+      keep    -- names of terms not to fit
+      signs   -- whether to keep each weight's sign as in the prior
+
+    """
+
+    import numpy
+
+    X, y = [], []
+    for sample in samples:
+        features = numpy.array([f for f, lead in sample], dtype=float)
+        leads = numpy.array([lead for f, lead in sample], dtype=float)
+        X.append(features - features.mean(axis=0))
+        y.append(leads - leads.mean())
+    X, y = numpy.concatenate(X), numpy.concatenate(y)
+    prior = numpy.array(prior, dtype=float)
+
+    # Scale each term to unit variance, so the penalty treats them alike
+    spread = X.std(axis=0)
+    seen = (spread > 0) & numpy.array([name not in keep
+                                       for name, default in FEATURES])
+    Z = X[:, seen] / spread[seen]
+    penalty = ridge * len(y) * numpy.eye(Z.shape[1])
+    weights = prior.copy()
+    weights[seen] = numpy.linalg.solve(Z.T.dot(Z) + penalty,
+                                       Z.T.dot(y)) / spread[seen]
+
+    value = [name for name, default in FEATURES].index('VALUE')
+    weights[seen] *= prior[value] / weights[value]
+    if signs:
+        weights[weights * prior < 0] = 0
+    return tuple(float(weight) for weight in weights)
+
+
+def export(weights, filename="data/Weights.txt"):
+    """Save the weights as the [FEATURE]weight table load_weights reads."""
+    with open(filename, 'w') as file:
+        for (name, default), weight in zip(FEATURES, weights):
+            file.write("[%s]%.4g\n" % (name, weight))
+
+
+def duel(weights, deck="Standard", games=200, seed=10000,
+         baseline=DEFAULT_WEIGHTS):
+
+    """Pit dealers using the weights and the baseline weights against each
+    other, each seed played once from each side.
+
+    Return {'wins', 'losses', 'ties' : games the weights won/lost/tied,
+            'lead' : average final lead of the weights,
+            'time', 'baseline_time' : average seconds per decision}.
+
+    """
+
+    definition = DeckDefinition(deck)
+    result = dict(wins=0, losses=0, ties=0, lead=0)
+    times = {0 : [], 1 : []}  # 1 for the weights, 0 for the baseline
+
+    for game_seed in range(seed, seed + games):
+        for tuned in range(GameSettings.NUM_PLAYERS):
+            game = RendezVousGame(deck=definition,
+                                  rng=random.Random(game_seed))
+            game.new_game()
+            while True:
+                plays = []
+                for p in range(GameSettings.NUM_PLAYERS):
+                    start = timer()
+                    play, valid = _choose(game, p, weights if p == tuned
+                                                   else baseline)
+                    times[p == tuned].append(timer() - start)
+                    plays.append(play)
+                    game.board.play_cards(p, play)
+                _score(game, plays)
+                if game.next_round():
+                    break
+            lead = _lead(game.score.scores, tuned)
+            won = (game.score.win_count(tuned) -
+                   game.score.win_count(game.score.opponent(tuned)))
+            result['wins' if won > 0 else 'losses' if won < 0 else 'ties'] += 1
+            result['lead'] += lead
+
+    result['lead'] = float(result['lead']) / (2 * games)
+    result['time'] = sum(times[1]) / len(times[1])
+    result['baseline_time'] = sum(times[0]) / len(times[0])
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Tune the dealer's weights from self-play.")
+    parser.add_argument('deck', nargs='?', default="Standard",
+                        help="base filename of the deck (default: Standard)")
+    parser.add_argument('-g', '--games', type=int, default=2000)
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-e', '--explore', type=float, default=0.2,
+                        help="chance of a random play (default: 0.2)")
+    parser.add_argument('-o', '--output', default=None,
+                        help="save the weights to this file")
+    parser.add_argument('-d', '--duel', type=int, default=200,
+                        help="games to duel against the hand-tuned weights")
+    args = parser.parse_args(argv)
+
+    samples = collect(args.deck, args.games, args.processes, args.seed,
+                      DEFAULT_WEIGHTS, args.explore)
+    weights = fit(samples)
+    print("%d decisions from %d games" % (len(samples), args.games))
+    for (name, default), weight in zip(FEATURES, weights):
+        print("%-16s %6g -> %8.3f" % (name, default, weight))
+    if args.output:
+        export(weights, args.output)
+    if args.duel:
+        result = duel(weights, args.deck, args.duel)
+        print("vs. hand-tuned: %(wins)d won, %(losses)d lost, %(ties)d tied; "
+              "average lead %(lead).1f" % result)
+        print("per decision: %.3f ms tuned, %.3f ms hand-tuned" %
+              (result['time'] * 1000, result['baseline_time'] * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import os
+import sys
+import json
+import argparse
+import platform
+
+from benchmarks import summarize, compare
+
+
+def collect(path, names=None):
+
+    """Return [(name, function)] for all benchmarks located at path.
+
+    Modules containing benchmarks must begin with 'bench', as must the
+    benchmark functions themselves.  The name of each benchmark is the
+    function name without its 'bench_' prefix.  If names is given, only
+    those benchmarks are returned.
+
+    """
+
+    found = []
+    package_name = os.path.basename(os.path.abspath(path))
+    for filename in sorted(os.listdir(path)):
+        if not filename.startswith('bench') or not filename.endswith('.py'):
+            continue
+        module_name = "%s.%s" % (package_name, filename[:-3])
+        module = __import__(module_name, globals(), locals(), ['*'])
+        for function_name in sorted(dir(module)):
+            if not function_name.startswith('bench_'):
+                continue
+            name = function_name[len('bench_'):]
+            if names and name not in names:
+                continue
+            found.append((name, getattr(module, function_name)))
+    return found
+
+
+def runbenchmarks(path, samples=50, names=None):
+
+    """Run all benchmarks located at path; return {name : statistics}."""
+
+    results = {}
+    for name, function in collect(path, names):
+        results[name] = summarize(function(samples))
+        stats = results[name]
+        print("%-28s p50 %10.3f ms   p99 %10.3f ms   %10.1f /s"
+              % (name, stats['p50'] * 1000, stats['p99'] * 1000,
+                 stats['per_second']))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time the RendezVous engine's hot paths.")
+    parser.add_argument('names', nargs='*',
+                        help="benchmarks to run (default: all)")
+    parser.add_argument('-n', '--samples', type=int, default=50,
+                        help="samples per benchmark (default: 50)")
+    parser.add_argument('-o', '--output',
+                        help="save the results to this JSON file")
+    parser.add_argument('-b', '--baseline',
+                        help="compare against results saved earlier")
+    parser.add_argument('-t', '--threshold', type=float, default=0.25,
+                        help="allowed p50 slowdown vs. baseline "
+                             "(default: 0.25 for 25%%)")
+    args = parser.parse_args(argv)
+
+    results = runbenchmarks('benchmarks', args.samples, args.names)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python' : platform.python_version(),
+                       'platform' : platform.platform(),
+                       'samples' : args.samples,
+                       'results' : results}, f, indent=2, sort_keys=True)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = 0
+    print("\nCompared to %s (threshold +%d%%):"
+          % (args.baseline, args.threshold * 100))
+    for name, old, new, ratio, regressed in compare(results, baseline,
+                                                     args.threshold):
+        print("%-28s %10.3f ms -> %10.3f ms  %6.2fx  %s"
+              % (name, old * 1000, new * 1000, ratio,
+                 "REGRESSION" if regressed else "ok"))
+        regressions += regressed
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
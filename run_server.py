@@ -0,0 +1,37 @@
+import asyncio
+import argparse
+
+from server.network import GameServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Host RendezVous games for clients over TCP.")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument('-p', '--port', type=int, default=8642)
+    parser.add_argument('--park-after', type=float, default=60,
+                        help="seconds idle before a game is parked")
+    parser.add_argument('--drop-after', type=float, default=3600,
+                        help="seconds idle before a game is abandoned")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = GameServer(park_after=args.park_after,
+                            drop_after=args.drop_after)
+        listener = await server.start(args.host, args.port)
+        print("Serving RendezVous on %s:%d" %
+              listener.sockets[0].getsockname()[:2])
+        try:
+            await listener.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
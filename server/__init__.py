@@ -0,0 +1,66 @@
+"""Host many RendezVous games from one process (see run_server.py).
+
+Clients connect over TCP and exchange one JSON object per line, each with
+a 'type' field.  Seats are numbered as in the GUI: with a dealer, the
+dealer sits at 0 and the human at 1.
+
+Client to server:
+  join  -- {"name": str, "opponent": "dealer" | "human", "deck": str}
+  play  -- {"cards": [hand indices]} fills the open board spaces in order
+  stuck -- take the penalty for having no valid play and draw a new hand
+  leave -- quit the game
+
+Server to client:
+  joined    -- {"session", "seat"}; with a human opponent, may be
+               followed by a wait for one to join
+  start     -- {"seats", "names", "suits", "rounds"}
+  round     -- {"round", "board"} (the board shows any held cards)
+  hand      -- {"cards", "playable"} your current hand, and whether any
+               valid play can be made from it (if not, send stuck)
+  played    -- {"seat"} that player has chosen a play (not yet shown)
+  stuck     -- {"seat", "scores"} that player took the penalty
+  board     -- {"board"} all plays, revealed together
+  special   -- {"seat", "slot", "card", "applied_to", "board"} as each
+               special card resolves, left to right
+  score     -- {"round", "scores", "deltas"}
+  game_over -- {"scores", "wins", "winners"}
+  left      -- {"seat"} a player disconnected; the game is over
+  error     -- {"message"} the last request was refused
+
+Each card is sent as {"name", "suit", "value"}, plus "description" for
+special cards.
+
+"""
+
+import json
+
+from rendezvous import SpecialSuit
+
+
+def card_data(card):
+    """Return a JSON-ready dict describing the card (or None)."""
+    if card is None:
+        return None
+    data = {'name' : str(card), 'suit' : card.suit, 'value' : card.value}
+    if card.suit == SpecialSuit.SPECIAL:
+        data['description'] = card.description
+    return data
+
+
+def board_data(board):
+    """Return the board as a JSON-ready list of cards by [seat][slot]."""
+    return [[card_data(card) for card in board[seat]]
+            for seat in range(len(board))]
+
+
+def encode(message):
+    """Return the message as one line of bytes."""
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def decode(line):
+    """Return the message read from one line; raise ValueError if invalid."""
+    message = json.loads(line.decode('utf-8'))
+    if not isinstance(message, dict) or 'type' not in message:
+        raise ValueError("Each message must be an object with a 'type'.")
+    return message
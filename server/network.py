@@ -0,0 +1,289 @@
+"""Serve Sessions to clients over TCP with asyncio (see server/__init__.py).
+
+All game state is touched under each session's lock.  Dealers choose their
+plays in a worker thread, so a slow AI holds up only its own session, never
+the event loop.  A sweep parks sessions nobody has touched for a while and
+drops those abandoned entirely, so idle games cost little memory.
+
+"""
+
+import os
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rendezvous import GameSettings, MissingDeckError, InvalidPlayError
+from rendezvous.deck import DeckDefinition
+
+from server import encode, decode
+from server.session import Session
+
+#: Seat of the dealer and the human in a game against the dealer (as main.py)
+DEALER = 0
+PLAYER = 1
+
+
+class _Table(object):
+
+    """A Session and the connections seated at it."""
+
+    __slots__ = ('session', 'writers', 'lock', 'touched')
+
+    def __init__(self, session, writers):
+        self.session = session
+        self.writers = writers
+        self.lock = asyncio.Lock()
+        self.touched = time.time()
+
+
+class GameServer(object):
+
+    """Host any number of concurrent games.
+
+    Attributes:
+      tables      -- {session id : _Table} for every game in progress
+      park_after  -- seconds without activity before a game is parked
+      drop_after  -- seconds without activity before a game is abandoned
+      difficulty  -- AI_DIFFICULTY for dealers (default: from GameSettings)
+
+    Methods:
+      start  -- begin listening; return the asyncio server
+      close  -- stop listening and end all games
+
+    """
+
+    def __init__(self, executor=None, park_after=60, drop_after=3600,
+                 difficulty=None, seed=None):
+        self.executor = executor or ThreadPoolExecutor()
+        self.park_after = park_after
+        self.drop_after = drop_after
+        self.difficulty = (GameSettings.AI_DIFFICULTY if difficulty is None
+                           else difficulty)
+        self.tables = {}
+        self._definitions = {}
+        self._waiting = {}  # deck name : [(name, writer, future seat)]
+        self._ids = itertools.count(1)
+        self._seed = seed
+        self._server = None
+        self._sweeper = None
+        self._clients = set()
+
+    def definition(self, deck):
+        """Return the (shared) DeckDefinition for the named deck."""
+        try:
+            return self._definitions[deck]
+        except KeyError:
+            definition = self._definitions[deck] = DeckDefinition(deck)
+            return definition
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Begin listening for clients; return the asyncio Server."""
+        self._server = await asyncio.start_server(self._connected, host, port)
+        self._sweeper = asyncio.ensure_future(self._sweep())
+        return self._server
+
+    async def close(self):
+        """Stop listening and disconnect everyone."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for table in list(self.tables.values()):
+            self._end(table)
+        for client in list(self._clients):
+            client.cancel()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+
+    # Connections
+
+    async def _connected(self, reader, writer):
+        table = seat = None
+        client = asyncio.current_task()
+        self._clients.add(client)
+        try:
+            line = await reader.readline()
+            table, seat = await self._join(self._read(line), writer)
+            if table is None:
+                return
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = self._read(line)
+                if message is None:
+                    self._send(writer, {'type' : 'error',
+                                        'message' : "Invalid message."})
+                elif message['type'] == 'leave':
+                    break
+                else:
+                    await self._act(table, seat, message)
+                if table.session.over:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError,
+                asyncio.CancelledError):
+            pass
+        finally:
+            if table is not None:
+                self._leave(table, seat)
+            self._forget(writer)
+            self._clients.discard(client)
+            writer.close()
+
+    @staticmethod
+    def _read(line):
+        try:
+            return decode(line)
+        except ValueError:
+            return None
+
+    async def _join(self, message, writer):
+        """Seat a new client; return (table, seat), or (None, None)."""
+        if message is None or message['type'] != 'join':
+            self._send(writer, {'type' : 'error',
+                                'message' : "Join a game first."})
+            return None, None
+        name = str(message.get('name', "Player"))
+        deck = str(message.get('deck', GameSettings.CURRENT_DECK))
+        try:
+            if os.path.basename(deck) != deck:
+                raise MissingDeckError
+            definition = self.definition(deck)
+        except MissingDeckError:
+            self._send(writer, {'type' : 'error',
+                                'message' : "No such deck: %s" % deck})
+            return None, None
+
+        if message.get('opponent', 'dealer') == 'dealer':
+            names = ["Dealer"] * GameSettings.NUM_PLAYERS
+            names[PLAYER] = name
+            writers = [None] * GameSettings.NUM_PLAYERS
+            writers[PLAYER] = writer
+            dealers = [s for s in range(len(names)) if s != PLAYER]
+            table = self._open(definition, names, writers, dealers)
+            self._send(writer, {'type' : 'joined',
+                                'session' : table.session.id,
+                                'seat' : PLAYER})
+            await self._begin(table)
+            return table, PLAYER
+
+        # Wait for enough humans to join on the same deck
+        future = asyncio.get_event_loop().create_future()
+        waiting = self._waiting.setdefault(deck, [])
+        waiting.append((name, writer, future))
+        if len(waiting) < GameSettings.NUM_PLAYERS:
+            return await future
+        del self._waiting[deck]
+        table = self._open(definition, [n for n, w, f in waiting],
+                           [w for n, w, f in waiting], [])
+        for seat, (other, other_writer, other_future) in enumerate(waiting):
+            self._send(other_writer, {'type' : 'joined',
+                                      'session' : table.session.id,
+                                      'seat' : seat})
+            other_future.set_result((table, seat))
+        await self._begin(table)
+        return future.result()
+
+    def _forget(self, writer):
+        """Remove a client still waiting for an opponent."""
+        for deck, waiting in list(self._waiting.items()):
+            waiting[:] = [entry for entry in waiting if entry[1] is not writer]
+            if not waiting:
+                del self._waiting[deck]
+
+    def _open(self, definition, names, writers, dealers):
+        id = next(self._ids)
+        seed = None if self._seed is None else self._seed + id
+        session = Session(id, definition, names, dealers, seed=seed,
+                          difficulty=self.difficulty)
+        table = _Table(session, writers)
+        self.tables[session.id] = table
+        return table
+
+    def _send(self, writer, message):
+        if writer is not None and not writer.is_closing():
+            writer.write(encode(message))
+
+    def _broadcast(self, table, events):
+        for seat, message in events:
+            if seat is None:
+                for writer in table.writers:
+                    self._send(writer, message)
+            else:
+                self._send(table.writers[seat], message)
+
+    def _leave(self, table, seat):
+        """A player has gone; end the game for everyone else."""
+        table.writers[seat] = None
+        if table.session.id in self.tables:
+            self._broadcast(table, [(None, {'type' : 'left', 'seat' : seat})])
+            self._end(table)
+
+    def _end(self, table):
+        self.tables.pop(table.session.id, None)
+        for writer in table.writers:
+            if writer is not None:
+                writer.close()
+        table.writers = [None] * len(table.writers)
+
+    # Play
+
+    async def _begin(self, table):
+        async with table.lock:
+            self._broadcast(table, table.session.start())
+        asyncio.ensure_future(self._dealers(table))
+
+    async def _act(self, table, seat, message):
+        """Apply one request from the player at this seat."""
+        async with table.lock:
+            table.touched = time.time()
+            session = table.session
+            try:
+                if message['type'] == 'play':
+                    events = session.play(seat, list(message.get('cards', ())))
+                elif message['type'] == 'stuck':
+                    events = session.stuck(seat)
+                else:
+                    raise InvalidPlayError("Unknown request: %s"
+                                           % message['type'])
+            except (InvalidPlayError, TypeError) as error:
+                self._send(table.writers[seat], {'type' : 'error',
+                                                 'message' : str(error)})
+                return
+            self._broadcast(table, events)
+        if session.dealers and not session.over:
+            asyncio.ensure_future(self._dealers(table))
+
+    async def _dealers(self, table):
+        """Let each dealer who has not yet played this round choose a play."""
+        loop = asyncio.get_event_loop()
+        session = table.session
+        async with table.lock:
+            while table.session.id in self.tables and not session.over:
+                seats = [seat for seat in session.waiting()
+                         if seat in session.dealers]
+                if not seats:
+                    break
+                events = await loop.run_in_executor(self.executor,
+                                                    session.dealer_play,
+                                                    seats[0])
+                self._broadcast(table, events)
+
+    async def _sweep(self):
+        """Periodically park idle games and drop abandoned ones."""
+        while True:
+            await asyncio.sleep(min(self.park_after, self.drop_after) / 2.0)
+            self.sweep()
+
+    def sweep(self, now=None):
+        """Park idle games and drop abandoned ones."""
+        now = time.time() if now is None else now
+        for table in list(self.tables.values()):
+            idle = now - table.touched
+            if idle >= self.drop_after:
+                self._broadcast(table, [(None, {'type' : 'error',
+                                                'message' : "Timed out."})])
+                self._end(table)
+            elif idle >= self.park_after and not table.lock.locked():
+                table.session.park()
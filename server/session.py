@@ -0,0 +1,239 @@
+"""One hosted game, independent of any network connection.
+
+Every change to a game is made through one of the Session's actions, and
+each action returns the events it caused as [(seat, message)], where seat
+is None for messages meant for everyone.
+
+Actions are logged as they succeed.  Since the game's only source of
+randomness is seeded, an idle session can be parked: the game itself is
+dropped, keeping just the seed and the log, and it is rebuilt exactly by
+replaying the log the next time it is needed.
+
+"""
+
+import random
+
+from rendezvous import GameSettings, SpecialSuit, InvalidPlayError
+from rendezvous.gameplay import RendezVousGame
+
+from server import card_data, board_data
+
+
+class Session(object):
+
+    """One game between any mix of humans and dealers.
+
+    Attributes:
+      id         -- identifier for this session
+      names      -- display name for each seat
+      dealers    -- the seats played by the AI
+      difficulty -- AI_DIFFICULTY for the dealers (1 for AI_easy)
+      seed       -- seed for the game's random.Random
+      over       -- whether the game has ended
+      game       -- the RendezVousGame (rebuilt on demand if parked)
+      parked     -- whether the game is currently dropped from memory
+
+    Methods:
+      start       -- deal the first round
+      dealer_play -- choose and submit the play for a dealer's seat
+      play        -- submit a human's play, by index into their hand
+      stuck       -- take the penalty for having no valid play
+      waiting     -- return the seats that have not played this round
+      park        -- drop the game, keeping only what rebuilds it
+
+    """
+
+    __slots__ = ('id', 'definition', 'names', 'dealers', 'difficulty',
+                 'seed', 'over', '_game', '_staged', '_log')
+
+    def __init__(self, id, definition, names, dealers=(), seed=None,
+                 difficulty=2):
+        if len(names) != GameSettings.NUM_PLAYERS:
+            raise ValueError("A game needs %d players."
+                             % GameSettings.NUM_PLAYERS)
+        self.id = id
+        self.definition = definition
+        self.names = tuple(names)
+        self.dealers = tuple(dealers)
+        self.difficulty = difficulty
+        self.seed = random.randrange(1 << 32) if seed is None else seed
+        self.over = False
+        self._game = None
+        self._staged = None
+        self._log = None
+
+    @property
+    def game(self):
+        if self._game is None and self._log is not None:
+            self._rebuild()
+        return self._game
+
+    @property
+    def parked(self):
+        return self._game is None and self._log is not None
+
+    def _new_game(self):
+        self._game = RendezVousGame(deck=self.definition,
+                                    rng=random.Random(self.seed))
+        self._game.new_game()
+        self._staged = [None] * len(self.names)
+        self._log = []
+
+    def _rebuild(self):
+        """Recreate the game by replaying every action taken so far."""
+        log = self._log
+        self._new_game()
+        for action in log:
+            getattr(self, action[0])(*action[1:])
+
+    def park(self):
+        """Drop the game from memory until it is next needed."""
+        if self._log is not None:
+            self._game = None
+            self._staged = None
+
+    def start(self):
+        """Deal the first round; return the events."""
+        self._new_game()
+        events = [(None, {'type' : 'start', 'seats' : len(self.names),
+                          'names' : list(self.names),
+                          'suits' : list(self.definition.suits),
+                          'rounds' : GameSettings.NUM_ROUNDS})]
+        return events + self._round_events()
+
+    def waiting(self):
+        """Return the seats yet to play this round."""
+        if self.over or self._log is None:
+            return []
+        if self._staged is None:
+            self.game  # rebuild
+        return [seat for seat, cards in enumerate(self._staged)
+                if cards is None]
+
+    def dealer_play(self, seat):
+        """Choose and submit the dealer's play; return the events."""
+        self._check(seat, dealer=True)
+        game = self.game
+        hand = game.players[seat]
+        if self.difficulty == 1:
+            cards = hand.AI_easy(seat, game.board, game.score)
+        else:
+            cards = hand.AI_hard(seat, game.board, game.score)
+        self._log.append(('dealer_play', seat))
+        return self._stage(seat, cards)
+
+    def play(self, seat, indices):
+        """Submit the cards at these hand indices; return the events.
+
+        The cards fill the open spaces on the player's side of the board in
+        order.  Until everyone has played, a new play replaces the last.
+        Raise InvalidPlayError if the play is not allowed.
+
+        """
+        self._check(seat)
+        game = self.game
+        hand = game.players[seat]
+        side = list(game.board[seat])
+        needed = side.count(None)
+        if len(indices) != needed:
+            raise InvalidPlayError("Play exactly %d cards." % needed)
+        for i in indices:
+            if (isinstance(i, bool) or not isinstance(i, int) or
+                not 0 <= i < len(hand.cards)):
+                raise InvalidPlayError("No card at index %r." % (i,))
+        if len(set(indices)) != len(indices):
+            raise InvalidPlayError("Each card can be played only once.")
+        cards = [hand.cards[i] for i in indices]
+        placed = iter(cards)
+        side = [card if card is not None else next(placed) for card in side]
+        invalid = game.board.validate(side)
+        if invalid:
+            raise InvalidPlayError("Requirements not met: %s." %
+                                   ", ".join(str(side[i]) for i in invalid))
+        self._log.append(('play', seat, tuple(indices)))
+        return self._stage(seat, cards)
+
+    def stuck(self, seat):
+        """Take the penalty for having no valid play; return the events."""
+        self._check(seat)
+        if self._staged[seat] is not None:
+            raise InvalidPlayError("You have already played this round.")
+        game = self.game
+        game.players[seat].cant_play(seat, game.score)
+        self._log.append(('stuck', seat))
+        return [(None, {'type' : 'stuck', 'seat' : seat,
+                        'scores' : self._scores()}),
+                (seat, self._hand(seat))]
+
+    def _check(self, seat, dealer=False):
+        if self._log is None:
+            raise InvalidPlayError("The game has not started.")
+        if self.over:
+            raise InvalidPlayError("The game is over.")
+        if (seat in self.dealers) != dealer:
+            raise InvalidPlayError("Seat %d is not yours to play." % seat)
+        self.game  # rebuild if parked
+
+    def _stage(self, seat, cards):
+        """Hold the play until everyone has played, then resolve."""
+        self._staged[seat] = cards
+        events = [(None, {'type' : 'played', 'seat' : seat})]
+        if None not in self._staged:
+            events.extend(self._resolve())
+        return events
+
+    def _resolve(self):
+        """Reveal all plays, then apply specials and score, as score_round."""
+        game = self.game
+        for seat, cards in enumerate(self._staged):
+            for card in cards:
+                game.players[seat].remove(card)
+            game.board.play_cards(seat, cards)
+        self._staged = [None] * len(self.names)
+        events = [(None, {'type' : 'board',
+                          'board' : board_data(game.board)})]
+        before = self._scores()
+        game.board.clear_wait()
+        plan = game.plan_specials()
+        for i in range(GameSettings.CARDS_ON_BOARD):
+            for p in range(len(self.names)):
+                special = game.board[p][i]
+                if special.suit == SpecialSuit.SPECIAL:
+                    game._apply(p, i, plan)
+                    events.append((None, {'type' : 'special', 'seat' : p,
+                                          'slot' : i, 'card' : str(special),
+                                          'applied_to' : list(special.applied_to),
+                                          'board' : board_data(game.board)}))
+        game.score.score(game.board)
+        scores = self._scores()
+        events.append((None, {'type' : 'score', 'round' : game.round,
+                              'scores' : scores,
+                              'deltas' : [[a - b for a, b in zip(*player)]
+                                          for player in zip(scores, before)]}))
+        if game.next_round():
+            self.over = True
+            wins = [game.score.win_count(p) for p in range(len(self.names))]
+            events.append((None, {'type' : 'game_over', 'scores' : scores,
+                                  'wins' : wins,
+                                  'winners' : [p for p, w in enumerate(wins)
+                                               if w == max(wins)]}))
+        else:
+            events.extend(self._round_events())
+        return events
+
+    def _round_events(self):
+        events = [(None, {'type' : 'round', 'round' : self.game.round,
+                          'board' : board_data(self.game.board)})]
+        for seat in range(len(self.names)):
+            if seat not in self.dealers:
+                events.append((seat, self._hand(seat)))
+        return events
+
+    def _hand(self, seat):
+        hand = self.game.players[seat]
+        return {'type' : 'hand',
+                'cards' : [card_data(card) for card in hand],
+                'playable' : hand.find_play(seat, self.game.board) is not None}
+
+    def _scores(self):
+        return [list(player) for player in self.game.score.scores]
@@ -0,0 +1,92 @@
+import unittest
+
+from gui.cache import DeckCache, texture_size
+
+
+class DummyTexture:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+
+def entry(size=0):
+    return {'deck' : object(), 'texture' : DummyTexture(size, 1),
+            'achtexture' : None}
+
+
+class TestTextureSize(unittest.TestCase):
+
+    def test_none(self):
+        self.assertEqual(texture_size(None), 0)
+
+    def test_rgba(self):
+        self.assertEqual(texture_size(DummyTexture(2, 3)), 24)
+
+
+class TestDeckCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = DeckCache(budget=100)
+
+    def test_init(self):
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size, 0)
+        self.assertIs(self.cache.get("Standard"), None)
+
+    def test_put_get(self):
+        e = entry(5)
+        self.cache.put("Standard", e)
+        self.assertIn("Standard", self.cache)
+        self.assertIs(self.cache.get("Standard"), e)
+        self.assertEqual(self.cache.size, 20)
+
+    def test_replace(self):
+        self.cache.put("Standard", entry(5))
+        self.cache.put("Standard", entry(10))
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.size, 40)
+
+    def test_pop(self):
+        e = entry(5)
+        self.cache.put("Standard", e)
+        self.assertIs(self.cache.pop("Standard"), e)
+        self.assertIs(self.cache.pop("Standard"), None)
+        self.assertEqual(self.cache.size, 0)
+
+    def test_evict_lru(self):
+        self.cache.put("A", entry(10))
+        self.cache.put("B", entry(10))
+        self.cache.get("A")
+        self.cache.put("C", entry(10))
+        self.assertEqual(self.cache.keys(), ["A", "C"])
+        self.assertEqual(self.cache.size, 80)
+
+    def test_resize(self):
+        e = entry(0)
+        self.cache.put("A", entry(10))
+        self.cache.put("B", e)
+        self.assertEqual(self.cache.keys(), ["A", "B"])
+        e['achtexture'] = DummyTexture(20, 1)
+        self.cache.resize("B")
+        self.assertEqual(self.cache.keys(), ["B"])
+        self.assertEqual(self.cache.size, 80)
+
+    def test_prefetched_spares_used(self):
+        self.cache.put("A", entry(10))
+        self.cache.put("B", entry(10), prefetched=True)
+        self.cache.put("C", entry(10), prefetched=True)
+        self.assertEqual(self.cache.keys(), ["A", "C"])
+        self.cache.put("D", entry(20), prefetched=True)
+        self.assertEqual(self.cache.keys(), ["A"])
+
+    def test_prefetched_evicted_first(self):
+        self.cache.put("A", entry(10), prefetched=True)
+        self.cache.put("B", entry(10))
+        self.cache.get("A")  # now used
+        self.cache.put("C", entry(5), prefetched=True)
+        self.cache.put("D", entry(10))
+        self.assertEqual(self.cache.keys(), ["A", "D"])
+
+    def test_resize_missing(self):
+        self.cache.resize("Nothing")
+        self.assertEqual(self.cache.size, 0)
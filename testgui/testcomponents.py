@@ -325,6 +325,7 @@ class TestBoardDisplay(unittest.TestCase):
         self.assertEqual(self.bd.board[1][0].value, 3)
         self.assertEqual(self.bd.board[1][1].value, 4)
         self.assertEqual(self.bd.board[1][2].value, 5)
+        self.assertEqual(self.bd.slots[1][3].color, DARKEN)
 
     def test_score_round(self):
         self.bd.place_card(Card("Girlfriend", 2))
@@ -345,6 +346,67 @@ class TestBoardDisplay(unittest.TestCase):
                                                 [-40, 0, 0, 0, 0]])
 
 
+class TestBoardTimeline(unittest.TestCase):
+
+    def setUp(self):
+        self.ran = []
+        self.done = []
+        steps = [(self.ran.append, i) for i in range(3)]
+        self.tl = BoardTimeline(steps, callback=lambda: self.done.append(True),
+                                timer=1.0)
+
+    def tearDown(self):
+        self.tl.cancel()
+
+    def test_init(self):
+        self.assertEqual(len(self.tl), 3)
+        self.assertFalse(self.tl.running)
+
+    def test_start_lead_in(self):
+        self.tl.start()
+        self.assertEqual(self.ran, [])
+        self.assertTrue(self.tl.running)
+
+    def test_start_no_lead_in(self):
+        self.tl.start(lead_in=False)
+        self.assertEqual(self.ran, [0])
+
+    def test_tick(self):
+        self.tl.start()
+        self.tl._tick(1.0)
+        self.tl._tick(1.0)
+        self.assertEqual(self.ran, [0, 1])
+        self.tl._tick(1.0)
+        self.assertEqual(self.done, [])
+        self.assertFalse(self.tl._tick(1.0))
+        self.assertEqual(self.done, [True])
+
+    def test_fast_forward(self):
+        self.tl.start()
+        self.tl._tick(1.0)
+        self.tl.fast_forward()
+        self.assertEqual(self.ran, [0, 1, 2])
+        self.assertEqual(self.done, [True])
+        self.assertFalse(self.tl.running)
+
+    def test_fast_forward_not_started(self):
+        self.tl.fast_forward()
+        self.assertEqual(self.ran, [])
+
+    def test_instant_speed(self):
+        self.tl.timer = 0.001
+        self.tl.start()
+        self.assertEqual(self.ran, [0, 1, 2])
+        self.assertEqual(self.done, [True])
+
+    def test_cancel(self):
+        self.tl.start()
+        self.tl.cancel()
+        self.tl.fast_forward()
+        self.assertEqual(self.ran, [])
+        self.assertEqual(self.done, [])
+
+
 class TestScoreDisplay(unittest.TestCase):
 
     def setUp(self):
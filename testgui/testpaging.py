@@ -0,0 +1,61 @@
+import unittest
+
+from gui.paging import *
+
+
+class TestVisibleItems(unittest.TestCase):
+
+    def test_top(self):
+        """Verify the rows at the top of the list are in view."""
+        self.assertEqual(visible_items(1000, 1, 100, 300, 1), range(0, 4))
+
+    def test_bottom(self):
+        """Verify only the last rows are in view at the bottom."""
+        self.assertEqual(visible_items(1000, 1, 100, 300, 0),
+                         range(997, 1000))
+
+    def test_middle(self):
+        """Verify a partly scrolled row is still in view."""
+        # 1000 rows, 300 in view: 99700 hidden, so half way is 49850 down
+        self.assertEqual(visible_items(1000, 1, 100, 300, 0.5),
+                         range(498, 502))
+
+    def test_cols(self):
+        """Verify whole rows of items are in view, up to the last item."""
+        self.assertEqual(visible_items(1000, 2, 100, 300, 1), range(0, 8))
+        self.assertEqual(visible_items(7, 2, 100, 300, 0), range(2, 7))
+
+    def test_short(self):
+        """Verify a list shorter than the view is all in view."""
+        self.assertEqual(visible_items(3, 1, 100, 300, 0), range(0, 3))
+        self.assertEqual(visible_items(0, 1, 100, 300, 1), range(0, 0))
+
+    def test_unsized(self):
+        """Verify nothing is in view until the rows have a height."""
+        self.assertEqual(visible_items(10, 1, 0, 300, 1), range(0))
+
+
+class TestPages(unittest.TestCase):
+
+    def test_page_count(self):
+        """Verify partial pages count, and there is always one page."""
+        self.assertEqual(page_count(95, 10), 10)
+        self.assertEqual(page_count(100, 10), 10)
+        self.assertEqual(page_count(0, 10), 1)
+
+    def test_page_items(self):
+        """Verify each page holds the next per_page items."""
+        items = list(range(95))
+        self.assertEqual(items[page_items(0, 10)], list(range(10)))
+        self.assertEqual(items[page_items(9, 10)], list(range(90, 95)))
+
+    def test_near_pages(self):
+        """Verify the page showing and those beside it are filled."""
+        self.assertEqual(near_pages(0, 10), set([0, 1]))
+        self.assertEqual(near_pages(5, 10), set([4, 5, 6]))
+        self.assertEqual(near_pages(9, 10), set([8, 9]))
+        self.assertEqual(near_pages(0, 1), set([0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+
+from gui.cache import DeckCache
+from gui.prefetch import DeckPrefetcher
+
+from testgui.testcache import DummyTexture
+
+
+class DummyPrefetcher(DeckPrefetcher):
+
+    """Prefetch without threads or the kivy Loader."""
+
+    def __init__(self, cache):
+        DeckPrefetcher.__init__(self, cache)
+        self.started = []
+
+    def _start(self, deck_base):
+        self.started.append(deck_base)
+
+    def _load_textures(self, deck_base, definition, entry):
+        pass
+
+    def load(self, deck_base):
+        """Finish parsing the deck, then decode both its textures."""
+        self._parsed(deck_base, object())
+        entry = self._loading[deck_base]
+        for key in ('texture', 'achtexture'):
+            loader = Loader(DummyTexture(2048, 2048))
+            self._loaded(deck_base, entry, key, loader)
+
+
+class Loader(object):
+    def __init__(self, texture):
+        self.image = self
+        self.texture = texture
+
+
+ESTIMATE = DeckPrefetcher.DECK_ESTIMATE
+
+
+def used():
+    return {'deck' : object(), 'texture' : DummyTexture(2048, 2048),
+            'achtexture' : DummyTexture(2048, 2048)}
+
+
+class TestDeckPrefetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = DeckCache(budget=3 * ESTIMATE)
+        self.cache.put("Used", used())
+        self.prefetcher = DummyPrefetcher(self.cache)
+
+    def test_counts_pending(self):
+        """Verify decks still parsing count toward the budget."""
+        self.prefetcher.prefetch(["A", "B", "C"])
+        self.assertEqual(self.prefetcher.started, ["A", "B"])
+        self.prefetcher.prefetch(["C"])
+        self.assertEqual(self.prefetcher.started, ["A", "B"])
+
+    def test_counts_loading(self):
+        """Verify decks still decoding count toward the budget."""
+        self.prefetcher.prefetch(["A", "B"])
+        self.prefetcher._parsed("A", object())
+        self.assertEqual(self.cache.size, ESTIMATE)
+        self.prefetcher.prefetch(["C"])
+        self.assertEqual(self.prefetcher.started, ["A", "B"])
+
+    def test_room_after_loading(self):
+        self.cache.budget = 4 * ESTIMATE
+        self.prefetcher.prefetch(["A", "B"])
+        self.prefetcher.load("A")
+        self.prefetcher.load("B")
+        self.assertEqual(self.cache.size, 3 * ESTIMATE)
+        self.prefetcher.prefetch(["C", "D"])
+        self.assertEqual(self.prefetcher.started, ["A", "B", "C"])
+
+    def test_never_evicts_used(self):
+        """Verify prefetched decks over budget evict only each other."""
+        self.cache.budget = 2 * ESTIMATE
+        self.cache.put("Also Used", used())
+        self.prefetcher.load("A")
+        self.assertEqual(self.cache.keys(), ["Used", "Also Used"])
+        self.assertEqual(self.prefetcher._committed(), 2 * ESTIMATE)
+
+    def test_evicts_prefetched_first(self):
+        self.prefetcher.prefetch(["A", "B"])
+        self.prefetcher.load("A")
+        self.prefetcher.load("B")
+        self.cache.get("Used")
+        self.cache.put("Other", used())
+        self.assertEqual(self.cache.keys(), ["B", "Used", "Other"])
+
+
+if __name__ == "__main__":
+    unittest.main()
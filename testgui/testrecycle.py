@@ -0,0 +1,73 @@
+import unittest
+
+from kivy.uix.label import Label
+
+from gui.recycle import *
+
+
+class TestRecycleList(unittest.TestCase):
+
+    def setUp(self):
+        self.rl = RecycleList(Label, size=(100, 300), row_height=100,
+                              data=[{'text' : str(i)} for i in range(1000)])
+
+    def texts(self):
+        return sorted(int(view.text) for view in self.rl.container.children)
+
+    def test_init(self):
+        self.assertEqual(self.rl.container.height, 100000)
+        self.assertEqual(self.texts(), [0, 1, 2, 3])
+
+    def test_scroll(self):
+        self.rl.scroll_y = 0
+        self.assertEqual(self.texts(), [997, 998, 999])
+        self.assertLessEqual(len(self.rl.container.children) +
+                             len(self.rl._pool), 4)
+
+    def test_cols(self):
+        self.rl.cols = 2
+        self.assertEqual(self.rl.container.height, 50000)
+        self.assertEqual(self.texts(), list(range(8)))
+
+    def test_refresh(self):
+        self.rl.data[0]['text'] = "changed"
+        self.rl.refresh()
+        self.assertIn("changed",
+                      [view.text for view in self.rl.container.children])
+
+    def test_empty(self):
+        self.rl.data = []
+        self.assertEqual(self.rl.container.children, [])
+
+    def test_measured(self):
+        """Verify rows take the views' own height unless one is given."""
+        rl = RecycleList(Label, size=(100, 300),
+                         data=[{'text' : str(i)} for i in range(10)])
+        self.assertEqual(rl.container.height, 10 * Label().height)
+
+
+class TestRecyclePages(unittest.TestCase):
+
+    def setUp(self):
+        self.rp = RecyclePages(Label,
+                               data=[{'text' : str(i)} for i in range(95)])
+
+    def test_init(self):
+        self.assertEqual(len(self.rp.slides), 10)
+        self.assertEqual(self.rp._filled, set([0, 1]))
+        self.assertEqual(len(self.rp.slides[2].children), 0)
+
+    def test_index(self):
+        self.rp.index = 9
+        self.assertEqual(self.rp._filled, set([8, 9]))
+        self.assertEqual(len(self.rp.slides[9].children), 5)
+        self.assertEqual(len(self.rp.slides[0].children), 0)
+
+    def test_refresh(self):
+        self.rp.data[0]['text'] = "changed"
+        self.rp.refresh()
+        self.assertEqual(self.rp.slides[0].children[-1].text, "changed")
+
+
+if __name__ == "__main__":
+    unittest.main()
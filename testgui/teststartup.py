@@ -0,0 +1,67 @@
+import unittest
+
+from gui.startup import StartupProfile
+
+
+class DummyScreen(object):
+    def __init__(self, name, **kwargs):
+        self.name = name
+        self.kwargs = kwargs
+
+
+class TestStartupProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.p = StartupProfile()
+
+    def test_init(self):
+        self.assertEqual(self.p.imports, [])
+        self.assertEqual(self.p.loads, [])
+        self.assertEqual(self.p.builds, [])
+        self.assertIs(self.p.first_frame, None)
+
+    def test_load_class(self):
+        self.assertFalse(self.p.is_loaded('gui.startup'))
+        cls = self.p.load_class('gui.startup', 'StartupProfile')
+        self.assertIs(cls, StartupProfile)
+        self.assertTrue(self.p.is_loaded('gui.startup'))
+        self.assertEqual(len(self.p.imports), 1)
+        self.assertEqual(self.p.imports[0][0], 'gui.startup')
+
+    def test_load_class_cached(self):
+        self.p.load_class('gui.startup', 'StartupProfile')
+        self.p.load_class('gui.startup', 'StartupProfile')
+        self.assertEqual(len(self.p.imports), 1)
+
+    def test_load_class_missing(self):
+        self.assertRaises(ImportError, self.p.load_class,
+                          'gui.no_such_module', 'Screen')
+        self.assertFalse(self.p.is_loaded('gui.no_such_module'))
+
+    def test_build(self):
+        screen = self.p.build('test', DummyScreen, value=3)
+        self.assertEqual(screen.name, 'test')
+        self.assertEqual(screen.kwargs, {'value' : 3})
+        self.assertEqual([n for n, t in self.p.builds], ['test'])
+
+    def test_time(self):
+        self.assertEqual(self.p.time("sum", sum, [1, 2, 3]), 6)
+        self.assertEqual(self.p.loads[0][0], "sum")
+        self.assertGreaterEqual(self.p.loads[0][1], 0)
+
+    def test_first_frame(self):
+        self.p.mark_first_frame()
+        first = self.p.first_frame
+        self.assertGreaterEqual(first, 0)
+        self.p.mark_first_frame()
+        self.assertEqual(self.p.first_frame, first)
+
+    def test_report(self):
+        self.p.time("sum", sum, [1, 2, 3])
+        self.p.build('test', DummyScreen)
+        self.p.mark_first_frame()
+        report = self.p.report()
+        self.assertIn("first frame", report)
+        self.assertIn("sum", report)
+        self.assertIn("test", report)
+        self.assertIn("Imports:\n  (none)", report)
@@ -1,10 +1,15 @@
 import os
+import random
 import unittest
+try:
+    from unittest import mock
+except ImportError:  # Python 2.x
+    import mock
 
-from rendezvous import GameSettings, Alignment
+from rendezvous import GameSettings, Alignment, MemoryStorage, Storage
 from rendezvous.deck import SpecialCard, Card
 from rendezvous.specials import Application
-from rendezvous.gameplay import Scoreboard, Gameboard
+from rendezvous.gameplay import Scoreboard, Gameboard, RendezVousGame
 from rendezvous.statistics import Statistics, BaseStats
 from rendezvous.achievements import *
 
@@ -562,6 +567,15 @@ class TestAchievementCheck(unittest.TestCase):
         self.score = Scoreboard(DummyDeckDefinition())
         self.stats = Statistics()
 
+    def test_check_three_players(self):
+        """Verify scores are checked against the best other player."""
+        self.score.scores = [[10, 30], [20, 0], [0, 10]]
+        self.a._parse_code("Boyfriend Win")
+        self.assertFalse(self.a.check(self.score, 0, self.stats))
+        self.a = Achievement('Test')
+        self.a._parse_code("Girlfriend Win")
+        self.assertTrue(self.a.check(self.score, 0, self.stats))
+
     def test_check_play_less(self):
         self.a._parse_code("Play 1")
         self.stats.base.played = 0
@@ -1359,6 +1373,127 @@ class TestAchievementList(unittest.TestCase):
         self.assertTrue(self.a.unlocked("Invalid SpecialCard"))
 
 
+class TestAchievementProgress(unittest.TestCase):
+
+    """Verify progress toward Achievements is kept as they're checked."""
+
+    CODES = ["Each Win", "Any Lose", "One Draw", "Total >= 30",
+             "Enemy Total == 0", "Only SUIT1", "SUIT1 >= SUIT2",
+             "Boyfriend or Girlfriend < 5", "ENEMY ANY >= 10",
+             "Match Win", "Match Lose 2", "Match enemy Draw",
+             "Use 2 Boyfriend", "Wait 2 Any", "Use Any >= 5",
+             "Total Win", "Total Lose", "Total Draw"]
+
+    def setUp(self):
+        self.storage = MemoryStorage(Storage)
+        self.a = AchievementList(storage=self.storage)
+        self.stats = Statistics(storage=self.storage)
+
+    def test_stats(self):
+        """Verify Statistics Achievements count toward their goal."""
+        a = Achievement('Test', code=["Play 5", "Streak 3"])
+        self.stats.base.played = 3
+        self.stats.base.win_streak = 2
+        self.assertEqual(a.progress(None, 0, self.stats), [3, 2])
+        self.assertEqual([c.goal for c in a.criteria], [5, 3])
+
+    def test_score_margin(self):
+        """Verify Score Achievements give the margin met (or missed)."""
+        a = Achievement('Test', code="Each Win")
+        score = Scoreboard(DummyDeckDefinition())
+        score.scores = [[5, 3], [4, 1]]
+        self.assertEqual(a.progress(score, 0, self.stats), [0])
+        self.assertEqual(a.progress(score, 1, self.stats), [-3])
+
+    def test_matches_check(self):
+        """Verify the goal is reached exactly when the check passes."""
+        criteria = [c for a in self.a for c in a.criteria]
+        criteria += [AchievementCriterion(code) for code in self.CODES]
+        game = RendezVousGame(rng=random.Random(3))
+        game.new_game()
+        while True:
+            for p in range(GameSettings.NUM_PLAYERS):
+                hand = game.players[p]
+                play = hand.AI_easy(p, game.board, game.score)
+                for card in play:
+                    hand.remove(card)
+                game.board.play_cards(p, play)
+            game.score_round()
+            for p in range(GameSettings.NUM_PLAYERS):
+                for crit in criteria:
+                    value = crit.progress_round(game.board, p)
+                    self.assertEqual(value is not None and value >= crit.goal,
+                                     crit.check_round(game.board, p),
+                                     crit.describe())
+            if game.next_round():
+                break
+        rng = random.Random(5)
+        for i in range(50):
+            for scores in game.score.scores:
+                scores[:] = [rng.randint(-10, 10) for s in scores]
+            for crit in criteria:
+                value = crit.progress(game.score, 0, self.stats)
+                self.assertEqual(value is not None and value >= crit.goal,
+                                 crit.check(game.score, 0, self.stats),
+                                 crit.describe())
+
+    def test_kept(self):
+        """Verify progress is kept as each game is checked, and saved."""
+        name = "RendezVous Beginner"
+        self.assertEqual(self.a.progress(name), [(None, 1)])
+        game = RendezVousGame(rng=random.Random(3))
+        game.new_game()
+        self.a.check(game.score, 0, self.stats)
+        self.assertEqual(self.a.progress(name), [(0, 1)])
+        self.stats.record_game("Standard", game.score, 0)
+        self.assertEqual(self.a.progress("RendezVous Student"), [(0, 5)])
+        self.a.check(game.score, 0, self.stats)
+        self.assertEqual(self.a.progress("RendezVous Student"), [(1, 5)])
+
+        # Saved with the player's other files
+        self.assertFalse(os.path.exists(os.path.join("player",
+                                                     "progress.txt")))
+        other = AchievementList(storage=self.storage)
+        self.assertEqual(other.progress("RendezVous Student"), [(1, 5)])
+        self.assertEqual(other._progress, self.a._progress)
+
+    def test_best_kept(self):
+        """Verify the best progress seen is kept."""
+        achievement = Achievement('Test', code="Total >= 30")
+        self.a._deck_available = [achievement]
+        score = Scoreboard(DummyDeckDefinition())
+        score.scores = [[10, 10], [0, 0]]
+        self.a.check(score, 0, self.stats)
+        score.scores = [[0, 5], [0, 0]]
+        self.a.check(score, 0, self.stats)
+        self.assertEqual(self.a.progress(achievement), [(-10, 0)])
+
+    def test_saved_per_game(self):
+        """Verify round progress is saved with the game, or when asked."""
+        game = RendezVousGame(rng=random.Random(3))
+        game.new_game()
+        for p in range(GameSettings.NUM_PLAYERS):
+            hand = game.players[p]
+            play = hand.AI_easy(p, game.board, game.score)
+            for card in play:
+                hand.remove(card)
+            game.board.play_cards(p, play)
+        game.score_round()
+        with mock.patch.object(self.a, '_write_progress',
+                               wraps=self.a._write_progress) as write:
+            self.a.check_round(game.board, 0)
+            self.assertIsNotNone(self.a.progress("Perfect Vision")[0][0])
+            self.assertEqual(write.call_count, 0)
+            self.a.save_progress()
+            self.assertEqual(write.call_count, 1)
+            self.a.save_progress()  # nothing new to save
+            self.assertEqual(write.call_count, 1)
+            self.a.check(game.score, 0, self.stats)
+            self.assertEqual(write.call_count, 2)
+        other = AchievementList(storage=self.storage)
+        self.assertEqual(other._progress, self.a._progress)
+
+
 class TestPerfectGame(unittest.TestCase):
     
     def setUp(self):
@@ -1,16 +1,34 @@
 import unittest
 import copy
-
-from rendezvous.deck import Card, SpecialCard
+import random
+try:
+    from unittest import mock
+except ImportError:  # Python 2.x
+    import mock
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from rendezvous.deck import Card, SpecialCard, DeckDefinition
 from rendezvous.specials import Requirement, Application, Effect
-from rendezvous import EffectType
+from rendezvous import EffectType, Operator
 from rendezvous.dealer import *
+from rendezvous.gameplay import RendezVousGame
+
+
+def use_default_weights(test):
+    """Value plays by the hand-tuned weights (not any tuned since)."""
+    patcher = mock.patch.object(PossiblePlay, 'weights', DEFAULT_WEIGHTS)
+    patcher.start()
+    test.addCleanup(patcher.stop)
 
 
 class TestPossiblePlay(unittest.TestCase):
 
     def setUp(self):
         """Generate a basic, blank object to test with."""
+        use_default_weights(self)
         self.board = [[None] * 4, [None] * 4]
         self.score = [[0] * 5, [0] * 5]
         self.hand = [Card("Suit", i+1) for i in range(10)]
@@ -162,6 +180,16 @@ class TestPossiblePlay(unittest.TestCase):
         """Simple value is the sum of the values."""
         self.assertEqual(self.p.value, 10)
 
+    def test_calculate_weights(self):
+        """Value is the weighted sum of the features."""
+        p = PossiblePlay(self.cards, self.board, self.score, self.hand, 0,
+                         weights=[2] * len(FEATURES))
+        self.assertEqual(p.value, 2 * sum(p.features()))
+
+    def test_load_weights_missing(self):
+        """Fall back on the hand-tuned weights."""
+        self.assertEqual(load_weights("no such file"), DEFAULT_WEIGHTS)
+
     def test_calculate_special_bonus(self):
         """10-point bonus just for playing a special."""
         sc = SpecialCard("Bonus", "Test Bonus", Requirement(),
@@ -340,6 +368,7 @@ class TestAI(unittest.TestCase):
     """High-level testing of play selection."""
 
     def setUp(self):
+        use_default_weights(self)
         self.hand = [Card("Suit", i+1) for i in range(10)]
         self.board = [[None] * 4, [None] * 4]
         self.score = [[0] * 5, [0] * 5]
@@ -669,3 +698,118 @@ class TestAI(unittest.TestCase):
         self.assertEqual(sorted(self.ai.get_best_play()),
                          [complex, Card("Suit", 1), Card("Other", 8),
                           Card("Other", 9)])
+
+
+class TestHandAnalysis(unittest.TestCase):
+
+    """The analysis answers as the Requirement and Application would."""
+
+    def setUp(self):
+        self.hand = [Card("Suit", i + 1) for i in range(6)]
+        self.hand += [Card("Other", i + 1) for i in range(4)]
+        self.analysis = HandAnalysis(self.hand)
+        suit = Application(suits=["Suit"])
+        low = Application(max_value=3)
+        self.applications = [suit, low, suit | low, suit & low,
+                             Application(alignment=Alignment.ENEMY)]
+        self.requirements = [Requirement(),
+                             Requirement(count=2, style=suit),
+                             Requirement(operator=Operator.NO_MORE_THAN,
+                                         count=4, style=low),
+                             Requirement(operator=Operator.EXACTLY, count=3,
+                                         style=suit & low),
+                             (Requirement(count=7, style=suit) |
+                              Requirement(count=1, style=low)),
+                             (Requirement(count=1, style=suit) &
+                              Requirement(count=1, style=low))]
+
+    def check(self):
+        """Compare every answer against the uncached Requirement/Application."""
+        held = [Card("Suit", 2), None, Card("Other", 9)]
+        for application in self.applications:
+            self.assertEqual(
+                self.analysis.filter(application, self.hand),
+                application.filter(Alignment.FRIENDLY, self.hand))
+        for requirement in self.requirements:
+            self.assertEqual(
+                self.analysis.required(requirement, self.hand),
+                requirement.filter(Alignment.FRIENDLY, self.hand))
+            self.assertEqual(
+                self.analysis.verify(requirement, held),
+                requirement.verify(self.hand + held))
+
+    def test_match(self):
+        """Verify a fresh analysis matches the Requirement and Application."""
+        self.check()
+
+    def test_add_discard(self):
+        """Verify the analysis keeps up as cards leave and join the hand."""
+        self.check()
+        gone = self.hand[1:4]
+        del self.hand[1:4]
+        self.analysis.discard(gone)
+        self.hand += [Card("Suit", 9), Card("Other", 2)]
+        self.analysis.add(self.hand[-2:])
+        self.check()
+
+    def test_sync(self):
+        """Verify sync catches cards replaced or changed in place."""
+        self.check()
+        self.hand[0] = Card("Other", 3)
+        self.hand[5].value = 1
+        del self.hand[-1]
+        self.analysis.sync(self.hand)
+        self.check()
+
+
+@unittest.skipIf(numpy is None, "batched scoring needs NumPy")
+class TestBestPlays(unittest.TestCase):
+
+    """Batched decisions match those made one at a time."""
+
+    def games(self):
+        definition = DeckDefinition()
+        games = []
+        for seed in range(12):
+            game = RendezVousGame(deck=definition, rng=random.Random(seed))
+            game.new_game()
+            if seed % 2:  # facing the player's cards, some held
+                game.board.play_cards(1, game.players[1].cards[:4])
+                game.board[1][seed % 4] = None
+            games.append(game)
+        return games
+
+    def check(self, weights=None):
+        batched, single = self.games(), self.games()
+        plays = best_plays([(0, game.players[0], game.board, game.score,
+                             game.rng) for game in batched], weights)
+        for play, game, b in zip(plays, single, batched):
+            ai = ArtificialIntelligence(0, game.players[0], game.board,
+                                        game.score, game.rng, weights)
+            self.assertEqual([str(card) for card in play],
+                             [str(card) for card in ai.get_best_play()])
+            self.assertEqual([str(card) for card in game.players[0]],
+                             [str(card) for card in b.players[0]])
+            self.assertEqual(game.rng.getstate(), b.rng.getstate())
+
+    def test_match_single(self):
+        """Verify each play is the one get_best_play chooses."""
+        self.check()
+
+    def test_fractional_weights(self):
+        """Verify fractional weights value (and tie) plays alike."""
+        self.check([weight * 0.37 + 0.1 for weight in DEFAULT_WEIGHTS])
+
+    def test_no_play(self):
+        """Verify None where no play is possible, and [] on a full board."""
+        impossible = SpecialCard("Impossible", "Can't play!",
+                                 Requirement(count=5, style=Application()),
+                                 Application(),
+                                 Effect(EffectType.BUFF, 2))
+        hand = [copy.copy(impossible) for i in range(10)]
+        full = [Card("Suit", i + 1) for i in range(4)]
+        board = [[None] * 4, [None] * 4]
+        score = [[0] * 5, [0] * 5]
+        self.assertEqual(best_plays([(0, hand, board, score, None),
+                                     (0, hand, [full, full], score, None)]),
+                         [None, []])
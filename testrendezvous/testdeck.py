@@ -1,3 +1,4 @@
+import copy
 import unittest
 
 from rendezvous import SpecialSuit, SpecialValue
@@ -219,7 +220,39 @@ class TestSpecialEffects(unittest.TestCase):
         self.assertEqual(self.card.value, 5)
         self.assertEqual(self.card.name, "My Suit 5")
         self.assertEqual(self.card.description, "A normal My Suit card with value 5.")
-        
+
+    def test_snapshot_restore(self):
+        """Verify effects are undone back to a snapshot, and only so far."""
+        self.card.apply(Effect(EffectType.BUFF, 2))
+        snapshot = self.card.snapshot()
+        self.card.apply(Effect(EffectType.MULTIPLY, 2))
+        self.card.apply(Effect(EffectType.REPLACE, "New Suit"))
+        self.card.restore(snapshot)
+        self.assertEqual(self.card.suit, "My Suit")
+        self.assertEqual(self.card.value, 7)
+        self.assertEqual(self.card.description, "Test.  Buffed to 7.")
+        self.card.apply(Effect(EffectType.KISS))
+        self.card.restore(snapshot)
+        self.assertEqual(self.card.description, "Test.  Buffed to 7.")
+
+    def test_clone_source_changes(self):
+        """Verify a clone keeps the suit and value cloned at the time."""
+        source = Card("New Suit", 10)
+        self.card.apply(Effect(EffectType.CLONE, source))
+        source.apply(Effect(EffectType.BUFF, -5))
+        self.assertEqual(self.card.value, 10)
+        self.assertEqual(self.card.description, "Test.  Cloned to New Suit 10.")
+
+    def test_copy(self):
+        """Verify a copy is affected separately."""
+        self.card.apply(Effect(EffectType.BUFF, 2))
+        other = copy.copy(self.card)
+        other.apply(Effect(EffectType.BUFF, 2))
+        self.card.reset()
+        self.assertEqual(other.value, 9)
+        self.assertEqual(other.description, "Test.  Buffed to 7.  Buffed to 9.")
+        self.assertEqual(self.card.value, 5)
+
 
 class TestSpecialCard(unittest.TestCase):
 
@@ -295,6 +328,27 @@ class TestDeck(unittest.TestCase):
         self.assertEqual(self.d.draw(), Card("Suit", 11))
         self.assertIn(self.d.draw().suit, ["Boyfriend", "Girlfriend", "Spy", "Counterspy", "Time", SpecialSuit.SPECIAL])
 
+    def test_rng(self):
+        """Verify the deck shuffles with its own rng."""
+        import random
+        first = Deck(DeckDefinition(), rng=random.Random(5))
+        second = Deck(DeckDefinition(), rng=random.Random(5))
+        self.assertEqual(first._cards, second._cards)
+        first.shuffle()
+        second.shuffle()
+        self.assertEqual(first._cards, second._cards)
+
+    def test_snapshot(self):
+        """Verify the deck returns to the same order and position."""
+        self.d.draw()
+        snapshot = self.d.snapshot()
+        self.assertEqual(self.d.draw(False), Card("Suit", 4))
+        self.d.shuffle()
+        self.d.restore(snapshot)
+        self.assertEqual(self.d.draw(False), Card("Suit", 4))
+        self.assertEqual(self.d.draw(False), Card("Suit", 11))
+        self.assertRaises(StopIteration, self.d.draw, False)
+
 
 class TestDeckDefinition(unittest.TestCase):
 
@@ -556,7 +610,43 @@ class TestDeckCatalog(unittest.TestCase):
         self.catalog.purchase("Standard")
         self.catalog = DeckCatalog("test_deck_catalog.txt")
         self.assertEqual(self.catalog._purchased, ["Lovers & Spies Deck"])
-        
+
+    def test_nearby_standard(self):
+        self.assertEqual(self.catalog.nearby("Standard"), [])
+
+
+class TestDeckCatalogNearby(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.mkdtemp()
+        for base in ["Standard", "Alpha", "Beta", "Gamma"]:
+            f = open(os.path.join(self.directory, base + ".txt"), 'w')
+            f.write("[DECK-NAME]%s Deck\n[DECK-DESC]Test\n[SUIT]Test\n" % base)
+            f.close()
+        self.catalog = DeckCatalog("test_deck_catalog.txt", self.directory)
+        self.decks = self.catalog.decks
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.directory)
+        os.remove("test_deck_catalog.txt")
+
+    def test_nearby_purchased(self):
+        for deck in self.decks:
+            self.catalog.purchase(deck)
+        self.assertEqual(self.catalog.nearby(self.decks[1]),
+                         [self.decks[2], self.decks[0]])
+        self.assertEqual(self.catalog.nearby(self.decks[0], 3),
+                         self.decks[1:])
+
+    def test_nearby_skips_unpurchased(self):
+        standard = self.catalog["Standard"]
+        others = [deck for deck in self.decks if deck != standard]
+        self.catalog.purchase(others[0])
+        self.assertEqual(self.catalog.nearby(others[0]), [standard])
+        self.assertEqual(self.catalog.nearby(standard), [others[0]])
+
         
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+
+from rendezvous import Currency, Storage, MemoryStorage
+from rendezvous.deck import DeckDefinition
+from rendezvous.gameplay import Scoreboard
+from rendezvous.economy import *
+
+
+class TestFreshAchievements(unittest.TestCase):
+
+    def test_fresh(self):
+        template = AchievementList(deck="Standard",
+                                   storage=MemoryStorage(Storage))
+        storage = MemoryStorage()
+        achievements = fresh_achievements(template, storage)
+        achievements.achieve(achievements.available[0])
+        self.assertEqual(len(achievements.achieved), 1)
+        self.assertEqual(template.achieved, [])
+        self.assertTrue(storage.files)
+        self.assertEqual(fresh_achievements(template, storage).achieved, [])
+
+
+class TestRewards(unittest.TestCase):
+
+    def setUp(self):
+        self.score = Scoreboard(DeckDefinition())
+        self.score.scores = [[0] * 5, [10, 10, 10, 0, 0]]
+        storage = MemoryStorage(Storage)
+        self.stats = Statistics(storage=storage)
+        self.achievements = AchievementList(storage=storage)
+        self.winks = Currency('wink', "", storage=storage)
+        self.kisses = Currency('kiss', "", storage=storage)
+
+    def test_reward_game(self):
+        achieved = reward_game("Standard", self.score, PLAYER, self.stats,
+                               self.achievements, self.winks, self.kisses)
+        self.assertEqual(self.winks.balance, 4)  # 3 suits and the game
+        self.assertEqual(self.stats.base.wins, 1)
+        self.assertTrue(achieved)
+        extra = len([a for a in achieved if a.reward is None])
+        self.assertEqual(self.kisses.balance, len(achieved) + extra)
+
+    def test_reward_game_lost(self):
+        self.score.scores = [[20, 20, 20, 20, 0], [10, 10, 10, 0, 0]]
+        reward_game("Standard", self.score, PLAYER, self.stats,
+                    self.achievements, self.winks, self.kisses)
+        self.assertEqual(self.winks.balance, 0)
+
+
+class TestEconomyStats(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = EconomyStats(3)
+        self.stats.rewards = {'First' : "Card", 'Second' : None}
+        self.stats.add_player({'First' : 1}, {'wink' : [2, 4, 6],
+                                              'kiss' : [0, 1, 1]}, 2)
+        self.stats.add_player({'First' : 3, 'Second' : 2},
+                              {'wink' : [0, 1, 10], 'kiss' : [1, 1, 5]}, 1)
+
+    def test_add_player(self):
+        self.assertEqual(self.stats.players, 2)
+        self.assertEqual(self.stats.won, 3)
+        self.assertEqual(self.stats.unlocks['First'], {1 : 1, 3 : 1})
+        self.assertEqual(self.stats.balances['wink'][2], {6 : 1, 10 : 1})
+
+    def test_merge(self):
+        other = EconomyStats(3)
+        other.add_player({'Second' : 2}, {'wink' : [1, 1, 1],
+                                          'kiss' : [0, 0, 0]}, 0)
+        self.stats.merge(other)
+        self.assertEqual(self.stats.players, 3)
+        self.assertEqual(self.stats.unlocks['Second'], {2 : 2})
+        self.assertEqual(self.stats.balances['wink'][0], {2 : 1, 0 : 1, 1 : 1})
+
+    def test_unlock(self):
+        self.assertEqual(self.stats.unlock('First'), (1.0, [1, 1, 3]))
+        self.assertEqual(self.stats.unlock('Second'), (0.5, [2, 2, None]))
+        self.assertEqual(self.stats.unlock('Never'), (0, [None] * 3))
+
+    def test_balance(self):
+        self.assertEqual(self.stats.balance('wink', 3), [6, 6, 10])
+
+    def test_afford(self):
+        self.assertEqual(self.stats.afford('wink', 4), 2)
+        self.assertEqual(self.stats.afford('wink', 10, 1.0), None)
+        self.assertEqual(self.stats.afford('kiss', 5, 0.5), 3)
+
+    def test_report(self):
+        report = self.stats.report()
+        self.assertIn('First', report)
+        self.assertIn('Hand Tipper', report)
+
+
+class TestSimulate(unittest.TestCase):
+
+    def test_split(self):
+        """Verify the totals are the same however the players are split."""
+        one = simulate(players=2, games=2, processes=1, batch=2)
+        two = simulate(players=2, games=2, processes=1, batch=1)
+        self.assertEqual(one.players, 2)
+        self.assertEqual((one.won, one.unlocks, one.balances),
+                         (two.won, two.unlocks, two.balances))
+        self.assertTrue(one.unlocks)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import re
+import time
+import warnings
+import unittest
+
+import rendezvous
+from rendezvous import FileReader, MemoryStorage
+
+
+class TestFileReader(unittest.TestCase):
+
+    LINES = ["[TAG]Value", "  [lower] spaced value  ", "[]", "[A]]B]C",
+             "before[TAG]after", "[EMPTY]", "[X]a [b] c"]
+
+    def setUp(self):
+        self.filename = "test_reader.test"
+        self.storage = MemoryStorage(files={self.filename :
+                                            "\n".join(self.LINES)})
+
+    def tearDown(self):
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+    def test_matches_pattern(self):
+        """Verify the tags split just as the old regular expression did."""
+        expected = []
+        for line in self.LINES:
+            match = re.search(r'\[(.*)\](.*)', line.strip())
+            expected.append((match.group(1).strip().upper(),
+                             match.group(2).strip()))
+        self.assertEqual(list(FileReader(self.filename, self.storage)),
+                         expected)
+
+    def test_unexpected(self):
+        self.storage.files[self.filename] = "\n[A]1\nno tag\n]wrong[\n\n[B]2"
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            pairs = list(FileReader(self.filename, self.storage))
+        self.assertEqual(pairs, [("A", "1"), ("B", "2")])
+        self.assertEqual(len(caught), 2)
+
+    def test_not_cached_in_memory(self):
+        list(FileReader(self.filename, self.storage, cached=True))
+        self.storage.files[self.filename] = "[NEW]1"
+        self.assertEqual(list(FileReader(self.filename, self.storage,
+                                         cached=True)), [("NEW", "1")])
+
+    def test_cached(self):
+        with open(self.filename, 'w') as f:
+            f.write("[ONE]1\n")
+        self.assertEqual(list(FileReader(self.filename, cached=True)),
+                         [("ONE", "1")])
+        key = os.path.abspath(self.filename)
+        self.assertIn(key, rendezvous._parsed)
+        pairs = rendezvous._parsed[key][1]
+        self.assertEqual(list(FileReader(self.filename, cached=True)), pairs)
+
+        # Changed files are read again
+        with open(self.filename, 'w') as f:
+            f.write("[TWO]2\n")
+        mtime = time.time() + 10
+        os.utime(self.filename, (mtime, mtime))
+        self.assertEqual(list(FileReader(self.filename, cached=True)),
+                         [("TWO", "2")])
+        del rendezvous._parsed[key]
+
+
+if __name__ == "__main__":
+    unittest.main()
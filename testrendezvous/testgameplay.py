@@ -1,7 +1,10 @@
+import random
 import unittest
+import itertools
 
-from rendezvous.deck import Card, Deck, DeckDefinition
-from rendezvous.specials import Effect
+from rendezvous import GameSettings, Operator, EffectType
+from rendezvous.deck import Card, SpecialCard, Deck, DeckDefinition
+from rendezvous.specials import Effect, Requirement, Application
 from rendezvous.gameplay import *
 
 
@@ -32,6 +35,22 @@ class TestHand(unittest.TestCase):
         self.assertEqual(len(self.hand.cards), 9)
         self.hand.sort()
 
+    def test_analysis(self):
+        """Verify the dealer's analysis follows the hand's cards."""
+        def known():
+            return sorted(self.hand.analysis._cards)
+        def held():
+            return sorted(id(card) for card in self.hand.cards)
+        self.assertEqual(known(), held())
+        self.hand.pop(3)
+        self.hand.remove(self.hand[1])
+        self.hand.extend(iter([Card("Suit", 1)]))
+        self.assertEqual(known(), held())
+        self.hand.refill()
+        self.assertEqual(known(), held())
+        self.hand.flush()
+        self.assertEqual(known(), held())
+
     def test_refill(self):
         """Verify hand is refilled properly after removal of cards."""
         self.hand.cards = self.hand.cards[0:3]
@@ -139,6 +158,110 @@ class TestGameBoard(unittest.TestCase):
         """Minimal test to execute the function."""
         self.board.validate([])
 
+    def test_holds(self):
+        """Verify only held cards are kept."""
+        self.board[0][1] = Card("Test", 1)
+        self.board[0][2] = Card("Test", 2)
+        self.board.wait(0, 2)
+        self.assertEqual(self.board.holds(0), [None, None, Card("Test", 2),
+                                               None])
+
+
+class TestFindPlay(unittest.TestCase):
+
+    def special(self, operator, count, **style):
+        return SpecialCard("Special %s %s" % (operator, count), "Desc",
+                           Requirement(operator=operator, count=count,
+                                       style=Application(**style)),
+                           None, None)
+
+    def test_no_requirements(self):
+        """Verify the first normal cards are played when nothing is held."""
+        special = self.special(Operator.AT_LEAST, 4, min_value=10)
+        cards = [special] + [Card("Test", i) for i in range(1, 6)]
+        self.assertEqual(find_play(cards, [None] * 4), cards[1:5])
+
+    def test_held_requirement(self):
+        """Verify a held special's requirement is met by the play."""
+        held = self.special(Operator.AT_LEAST, 2, min_value=8)
+        cards = [Card("Test", i) for i in range(1, 10)]
+        play = find_play(cards, [None, held, None, None])
+        self.assertEqual(len(play), 3)
+        self.assertEqual(Gameboard.validate(play + [held]), [])
+        self.assertEqual(len([c for c in play if c.value >= 8]), 2)
+
+    def test_special_in_play(self):
+        """Verify specials are played when normal cards run out."""
+        held = self.special(Operator.NO_MORE_THAN, 0, min_value=1)
+        cards = [Card("Test", 5), self.special(Operator.AT_LEAST, 0),
+                 self.special(Operator.AT_LEAST, 1)]
+        play = find_play(cards, [held, None, None, None])
+        self.assertIsNone(play)
+        cards[2] = self.special(Operator.AT_LEAST, 0)
+        cards.append(self.special(Operator.EXACTLY, 0))
+        play = find_play(cards, [held, None, None, None])
+        self.assertEqual(play, cards[1:])
+
+    def test_impossible(self):
+        """Verify None is returned when no play is valid."""
+        held = self.special(Operator.NO_MORE_THAN, 0, min_value=1)
+        cards = [Card("Test", i) for i in range(1, 11)]
+        self.assertIsNone(find_play(cards, [held, None, None, None]))
+        self.assertIsNone(find_play(cards[:2], [None] * 4))
+
+    def test_exhaustive(self):
+        """Verify against trying every combination of a real deck's cards."""
+        rng = random.Random(39)
+        deck = Deck(DeckDefinition(), rng=rng)
+        for trial in range(200):
+            cards = [deck.draw() for i in range(6)]
+            side = [deck.draw() if rng.random() < .25 else None
+                    for i in range(4)]
+            held = [card for card in side if card is not None]
+            needed = side.count(None)
+            possible = any(not Gameboard.validate(list(combo) + held)
+                           for combo in itertools.combinations(cards, needed))
+            play = find_play(cards, side)
+            self.assertEqual(play is not None, possible)
+            if play is not None:
+                self.assertEqual(len(play), needed)
+                self.assertEqual(Gameboard.validate(play + held), [])
+
+    def test_AI_bounded(self):
+        """Verify the AI stops flushing when the holds cannot be met."""
+        hand = Hand(Deck(DeckDefinition()))
+        hand.deck.suits_only()
+        hand.deck.shuffle = hand.deck.suits_only  # no specials when reshuffled
+        hand.flush()
+        board = Gameboard()
+        board[0][0] = self.special(Operator.NO_MORE_THAN, 0, min_value=1)
+        score = Scoreboard(hand.deck.definition)
+        play = hand._any_play(0, board, score)
+        self.assertEqual(len(play), 3)
+        self.assertEqual(Gameboard.validate(play), [])
+        self.assertEqual(score[0][0], -10 * MAX_FLUSHES)
+
+    def test_AI_easy_redraw(self):
+        """Verify the easy AI redraws past invalid specials at no cost."""
+        hand = Hand(Deck(DeckDefinition()))
+        hand.deck.suits_only()
+        hand.deck.shuffle = hand.deck.suits_only  # no specials when reshuffled
+        hand.flush()
+        special = SpecialCard("Never", "Desc",
+                              Requirement(operator=Operator.NO_MORE_THAN,
+                                          count=0,
+                                          style=Application(min_value=1)),
+                              Application(), Effect(EffectType.BUFF, 1))
+        hand.remove(hand[0])
+        hand.cards.insert(0, special)
+        hand.analysis.add([special])
+        score = Scoreboard(hand.deck.definition)
+        play = hand.AI_easy(0, Gameboard(), score)
+        self.assertNotIn(special, play)
+        self.assertEqual(Gameboard.validate(play), [])
+        self.assertEqual(score[0], [0] * len(score[0]))
+        self.assertEqual(len(hand.cards), GameSettings.CARDS_IN_HAND)
+
 
 class TestScoreboard(unittest.TestCase):
 
@@ -193,6 +316,60 @@ class TestScoreboard(unittest.TestCase):
         self.score[0][1] = 10
         self.score[1][1] = -30
         self.assertEqual(self.score.best_suit(0), self.score.suits[1])
+        self.score[1][1] = 0
+        self.assertEqual(self.score.best_suit(0), self.score.suits[0])
+
+    def test_margin(self):
+        """Verify the lead in total and by suit."""
+        self.score[0][0] = 20
+        self.score[1][1] = 30
+        self.assertEqual(self.score.margin(0), -10)
+        self.assertEqual(self.score.margin(1), 10)
+        self.assertEqual(self.score.margin(0, 0), 20)
+        self.assertEqual(self.score.margin(0, "Girlfriend"), -30)
+
+    def test_win_count(self):
+        """Verify the suits won are counted as scores change."""
+        self.score._win(0, "Boyfriend")
+        self.score._win(1, "Spy")
+        self.score[1][-1] += 10
+        self.assertEqual(self.score.win_count(0), 1)
+        self.assertEqual(self.score.win_count(1), 2)
+        self.score._lose(0, "Boyfriend")
+        self.assertEqual(self.score.win_count(0), 0)
+        self.assertEqual(self.score.wins(1), ["Spy", "Time"])
+
+    def test_wrap_around(self):
+        """Verify player -1 is the last player, as with the scores."""
+        self.score[1][0] = 10
+        self.score[0][1] = 20
+        self.assertEqual(self.score.wins(-1), ["Boyfriend"])
+        self.assertEqual(self.score.wins(1), ["Boyfriend"])
+        self.assertEqual(self.score.margin(-1), -10)
+        self.assertEqual(self.score.best_suit(-1), "Boyfriend")
+
+    def test_wins_copy(self):
+        """Verify the cached wins cannot be changed by the caller."""
+        self.score[0][0] = 10
+        self.score.wins(0).append("Spy")
+        self.assertEqual(self.score.wins(0), ["Boyfriend"])
+
+    def test_aggregates(self):
+        """Verify incremental aggregates match a full recalculation."""
+        rng = random.Random(35)
+        for i in range(200):
+            self.score._win(rng.randrange(2), rng.choice(self.score.suits),
+                            rng.choice((-10, 10, 20)))
+        for p in range(2):
+            self.assertEqual(self.score.total(p), sum(self.score[p]))
+            self.assertEqual(self.score.wins(p),
+                             [suit for i, suit in enumerate(self.score.suits)
+                              if self.score[p][i] > self.score[p-1][i]])
+        self.assertEqual(list(self.score), list(zip(*self.score.scores)))
+        self.score.scores = [[1, 2, 3, 4, 5], [5, 4, 3, 2, 1]]
+        self.assertEqual(self.score.total(0), 15)
+        self.assertEqual(self.score.wins(0), ["Counterspy", "Time"])
+        self.assertEqual(self.score.by_suit("Spy"), (3, 3))
 
     def test_win(self):
         """Verify a win."""
@@ -352,6 +529,192 @@ class TestRendezVousGame(unittest.TestCase):
     def test_specials(self):
         pass
 
+    def test_special_plan(self):
+        """Verify the plan lists only the normal cards each side may hit."""
+        s = SpecialCard("Name", "Desc", Requirement(), Application(), Effect())
+        self.game.board.board = [[Card("S", 1), None, s, Card("S", 2)],
+                                 [Card("S", 3), Card("S", 4), s, None]]
+        plan = self.game.plan_specials()
+        self.assertEqual((plan.players, plan.slots), (2, 4))
+        both = frozenset((Alignment.FRIENDLY, Alignment.ENEMY))
+        self.assertEqual(plan.targets(0, both),
+                         [(0, 0, 1), (0, 3, 1), (1, 0, 0), (1, 1, 0)])
+        self.assertEqual(plan.targets(0, both, True),
+                         [(0, 0, 1), (1, 0, 0), (1, 1, 0), (0, 3, 1)])
+        self.assertEqual(plan.targets(1, frozenset((Alignment.ENEMY,))),
+                         [(0, 0, 1), (0, 3, 1)])
+        self.assertIs(plan.targets(0, both), plan.targets(0, both))
+
+    def _play_game(self, seed):
+        game = RendezVousGame(rng=random.Random(seed))
+        game.new_game()
+        while True:
+            for p in range(2):
+                play = game.players[p].AI_hard(p, game.board, game.score)
+                for card in play:
+                    game.players[p].remove(card)
+                game.board.play_cards(p, play)
+            game.score_round()
+            if game.next_round():
+                return game.score.scores
+
+    def test_default_rng(self):
+        """Verify the global random module is used by default."""
+        self.assertIs(self.game.rng, random)
+        for hand in self.game.players:
+            self.assertIs(hand.deck.rng, random)
+
+    def test_rng_shared(self):
+        """Verify the game's rng reaches every deck (even after reload)."""
+        rng = random.Random(1)
+        game = RendezVousGame(rng=rng)
+        game.load_deck(DeckDefinition())
+        for hand in game.players:
+            self.assertIs(hand.deck.rng, rng)
+
+    def test_seeded_game(self):
+        """Verify identical seeds play identical games."""
+        random.seed(1)
+        first = self._play_game(2014)
+        random.seed(2)
+        self.assertEqual(self._play_game(2014), first)
+
+    def _state(self):
+        return ([list(hand.cards) for hand in self.game.players],
+                [[repr(c) for c in side] for side in self.game.board.board],
+                [list(side) for side in self.game.board._wait],
+                [list(player) for player in self.game.score.scores],
+                self.game.round)
+
+    def test_snapshot_restore(self):
+        """Verify the game returns exactly to the snapshot."""
+        self.game.new_game()
+        for p, hand in enumerate(self.game.players):
+            self.game.board.play_cards(p, [hand.pop() for i in range(4)])
+        self.game.board.wait(0, 1)
+        snapshot = self.game.snapshot()
+        before = self._state()
+        self.game.board[1][2].value = 99
+        self.game.score.scores[0][0] = 50
+        self.game.next_round()
+        self.game.players[0].flush()
+        self.assertNotEqual(self._state(), before)
+        self.game.restore(snapshot)
+        self.assertEqual(self._state(), before)
+        self.assertNotEqual(self.game.board[1][2].value, 99)
+
+    def test_restore_hand_effects(self):
+        """Verify specials on cards played after the snapshot are undone."""
+        self.game = RendezVousGame(rng=random.Random(29))
+        self.game.new_game()
+        buff = SpecialCard("Buff", "Desc", Requirement(), Application(),
+                           Effect(EffectType.BUFF, 2))
+        hand = self.game.players[0]
+        hand.cards[:4] = [Card(self.game.score.suits[i], 5) for i in range(3)]
+        hand.cards.insert(3, buff)
+        snapshot = self.game.snapshot()
+        before = [(card, card.snapshot())
+                  for hand in self.game.players for card in hand]
+        for p, hand in enumerate(self.game.players):
+            play = hand.cards[:4]
+            for card in play:
+                hand.remove(card)
+            self.game.board.play_cards(p, play)
+        self.game.score_round()
+        self.assertEqual([card.value for card in self.game.board[0][:3]],
+                         [7, 7, 7])
+        self.game.restore(snapshot)
+        for card, effects in before:
+            self.assertEqual(card.snapshot(), effects)
+            self.assertEqual((card.suit, card.value), card.original)
+
+    def test_restore_deck_position(self):
+        """Verify draws after a restore repeat the same cards."""
+        self.game.new_game()
+        snapshot = self.game.snapshot()
+        drawn = [self.game.players[0].deck.draw() for i in range(5)]
+        self.game.restore(snapshot)
+        self.assertEqual([self.game.players[0].deck.draw() for i in range(5)],
+                         drawn)
+
+    def test_restore_players(self):
+        """Verify switched hands are switched back."""
+        self.game.new_game()
+        players = list(self.game.players)
+        snapshot = self.game.snapshot()
+        self.game.players.reverse()
+        self.game.restore(snapshot)
+        self.assertEqual(self.game.players, players)
+
+    def test_snapshot_immutable(self):
+        """Verify a snapshot can be restored more than once."""
+        self.game.new_game()
+        snapshot = self.game.snapshot()
+        before = self._state()
+        for i in range(2):
+            self.game.players[0].cards.pop()
+            self.game.score.scores[1][1] = -20
+            self.game.restore(snapshot)
+            self.assertEqual(self._state(), before)
+
+
+class TestThreePlayers(unittest.TestCase):
+
+    """Verify a game between more than two players."""
+
+    def setUp(self):
+        self.backup = GameSettings.NUM_PLAYERS
+        GameSettings.NUM_PLAYERS = 3
+        self.game = RendezVousGame(rng=random.Random(36))
+        self.game.new_game()
+
+    def tearDown(self):
+        GameSettings.NUM_PLAYERS = self.backup
+
+    def test_board(self):
+        """Verify there is a hand and a side of the board for each player."""
+        self.assertEqual(len(self.game.players), 3)
+        self.assertEqual(len(list(self.game.board)),
+                         3 * GameSettings.CARDS_ON_BOARD)
+
+    def test_score(self):
+        """Verify each card is scored against the card it faces."""
+        board = self.game.board
+        for p in range(3):
+            board.play_cards(p, [Card("Spy", p + 1) for i in range(4)])
+        self.game.score.score(board)
+        # player 0 loses every match; player 1 wins only in slots 0 and 2
+        self.assertEqual(self.game.score.scores,
+                         [[0, 0, -40, 0, 0], [0, 0, 20, 0, 0],
+                          [0, 0, 80, 0, 0]])
+        self.assertEqual(self.game.score.wins(2), ["Spy"])
+        self.assertEqual(self.game.score.margin(0, "Spy"), -120)
+
+    def test_opponent(self):
+        """Verify each player is measured against the best other player."""
+        self.game.score.scores = [[10, 0, 0, 0, 0], [0, 20, 5, 0, 0],
+                                  [0, 0, 30, 0, 0]]
+        self.assertEqual(self.game.score.opponent(0), 2)
+        self.assertEqual(self.game.score.opponent(2), 1)
+        self.assertEqual(self.game.score.rival(1), 30)
+        self.assertEqual(self.game.score.rival(1, "Spy"), 30)
+        self.assertEqual(self.game.score.rival(2, "Spy"), 5)
+
+    def test_game(self):
+        """Play a full game between three AIs."""
+        while True:
+            for p, hand in enumerate(self.game.players):
+                play = hand.AI_hard(p, self.game.board, self.game.score)
+                for card in play:
+                    hand.remove(card)
+                self.game.board.play_cards(p, play)
+            self.game.score_round()
+            if self.game.next_round():
+                break
+        self.assertLessEqual(sum(self.game.score.win_count(p)
+                                 for p in range(3)),
+                             len(self.game.score.suits))
+
 
 if __name__ == "__main__":
     unittest.main()
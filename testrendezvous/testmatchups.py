@@ -0,0 +1,61 @@
+import unittest
+
+from rendezvous import GameSettings
+from rendezvous.deck import Card
+from rendezvous.matchups import *
+
+
+class TestMatchups(unittest.TestCase):
+
+    def test_two_players(self):
+        """Verify each player faces the other in every slot."""
+        self.assertEqual(matchups(2, 4), ((1, 1, 1, 1), (0, 0, 0, 0)))
+
+    def test_three_players(self):
+        """Verify opponents rotate from slot to slot."""
+        self.assertEqual(matchups(3, 4), ((2, 1, 2, 1),
+                                          (0, 2, 0, 2),
+                                          (1, 0, 1, 0)))
+
+    def test_faced_once(self):
+        """Verify every player is faced exactly once in each slot."""
+        for players in range(2, 7):
+            table = matchups(players, 6)
+            for i in range(6):
+                opponents = sorted(table[p][i] for p in range(players))
+                self.assertEqual(opponents, list(range(players)))
+                for p in range(players):
+                    self.assertNotEqual(table[p][i], p)
+
+    def test_one_player(self):
+        """Verify a lone player faces their own cards."""
+        self.assertEqual(matchups(1, 2), ((0, 0),))
+
+    def test_cached(self):
+        """Verify each size of table is built only once."""
+        self.assertIs(matchups(4, 4), matchups(4, 4))
+
+    def test_default(self):
+        """Verify the default size comes from GameSettings."""
+        self.assertIs(matchups(), matchups(GameSettings.NUM_PLAYERS,
+                                           GameSettings.CARDS_ON_BOARD))
+
+    def test_opposing(self):
+        """Verify the cards faced are picked from each slot's opponent."""
+        board = [[Card("A", i) for i in range(1, 5)],
+                 [Card("B", i) for i in range(1, 5)],
+                 [Card("C", i) for i in range(1, 5)]]
+        self.assertEqual(opposing(board, 0),
+                         [board[2][0], board[1][1], board[2][2], board[1][3]])
+        self.assertEqual(opposing(board[:2], 1), board[0])
+
+    def test_rival(self):
+        """Verify the best of the other players' values is returned."""
+        self.assertEqual(rival([5, 3], 0), 3)
+        self.assertEqual(rival([5, 3, 8], 2), 5)
+        self.assertEqual(rival([5, 3, 8], -1), 5)
+        self.assertEqual(rival([5], 0), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import random
+import unittest
+
+from rendezvous import Metrics, GameSettings
+from rendezvous.gameplay import RendezVousGame
+from rendezvous.metrics import *
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.hub = Instrumentation()
+        self.events = []
+
+    def callback(self, kind, name, value):
+        self.events.append((kind, name, value))
+
+    def test_init(self):
+        self.assertFalse(self.hub.active)
+
+    def test_inactive(self):
+        self.hub.count('test')
+        with self.hub.timer('test'):
+            pass
+        self.assertIs(self.hub.timer('test'), self.hub.timer('other'))
+        self.assertEqual(self.events, [])
+
+    def test_subscribe(self):
+        self.hub.subscribe(self.callback)
+        self.assertTrue(self.hub.active)
+        self.hub.count('test', 3)
+        self.assertEqual(self.events, [(COUNT, 'test', 3)])
+
+    def test_unsubscribe(self):
+        self.hub.subscribe(self.callback)
+        self.hub.unsubscribe(self.callback)
+        self.hub.unsubscribe(self.callback)  # no error
+        self.assertFalse(self.hub.active)
+        self.hub.count('test')
+        self.assertEqual(self.events, [])
+
+    def test_timer(self):
+        self.hub.subscribe(self.callback)
+        with self.hub.timer('test'):
+            pass
+        self.assertEqual(len(self.events), 1)
+        kind, name, value = self.events[0]
+        self.assertEqual((kind, name), (TIME, 'test'))
+        self.assertGreaterEqual(value, 0)
+
+    def test_timer_exception(self):
+        self.hub.subscribe(self.callback)
+        def fail():
+            with self.hub.timer('test'):
+                raise IndexError
+        self.assertRaises(IndexError, fail)
+        self.assertEqual(self.events[0][1], 'test')
+
+
+class TestMetricsSink(unittest.TestCase):
+
+    def setUp(self):
+        self.sink = MetricsSink()
+
+    def test_count(self):
+        self.sink(COUNT, 'test', 1)
+        self.sink(COUNT, 'test', 2)
+        self.assertEqual(self.sink.counts, {'test' : 3})
+
+    def test_time(self):
+        self.sink(TIME, 'test', 0.5)
+        self.sink(TIME, 'test', 1.5)
+        self.assertEqual(self.sink.timings, {'test' : [2, 2.0, 1.5]})
+
+    def test_reset(self):
+        self.sink(COUNT, 'test', 1)
+        self.sink.reset()
+        self.assertEqual(self.sink.counts, {})
+
+    def test_report(self):
+        self.sink(COUNT, 'count', 1)
+        self.sink(TIME, 'time', 0.5)
+        report = self.sink.report()
+        self.assertIn('count', report)
+        self.assertIn('time', report)
+
+
+class TestEngineMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.sink = Metrics.subscribe(MetricsSink())
+
+    def tearDown(self):
+        Metrics.unsubscribe(self.sink)
+
+    def test_game(self):
+        game = RendezVousGame(rng=random.Random(7))
+        game.new_game()
+        for p, hand in enumerate(game.players):
+            play = hand.AI_hard(p, game.board, game.score)
+            for card in play:
+                hand.remove(card)
+            game.board.play_cards(p, play)
+        game.score_round()
+        counts = self.sink.counts
+        self.assertGreaterEqual(counts['deck.shuffle'], 2)
+        self.assertGreaterEqual(counts['hand.flush'], 2)
+        self.assertGreaterEqual(counts['ai.candidates'], counts['ai.evaluated'])
+        self.assertGreaterEqual(counts['ai.evaluated'], 2)
+        self.assertEqual(self.sink.timings['game.score_round'][0], 1)
+        self.assertEqual(self.sink.timings['game.apply_specials'][0], 1)
+        specials = [card for card in game.board if card.value == -99999]
+        self.assertEqual(sum(v for k, v in counts.items()
+                             if k.startswith('special.')), len(specials))
@@ -0,0 +1,116 @@
+import random
+import unittest
+
+from rendezvous.deck import DeckDefinition, Card
+from rendezvous.gameplay import RendezVousGame
+from rendezvous.planner import DealerPlanner
+
+
+class TestDealerPlanner(unittest.TestCase):
+
+    def setUp(self):
+        definition = DeckDefinition()
+        self.games = [RendezVousGame(deck=definition, rng=random.Random(38))
+                      for i in range(2)]
+        for game in self.games:
+            game.new_game()
+
+    def play_round(self, game, play):
+        """Play these dealer cards and the player's first, then score."""
+        dealer, player = game.players
+        for card in play:
+            dealer.remove(card)
+        game.board.play_cards(0, play)
+        cards = player.AI_easy(1, game.board, game.score)
+        for card in cards:
+            player.remove(card)
+        game.board.play_cards(1, cards)
+        game.score_round()
+        return game.next_round()
+
+    def test_same_play(self):
+        """Verify planned plays match those chosen on the spot."""
+        planner = DealerPlanner(difficulty=2)
+        planned, direct = self.games
+        while True:
+            planner.plan(0, planned.players[0], planned.board, planned.score)
+            one = planner.take(0, planned.players[0], planned.board,
+                               planned.score)
+            two = direct.players[0].AI_hard(0, direct.board, direct.score)
+            self.assertEqual(one, two)
+            self.assertEqual(planned.players[0].cards,
+                             direct.players[0].cards)
+            self.assertEqual(planned.players[0].deck.rng.getstate(),
+                             direct.players[0].deck.rng.getstate())
+            over = self.play_round(planned, one)
+            self.assertEqual(over, self.play_round(direct, two))
+            if over:
+                break
+        self.assertEqual(planned.score.scores, direct.score.scores)
+
+    def test_cards_from_hand(self):
+        """Verify the play is made of the hand's own Cards, not copies."""
+        planner = DealerPlanner(difficulty=2)
+        game = self.games[0]
+        planner.plan(0, game.players[0], game.board, game.score)
+        play = planner.take(0, game.players[0], game.board, game.score)
+        for card in play:
+            self.assertTrue(any(card is c for c in game.players[0]))
+
+    def test_stale_plan(self):
+        """Verify a plan is not used once the inputs change."""
+        planner = DealerPlanner(difficulty=2)
+        game = self.games[0]
+        planner.plan(0, game.players[0], game.board, game.score)
+        game.players[0].cards[0] = Card(game.players[0][0].suit, 10)
+        planner._plan.thread.join()
+        planner._plan.play = []  # would be used, if not stale
+        play = planner.take(0, game.players[0], game.board, game.score)
+        self.assertEqual(len(play), game.board[0].count(None))
+
+    def test_replan(self):
+        """Verify planning twice for the same inputs starts one worker."""
+        planner = DealerPlanner(difficulty=2)
+        game = self.games[0]
+        planner.plan(0, game.players[0], game.board, game.score)
+        plan = planner._plan
+        planner.plan(0, game.players[0], game.board, game.score)
+        self.assertIs(planner._plan, plan)
+        game.score[1][0] += 10
+        planner.plan(0, game.players[0], game.board, game.score)
+        self.assertIsNot(planner._plan, plan)
+
+    def test_easy(self):
+        """Verify AI_easy is simply used directly."""
+        planner = DealerPlanner(difficulty=1)
+        game = self.games[0]
+        planner.plan(0, game.players[0], game.board, game.score)
+        self.assertIsNone(planner._plan)
+        self.assertEqual(planner.take(0, game.players[0], game.board,
+                                      game.score),
+                         self.games[1].players[0].AI_easy(
+                             0, self.games[1].board, self.games[1].score))
+
+    def test_ready(self):
+        """Verify ready only once a current plan has finished."""
+        planner = DealerPlanner(difficulty=2)
+        game = self.games[0]
+        args = (0, game.players[0], game.board, game.score)
+        self.assertFalse(planner.ready(*args))
+        planner.plan(*args)
+        planner._plan.thread.join()
+        self.assertTrue(planner.ready(*args))
+        game.players[0].deck.rng.random()
+        self.assertFalse(planner.ready(*args))
+        self.assertTrue(DealerPlanner(difficulty=1).ready(*args))
+
+    def test_cancel(self):
+        planner = DealerPlanner(difficulty=2)
+        game = self.games[0]
+        planner.plan(0, game.players[0], game.board, game.score)
+        planner.cancel()
+        self.assertIsNone(planner._plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import random
+import unittest
+
+from rendezvous import GameSettings, InvalidRecordError
+from rendezvous.deck import DeckDefinition
+from rendezvous.gameplay import RendezVousGame
+from rendezvous.record import *
+
+
+class TestGameRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.filename = "test_record.test"
+        self.game = RendezVousGame(rng=random.Random(31))
+        self.game.recorder = GameRecorder(self.filename, seed=31)
+        self.boards = []
+        self.waits = []
+        self.scores = []
+
+    def tearDown(self):
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+    def _cards(self, board):
+        return [[(str(c), c.suit, c.value, getattr(c, 'applied_to', None))
+                 for c in side] for side in board.board]
+
+    def _play(self):
+        """Play a full game, remembering the state at the end of each round."""
+        self.game.new_game()
+        while True:
+            for p in range(GameSettings.NUM_PLAYERS):
+                hand = self.game.players[p]
+                play = hand.AI_hard(p, self.game.board, self.game.score)
+                for card in play:
+                    hand.remove(card)
+                self.game.board.play_cards(p, play)
+            self.game.score_round()
+            self.boards.append(self._cards(self.game.board))
+            self.waits.append([list(w) for w in self.game.board._wait])
+            self.scores.append([list(s) for s in self.game.score.scores])
+            if self.game.next_round():
+                return
+
+    def test_header(self):
+        self._play()
+        replay = GameReplayer(self.filename)
+        self.assertEqual(replay.seed, 31)
+        self.assertEqual(replay.deck, "Standard")
+        self.assertEqual(replay.players, GameSettings.NUM_PLAYERS)
+        self.assertEqual(replay.slots, GameSettings.CARDS_ON_BOARD)
+        self.assertEqual(len(replay), GameSettings.NUM_ROUNDS)
+
+    def test_fixed_width(self):
+        self.game.new_game()
+        size = os.path.getsize(self.filename)
+        self.game.next_round()
+        record = os.path.getsize(self.filename) - size
+        self.game.next_round()
+        self.assertEqual(os.path.getsize(self.filename), size + 2 * record)
+
+    def test_seek(self):
+        self._play()
+        replay = GameReplayer(self.filename)
+        for r in reversed(range(1, len(self.boards) + 1)):
+            board = replay.gameboard(r)
+            self.assertEqual(self._cards(board), self.boards[r-1])
+            self.assertEqual(board._wait, self.waits[r-1])
+            self.assertEqual(replay.scoreboard(r).scores, self.scores[r-1])
+
+    def test_deltas(self):
+        self._play()
+        replay = GameReplayer(self.filename)
+        self.assertEqual(replay.deltas(1), self.scores[0])
+        self.assertEqual(replay.deltas(2),
+                         [[a - b for a, b in zip(*pair)]
+                          for pair in zip(self.scores[1], self.scores[0])])
+
+    def test_replayed_round(self):
+        self.game.new_game()
+        self.game.next_round()
+        self.game.round = 1  # e.g. replayed via the Time Machine
+        self.game.next_round()
+        self.assertEqual(len(GameReplayer(self.filename)), 1)
+
+    def test_new_deck(self):
+        self.game.new_game()
+        self.game.next_round()
+        self.game.load_deck(DeckDefinition())
+        self.game.next_round()
+        replay = GameReplayer(self.filename)
+        self.assertEqual(replay.first, 2)
+        self.assertEqual(len(replay), 2)
+        self.assertRaises(IndexError, replay.read, 1)
+        self.assertEqual(replay.read(2).round, 2)
+
+    def test_missing_round(self):
+        self.game.new_game()
+        self.game.next_round()
+        replay = GameReplayer(self.filename)
+        self.assertRaises(IndexError, replay.read, 2)
+        self.assertRaises(IndexError, replay.read, 0)
+
+    def test_invalid(self):
+        with open(self.filename, 'wb') as f:
+            f.write(b'not a game record at all, honestly....')
+        self.assertRaises(InvalidRecordError, GameReplayer, self.filename)
+
+    def test_applied(self):
+        """Verify each special's applied_to is recorded per player."""
+        self._play()
+        replay = GameReplayer(self.filename)
+        applied = [slot[3] for board in self.boards for side in board
+                   for slot in side if slot[3] is not None]
+        self.assertTrue(any(len(set(a)) > 1 for a in applied))
+        replayed = [slot[3] for r in range(1, len(self.boards) + 1)
+                    for side in self._cards(replay.gameboard(r))
+                    for slot in side if slot[3] is not None]
+        self.assertEqual(replayed, applied)
+
+    def test_truncated_round(self):
+        self.game.new_game()
+        self.game.next_round()
+        self.game.next_round()
+        with open(self.filename, 'r+b') as f:
+            f.truncate(os.path.getsize(self.filename) - 1)
+        replay = GameReplayer(self.filename)
+        self.assertEqual(len(replay), 1)
+        self.assertEqual(replay.read(1).round, 1)
+        self.assertRaises(InvalidRecordError, replay.read, 2)
+        self.assertRaises(IndexError, replay.read, 3)
+
+    def test_truncated(self):
+        with open(self.filename, 'wb') as f:
+            f.write(b'RVGR')
+        self.assertRaises(InvalidRecordError, GameReplayer, self.filename)
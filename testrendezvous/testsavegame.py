@@ -0,0 +1,139 @@
+import os
+import random
+import unittest
+try:
+    from unittest import mock
+except ImportError:  # Python 2.x
+    import mock
+
+from rendezvous import GameSettings, InvalidRecordError
+from rendezvous.deck import DeckDefinition
+from rendezvous.gameplay import RendezVousGame
+from rendezvous.powerups import Powerups
+from rendezvous.savegame import *
+
+
+class TestSaveGame(unittest.TestCase):
+
+    def setUp(self):
+        self.filename = "test_save.test"
+        self.game = RendezVousGame(rng=random.Random(17))
+        self.game.new_game()
+        self.other = RendezVousGame(rng=random.Random(18))
+        self.other.new_game()
+
+    def tearDown(self):
+        for filename in (self.filename, self.filename + '.tmp'):
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+    def _play(self, rounds):
+        """Play the given number of rounds, scoring the last."""
+        for r in range(rounds):
+            for p in range(GameSettings.NUM_PLAYERS):
+                hand = self.game.players[p]
+                play = hand.AI_hard(p, self.game.board, self.game.score)
+                for card in play:
+                    hand.remove(card)
+                self.game.board.play_cards(p, play)
+            self.game.score_round()
+            if r < rounds - 1:
+                self.game.next_round()
+
+    def _state(self, game):
+        return ([[str(c) for c in hand] for hand in game.players],
+                [[str(game.players[p].deck.draw(False)) for i in range(5)]
+                 for p in range(GameSettings.NUM_PLAYERS)],
+                [[(str(c), c.suit, c.value) if c is not None else None
+                  for c in side] for side in game.board.board],
+                game.board._wait, game.score.scores, game.round)
+
+    def test_round_boundary(self):
+        self._play(3)
+        self.game.next_round()
+        save_game(self.filename, self.game)
+        saved = SavedGame(self.filename)
+        self.assertEqual(saved.deck, "Standard")
+        self.assertEqual(saved.round, 4)
+        self.assertFalse(saved.scored)
+        self.assertEqual(saved.restore(self.other), ([], []))
+        self.assertEqual(self._state(self.other), self._state(self.game))
+
+    def test_scored(self):
+        self._play(2)
+        save_game(self.filename, self.game, scored=True)
+        saved = SavedGame(self.filename)
+        self.assertTrue(saved.scored)
+        saved.restore(self.other)
+        self.assertEqual(self._state(self.other), self._state(self.game))
+        for side, other in zip(self.game.board.board, self.other.board.board):
+            for card, copy in zip(side, other):
+                self.assertEqual(getattr(card, 'applied_to', None),
+                                 getattr(copy, 'applied_to', None))
+
+    def test_turn_unplayed(self):
+        """Verify cards played in an unscored turn go back to their sources."""
+        hand = self.game.players[0]
+        before = [str(c) for c in hand]
+        sleeve = DeckDefinition().get_card("Boyfriend 10")
+        sleeve.from_powerup = "Up Your Sleeve"
+        self.game.board.play_cards(0, [hand.pop(), sleeve])
+        self.game.board.play_cards(1, self.game.players[1][:2])
+        save_game(self.filename, self.game,
+                  powerups=[Powerups().find("Mega Buff")])
+        powerups, cards = SavedGame(self.filename).restore(self.other)
+        self.assertEqual(sorted(str(c) for c in self.other.players[0]),
+                         sorted(before))
+        self.assertEqual(self.other.board.board,
+                         [[None] * GameSettings.CARDS_ON_BOARD] *
+                         GameSettings.NUM_PLAYERS)
+        self.assertEqual([str(c) for c in cards], ["Boyfriend 10"])
+        self.assertEqual(cards[0].from_powerup, "Up Your Sleeve")
+        self.assertEqual(powerups, ["Mega Buff"])
+        self.assertEqual(powerups[0].value, 4)
+
+    def test_wrong_deck(self):
+        save_game(self.filename, self.game)
+        self.other.deck = DeckDefinition()
+        self.other.deck.base_filename = "Other"
+        self.assertRaises(InvalidRecordError,
+                          SavedGame(self.filename).restore, self.other)
+
+    def test_invalid(self):
+        with open(self.filename, 'wb') as f:
+            f.write(b'RVGR')
+        self.assertRaises(InvalidRecordError, SavedGame, self.filename)
+        save_game(self.filename, self.game)
+        with open(self.filename, 'r+b') as f:
+            f.truncate(100)
+        self.assertRaises(InvalidRecordError, SavedGame, self.filename)
+
+    def test_long_deck_name(self):
+        """Verify a deck name of any length is saved in full."""
+        name = "Long Deck Name " * 10
+        with mock.patch.object(self.game.deck, 'base_filename', name):
+            save_game(self.filename, self.game)
+        self.assertEqual(SavedGame(self.filename).deck, name)
+        with mock.patch.object(self.game.deck, 'base_filename', "X" * 256):
+            self.assertRaises(ValueError, save_game, self.filename, self.game)
+        self.assertEqual(SavedGame(self.filename).deck, name)
+
+    def test_atomic(self):
+        """Verify a failed save leaves the previous save in place."""
+        save_game(self.filename, self.game)
+        self.assertFalse(os.path.exists(self.filename + '.tmp'))
+        with open(self.filename, 'rb') as f:
+            before = f.read()
+        self._play(1)
+        with mock.patch('os.fsync', side_effect=OSError("disk full")):
+            self.assertRaises(OSError, save_game, self.filename, self.game,
+                              scored=True)
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(f.read(), before)
+        self.assertFalse(os.path.exists(self.filename + '.tmp'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from rendezvous import GameSettings
+from rendezvous.deck import DeckDefinition
+from rendezvous.simulation import *
+
+
+class TestSpecialStats(unittest.TestCase):
+
+    def test_init(self):
+        stats = SpecialStats()
+        self.assertEqual(stats.games, 0)
+        self.assertEqual(stats.specials, {})
+        self.assertEqual(stats['Test']['applied'], 0)
+
+    def test_merge(self):
+        stats, other = SpecialStats(), SpecialStats()
+        stats.games, stats.wins = 4, 1
+        stats['Test']['applied'] = 3
+        other.games, other.wins = 6, 4
+        other['Test']['applied'] = 2
+        other['Other']['swing'] = -5
+        stats.merge(other)
+        self.assertEqual((stats.games, stats.wins), (10, 5))
+        self.assertEqual(stats['Test']['applied'], 5)
+        self.assertEqual(stats['Other']['swing'], -5)
+
+    def test_summary(self):
+        stats = SpecialStats()
+        stats.games, stats.wins = 10, 5
+        totals = stats['Test']
+        totals.update(in_hand=10, playable=8, chosen=4, applied=4,
+                      misfires=1, swing=20, games=4, wins=3)
+        summary = stats.summary()['Test']
+        self.assertEqual(summary['playable'], 0.8)
+        self.assertEqual(summary['chosen'], 0.4)
+        self.assertEqual(summary['misfire'], 0.25)
+        self.assertEqual(summary['swing'], 5)
+        self.assertAlmostEqual(summary['lift'], 0.75 - 2.0 / 6)
+
+    def test_summary_empty(self):
+        stats = SpecialStats()
+        stats.games = 2
+        stats['Test']['in_hand'] = 1
+        summary = stats.summary()['Test']
+        self.assertEqual(summary['playable'], 0)
+        self.assertIsNone(summary['misfire'])
+        self.assertIsNone(summary['lift'])
+        self.assertIn('Test', stats.report())
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_game(self):
+        stats = simulate_game(DeckDefinition(), 1)
+        self.assertEqual(stats.games, GameSettings.NUM_PLAYERS)
+        self.assertLessEqual(stats.wins, 1)
+        for totals in stats.specials.values():
+            self.assertLessEqual(totals['playable'], totals['in_hand'])
+            self.assertLessEqual(totals['chosen'], totals['playable'])
+            self.assertLessEqual(totals['misfires'], totals['applied'])
+            self.assertLessEqual(totals['wins'], totals['games'])
+        self.assertTrue(any(t['applied'] for t in stats.specials.values()))
+
+    def test_deterministic(self):
+        a = simulate_game(DeckDefinition(), 5)
+        b = simulate_game(DeckDefinition(), 5)
+        self.assertEqual(a.specials, b.specials)
+        self.assertEqual((a.games, a.wins), (b.games, b.wins))
+
+    def test_simulate(self):
+        updates = []
+        stats = simulate(games=4, processes=1, batch=3,
+                         callback=lambda s: updates.append(s.games))
+        self.assertEqual(updates, [6, 8])
+        single = simulate_game(DeckDefinition(), 0)
+        for seed in range(1, 4):
+            simulate_game(DeckDefinition(), seed, single)
+        self.assertEqual(stats.specials, single.specials)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -410,6 +410,37 @@ class TestApplication(unittest.TestCase):
         self.assertFalse(a.match(Alignment.ALL, Card("Suit", 3), Card("Suit", 2)))
         self.assertTrue(a.match(Alignment.ALL, Card("Suit", 2), Card("Suit", 3)))
 
+    def test_matcher(self):
+        """Verify the compiled matcher agrees with match throughout."""
+        friend = Application(alignment=Alignment.FRIENDLY,
+                             suits=["Suit 1"], max_value=5)
+        enemy = Application(alignment=Alignment.ENEMY,
+                            opposite=Application(min_value=3))
+        apps = [Application(), friend, enemy, friend & enemy, friend | enemy,
+                Application(opposite=friend | Application(suits=["Suit 2"])),
+                (friend | enemy) & Application(min_value=2)]
+        s = SpecialCard("Name", "Desc", Requirement(), Application(), Effect())
+        cards = [None, s] + [Card(suit, value) for suit in ("Suit 1", "Suit 2")
+                             for value in range(0, 8, 2)]
+        for app in apps:
+            m = app.matcher()
+            self.assertIs(app.matcher(), m)
+            for alignment in (Alignment.FRIENDLY, Alignment.ENEMY):
+                for card in cards:
+                    for opp in cards[1:]:
+                        self.assertEqual(m(alignment, card, opp),
+                                         app.match(alignment, card, opp))
+
+    def test_matcher_alignments(self):
+        friend = Application(alignment=Alignment.FRIENDLY)
+        enemy = Application(alignment=Alignment.ENEMY)
+        both = set([Alignment.FRIENDLY, Alignment.ENEMY])
+        self.assertEqual(Application().matcher().alignments, both)
+        self.assertEqual(friend.matcher().alignments,
+                         set([Alignment.FRIENDLY]))
+        self.assertEqual((friend & enemy).matcher().alignments, set())
+        self.assertEqual((friend | enemy).matcher().alignments, both)
+
     def test_filter_any(self):
         cards = [Card("Suit", i+1) for i in range(4)]
         a = Application()
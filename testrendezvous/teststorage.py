@@ -0,0 +1,109 @@
+import os
+import unittest
+
+from rendezvous import Currency, FileReader, Storage
+from rendezvous.storage import *
+from rendezvous.deck import DeckDefinition, DeckCatalog
+from rendezvous.gameplay import Scoreboard
+from rendezvous.statistics import Statistics
+from rendezvous.achievements import AchievementList
+from rendezvous.powerups import Powerups
+
+
+class TestMemoryStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.storage = MemoryStorage()
+
+    def test_write_read(self):
+        f = self.storage.open(os.path.join("player", "file.txt"), 'w')
+        f.write("[TAG]Value\n")
+        self.assertFalse(self.storage.exists(os.path.join("player",
+                                                          "file.txt")))
+        f.close()
+        self.assertTrue(self.storage.exists(os.path.join("player",
+                                                         "file.txt")))
+        self.assertEqual(list(FileReader(os.path.join("player", "file.txt"),
+                                         self.storage)),
+                         [("TAG", "Value")])
+        self.assertFalse(os.path.exists(os.path.join("player", "file.txt")))
+
+    def test_append(self):
+        self.storage.files["file.txt"] = "one\n"
+        f = self.storage.open("file.txt", 'a')
+        f.write("two\n")
+        f.close()
+        self.assertEqual(self.storage.open("file.txt").read(), "one\ntwo\n")
+
+    def test_missing(self):
+        self.assertFalse(self.storage.exists("nothing.txt"))
+        self.assertRaises(EnvironmentError, self.storage.open, "nothing.txt")
+
+    def test_base(self):
+        storage = MemoryStorage(Storage)
+        filename = os.path.join("data", "Achievements.txt")
+        self.assertTrue(storage.exists(filename))
+        self.assertEqual(storage.open(filename).read(),
+                         Storage.open(filename).read())
+        storage.open(filename, 'w').close()
+        self.assertEqual(storage.open(filename).read(), "")
+        self.assertNotEqual(Storage.open(filename).read(), "")
+
+    def test_walk(self):
+        storage = MemoryStorage(files={
+            os.path.join("data", "decks", "Extra.txt") : "[DECK-NAME]Extra\n",
+            os.path.join("player", "other.txt") : ""})
+        self.assertEqual(list(storage.walk(os.path.join("data", "decks"))),
+                         [(os.path.join("data", "decks"), [], ["Extra.txt"])])
+
+
+class TestMemoryStores(unittest.TestCase):
+
+    """Verify the player files are kept in a MemoryStorage."""
+
+    def setUp(self):
+        self.storage = MemoryStorage(Storage)
+
+    def test_currency(self):
+        winks = Currency("wink", "", "testplayer", self.storage)
+        winks.earn(5)
+        self.assertEqual(self.storage.files[winks.filename], "5")
+        self.assertFalse(os.path.exists("testplayer"))
+        winks = Currency("wink", "", "testplayer", self.storage)
+        self.assertEqual(winks.balance, 5)
+
+    def test_statistics(self):
+        stats = Statistics("test_stats.txt", self.storage)
+        stats.record_game("Standard", Scoreboard(DeckDefinition()), 0)
+        self.assertFalse(os.path.exists("test_stats.txt"))
+        stats = Statistics("test_stats.txt", self.storage)
+        self.assertEqual(stats.base.played, 1)
+
+    def test_achievements(self):
+        achievements = AchievementList("test_unlocked.txt",
+                                       storage=self.storage)
+        self.assertTrue(achievements.available)
+        achievements.achieve(achievements.available[0])
+        self.assertFalse(os.path.exists("test_unlocked.txt"))
+        achievements = AchievementList("test_unlocked.txt",
+                                       storage=self.storage)
+        self.assertEqual(len(achievements.achieved), 1)
+
+    def test_powerups(self):
+        powerups = Powerups("test_powerups.txt", self.storage)
+        powerups.purchase("Hand Tipper", 2)
+        self.assertFalse(os.path.exists("test_powerups.txt"))
+        powerups = Powerups("test_powerups.txt", self.storage)
+        self.assertEqual(powerups.count(powerups["Hand Tipper"]), 2)
+
+    def test_deck_catalog(self):
+        catalog = DeckCatalog("test_deck_catalog.txt", storage=self.storage)
+        self.assertTrue(len(catalog))
+        catalog.purchase("Standard")
+        self.assertFalse(os.path.exists("test_deck_catalog.txt"))
+        catalog = DeckCatalog("test_deck_catalog.txt", storage=self.storage)
+        self.assertTrue(catalog.purchased("Standard"))
+
+
+if __name__ == "__main__":
+    unittest.main()
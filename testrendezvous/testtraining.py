@@ -0,0 +1,86 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from rendezvous.deck import DeckDefinition
+from rendezvous.dealer import FEATURES, DEFAULT_WEIGHTS, load_weights
+from rendezvous.training import *
+
+
+class TestTraining(unittest.TestCase):
+
+    def test_self_play(self):
+        samples = self_play(DeckDefinition(), 5)
+        self.assertTrue(samples)
+        for sample in samples:
+            self.assertGreater(len(sample), 1)
+            for features, lead in sample:
+                self.assertEqual(len(features), len(FEATURES))
+        self.assertEqual(self_play(DeckDefinition(), 5), samples)
+
+    def test_collect_split(self):
+        """Verify the samples are the same however the games are split."""
+        self.assertEqual(collect(games=4, processes=1, batch=4),
+                         collect(games=4, processes=1, batch=1))
+
+    @unittest.skipIf(numpy is None, "fitting needs NumPy")
+    def test_fit(self):
+        """Verify known weights are found (in VALUE units)."""
+        rng = random.Random(43)
+        true = [rng.uniform(-5, 5) for name in FEATURES]
+        true[1] = 2.0  # VALUE
+        unseen, kept = len(FEATURES) - 1, len(FEATURES) - 2
+        samples = []
+        for i in range(500):
+            sample = []
+            for j in range(4):
+                features = [rng.randint(0, 10) for name in FEATURES]
+                features[unseen] = 0
+                lead = sum(w * f for w, f in zip(true, features)) + i
+                sample.append((features, lead))
+            samples.append(sample)
+        weights = fit(samples, ridge=0, keep=[FEATURES[kept][0]],
+                      signs=False)
+        for i in range(kept):
+            self.assertAlmostEqual(weights[i], true[i] / 2.0, 1)
+        self.assertEqual(weights[kept], DEFAULT_WEIGHTS[kept])
+        self.assertEqual(weights[unseen], DEFAULT_WEIGHTS[unseen])
+
+    @unittest.skipIf(numpy is None, "fitting needs NumPy")
+    def test_fit_signs(self):
+        """Verify a term fit against its prior's sign is dropped."""
+        rng = random.Random(430)
+        true = list(DEFAULT_WEIGHTS)
+        flipped = [name for name, weight in FEATURES].index('FLIP_ENEMY')
+        true[flipped] = -true[flipped]
+        samples = []
+        for i in range(200):
+            sample = []
+            for j in range(4):
+                features = [rng.randint(0, 10) for name in FEATURES]
+                sample.append((features,
+                               sum(w * f for w, f in zip(true, features))))
+            samples.append(sample)
+        self.assertLess(fit(samples, ridge=0, signs=False)[flipped], 0)
+        self.assertEqual(fit(samples, ridge=0)[flipped], 0)
+
+    def test_export(self):
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, "Weights.txt")
+            weights = [i / 4.0 for i in range(len(FEATURES))]
+            export(weights, filename)
+            self.assertEqual(load_weights(filename), tuple(weights))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
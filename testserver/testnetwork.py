@@ -0,0 +1,143 @@
+import time
+import asyncio
+import unittest
+
+from rendezvous import SpecialSuit
+from server import encode, decode
+from server.network import GameServer
+
+
+class Client(object):
+
+    """A minimal client that plays the first normal cards in its hand."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.hand = []
+        self.board = None
+        self.seat = None
+
+    def send(self, **message):
+        self.writer.write(encode(message))
+
+    async def receive(self, *kinds):
+        """Return the next message of one of the given types."""
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), 5)
+            if not line:
+                return None
+            message = decode(line)
+            if message['type'] == 'hand':
+                self.hand = message['cards']
+            elif message['type'] == 'round':
+                self.board = message['board']
+            elif message['type'] == 'joined':
+                self.seat = message['seat']
+            if message['type'] in kinds:
+                return message
+
+    def play(self):
+        needed = self.board[self.seat].count(None)
+        indices = [i for i, card in enumerate(self.hand)
+                   if card['suit'] != SpecialSuit.SPECIAL][:needed]
+        if len(indices) < needed:
+            self.send(type='stuck')
+        else:
+            self.send(type='play', cards=indices)
+
+
+class TestGameServer(unittest.TestCase):
+
+    def run_server(self, test, **kwargs):
+        """Run test(server, connect) against a server on localhost."""
+        async def main():
+            server = GameServer(seed=38, **kwargs)
+            listener = await server.start()
+            port = listener.sockets[0].getsockname()[1]
+            clients = []
+            async def connect(**join):
+                client = Client(*await asyncio.open_connection('127.0.0.1',
+                                                               port))
+                client.send(type='join', **join)
+                clients.append(client)
+                return client
+            try:
+                return await test(server, connect)
+            finally:
+                for client in clients:
+                    client.writer.close()
+                await server.close()
+        return asyncio.run(main())
+
+    def test_dealer_game(self):
+        async def test(server, connect):
+            client = await connect(name="Test")
+            self.assertEqual((await client.receive('start'))['names'],
+                             ["Dealer", "Test"])
+            await client.receive('hand')
+            while True:
+                client.play()
+                # A new hand follows each new round, and being stuck
+                message = await client.receive('hand', 'game_over')
+                if message['type'] == 'game_over':
+                    return message
+        over = self.run_server(test)
+        self.assertEqual(len(over['scores']), 2)
+
+    def test_human_game(self):
+        async def test(server, connect):
+            one = await connect(name="One", opponent='human')
+            two = await connect(name="Two", opponent='human')
+            for client in (one, two):
+                await client.receive('hand')
+            self.assertEqual(sorted((one.seat, two.seat)), [0, 1])
+            one.play()
+            self.assertEqual((await two.receive('played'))['seat'], one.seat)
+            two.play()
+            scores = [await client.receive('score') for client in (one, two)]
+            self.assertEqual(scores[0], scores[1])
+            two.send(type='leave')
+            return await one.receive('left')
+        self.assertIn('seat', self.run_server(test))
+
+    def test_errors(self):
+        async def test(server, connect):
+            client = await connect()
+            await client.receive('round')
+            client.writer.write(b"not json\n")
+            first = await client.receive('error')
+            client.send(type='play', cards=[0])
+            second = await client.receive('error')
+            return first, second
+        first, second = self.run_server(test)
+        self.assertEqual(first['message'], "Invalid message.")
+        self.assertIn("Play exactly", second['message'])
+
+    def test_missing_deck(self):
+        async def test(server, connect):
+            client = await connect(deck="../Standard")
+            return await client.receive('error')
+        self.assertIn("No such deck", self.run_server(test)['message'])
+
+    def test_sweep(self):
+        async def test(server, connect):
+            client = await connect()
+            await client.receive('hand')
+            await asyncio.sleep(0.1)  # let the dealer play
+            table = list(server.tables.values())[0]
+            server.sweep(time.time() + 90)
+            parked = table.session.parked
+            client.play()
+            await client.receive('score')
+            server.sweep(time.time() + 7200)
+            return parked, await client.receive('error'), server.tables
+        parked, error, tables = self.run_server(test, park_after=60,
+                                                drop_after=3600)
+        self.assertTrue(parked)
+        self.assertEqual(error['message'], "Timed out.")
+        self.assertEqual(tables, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
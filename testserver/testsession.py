@@ -0,0 +1,139 @@
+import unittest
+
+from rendezvous import GameSettings, SpecialSuit, InvalidPlayError
+from rendezvous.deck import Card, DeckDefinition
+from server.session import Session
+
+
+def messages(events, kind):
+    return [message for seat, message in events if message['type'] == kind]
+
+
+def normal_play(session, seat=1):
+    """Play the first normal cards in the hand (always valid)."""
+    while True:
+        needed = session.game.board[seat].count(None)
+        indices = [i for i, card in enumerate(session.game.players[seat])
+                   if card.suit != SpecialSuit.SPECIAL][:needed]
+        if len(indices) == needed:
+            return session.play(seat, indices)
+        session.stuck(seat)
+
+
+def play_round(session):
+    session.dealer_play(0)
+    return normal_play(session)
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.session = Session(1, DeckDefinition(), ["Dealer", "Player"],
+                               dealers=[0], seed=37)
+        self.events = self.session.start()
+
+    def state(self):
+        game = self.session.game
+        return ([[str(card) for card in hand] for hand in game.players],
+                [[str(card) for card in side] for side in game.board.board],
+                game.score.scores, game.round)
+
+    def test_start(self):
+        self.assertEqual(messages(self.events, 'start')[0]['seats'], 2)
+        self.assertEqual(messages(self.events, 'round')[0]['round'], 1)
+        hands = [(seat, m) for seat, m in self.events if m['type'] == 'hand']
+        self.assertEqual(len(hands), 1)
+        self.assertEqual(hands[0][0], 1)
+        self.assertEqual(len(hands[0][1]['cards']),
+                         GameSettings.CARDS_IN_HAND)
+        self.assertEqual(hands[0][1]['playable'], self.session.game.players[1]
+                         .find_play(1, self.session.game.board) is not None)
+
+    def test_waiting(self):
+        self.assertEqual(self.session.waiting(), [0, 1])
+        events = self.session.dealer_play(0)
+        self.assertEqual(messages(events, 'played'), [{'type' : 'played',
+                                                       'seat' : 0}])
+        self.assertEqual(self.session.waiting(), [1])
+
+    def test_round(self):
+        events = play_round(self.session)
+        self.assertEqual(len(messages(events, 'board')), 1)
+        score = messages(events, 'score')[0]
+        self.assertEqual(score['round'], 1)
+        self.assertEqual(score['scores'], self.session.game.score.scores)
+        self.assertEqual(messages(events, 'round')[0]['round'], 2)
+        self.assertEqual(self.session.waiting(), [0, 1])
+
+    def test_game(self):
+        while not self.session.over:
+            events = play_round(self.session)
+        over = messages(events, 'game_over')[0]
+        self.assertEqual(over['scores'], self.session.game.score.scores)
+        self.assertIn(over['winners'][0], (0, 1))
+        self.assertRaises(InvalidPlayError, self.session.dealer_play, 0)
+
+    def test_play_count(self):
+        self.assertRaises(InvalidPlayError, self.session.play, 1, [0, 1])
+
+    def test_play_index(self):
+        self.assertRaises(InvalidPlayError, self.session.play, 1,
+                          [0, 1, 2, 99])
+        self.assertRaises(InvalidPlayError, self.session.play, 1,
+                          [0, 1, 2, "3"])
+        self.assertRaises(InvalidPlayError, self.session.play, 1,
+                          [0, 1, 2, 2])
+
+    def test_play_seat(self):
+        self.assertRaises(InvalidPlayError, self.session.play, 0,
+                          [0, 1, 2, 3])
+        self.assertRaises(InvalidPlayError, self.session.dealer_play, 1)
+
+    def test_play_requirements(self):
+        game = self.session.game
+        filler = [Card("Nothing", 1)] * 3
+        for special in self.session.definition.specials:
+            if game.board.validate([special] + filler):
+                break
+        game.players[1].cards[:4] = [special] + filler
+        self.assertRaises(InvalidPlayError, self.session.play, 1,
+                          [0, 1, 2, 3])
+
+    def test_replace_play(self):
+        normal_play(self.session)
+        normal_play(self.session)
+        self.assertEqual(self.session.waiting(), [0])
+
+    def test_stuck(self):
+        events = self.session.stuck(1)
+        self.assertEqual(messages(events, 'stuck')[0]['scores'][1],
+                         [-10] * len(self.session.definition.suits))
+        self.assertEqual(len(messages(events, 'hand')), 1)
+
+    def test_park(self):
+        for i in range(3):
+            play_round(self.session)
+        self.session.dealer_play(0)
+        self.session.stuck(1)
+        before = self.state()
+        self.session.park()
+        self.assertTrue(self.session.parked)
+        self.assertEqual(self.state(), before)
+        self.assertFalse(self.session.parked)
+        self.assertEqual(self.session.waiting(), [1])
+
+    def test_park_deterministic(self):
+        """Verify a parked game continues exactly as if it never parked."""
+        other = Session(2, self.session.definition, ["Dealer", "Player"],
+                        dealers=[0], seed=37)
+        other.start()
+        for i in range(5):
+            play_round(self.session)
+            play_round(other)
+            other.park()
+        self.assertEqual(self.session.game.score.scores,
+                         other.game.score.scores)
+
+
+if __name__ == "__main__":
+    unittest.main()